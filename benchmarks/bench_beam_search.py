@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark CTC prefix beam search latency per sequence across beam widths
+
+Usage:
+    python benchmarks/bench_beam_search.py [--beam-widths 1 4 10 25] [--batch-size 64]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.ctc_decoder import CTCDecoder
+from core.ctc_beam_search import DecodingConstraints
+from benchmarks.bench_ctc_decoder import make_predictions
+import config
+
+
+def per_sequence_ms(func, batch_size: int, repeat: int) -> float:
+    """Best per-sequence latency of repeat runs in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000 / batch_size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--beam-widths", type=int, nargs="+", default=[1, 2, 4, 10, 16, 32])
+    parser.add_argument("--top-k", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--time-steps", type=int, default=64)
+    parser.add_argument("--classes", type=int, default=len(config.CHARSET) + 1)
+    parser.add_argument("--length", type=int, default=None,
+                        help="Also benchmark with a fixed output length constraint")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    predictions = make_predictions(args.batch_size, args.time_steps, args.classes)
+    charset = config.CHARSET
+    
+    greedy_ms = per_sequence_ms(lambda: CTCDecoder.decode_batch(predictions, charset),
+                                args.batch_size, args.repeat)
+    print(f"greedy: {greedy_ms:.4f} ms/sequence\n")
+    
+    constraints = DecodingConstraints(length=args.length) if args.length else None
+    header = f"{'beam':>6} {'single ms/seq':>15} {'batched ms/seq':>16}"
+    if constraints is not None:
+        header += f" {'constrained ms/seq':>20}"
+    print(header)
+    
+    for beam_width in args.beam_widths:
+        single_ms = per_sequence_ms(
+            lambda: [CTCDecoder.decode_beam(p, charset, beam_width, args.top_k) for p in predictions],
+            args.batch_size, args.repeat
+        )
+        batched_ms = per_sequence_ms(
+            lambda: CTCDecoder.decode_beam_batch(predictions, charset, beam_width, args.top_k),
+            args.batch_size, args.repeat
+        )
+        line = f"{beam_width:>6} {single_ms:>15.4f} {batched_ms:>16.4f}"
+        
+        if constraints is not None:
+            constrained_ms = per_sequence_ms(
+                lambda: CTCDecoder.decode_beam_batch(predictions, charset, beam_width,
+                                                     args.top_k, constraints),
+                args.batch_size, args.repeat
+            )
+            line += f" {constrained_ms:>20.4f}"
+        
+        print(line)
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark vectorized CTCDecoder.decode_batch against the per-row loop
+
+Usage:
+    python benchmarks/bench_ctc_decoder.py [--batch-sizes 1 32 1024 4096] [--repeat 5]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.ctc_decoder import CTCDecoder
+import config
+
+
+def decode_loop(predictions_batch: np.ndarray, charset: str):
+    """Reference implementation: decode one row at a time"""
+    return [CTCDecoder.decode(predictions, charset) for predictions in predictions_batch]
+
+
+def best_time(func, *args, repeat: int = 5) -> float:
+    """Best wall time of repeat runs in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def make_predictions(batch_size: int, time_steps: int, num_classes: int,
+                     seed: int = 0) -> np.ndarray:
+    """Random logits with a realistic share of blank frames"""
+    rng = np.random.default_rng(seed)
+    predictions = rng.standard_normal((batch_size, time_steps, num_classes), dtype=np.float32)
+    predictions[:, :, CTCDecoder.BLANK_LABEL] += 1.5
+    return predictions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 32, 256, 1024, 4096])
+    parser.add_argument("--time-steps", type=int, default=64)
+    parser.add_argument("--classes", type=int, default=len(config.CHARSET) + 1)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    print(f"{'batch':>8} {'loop ms':>12} {'vectorized ms':>15} {'speedup':>9}")
+    for batch_size in args.batch_sizes:
+        predictions = make_predictions(batch_size, args.time_steps, args.classes)
+        
+        if decode_loop(predictions, config.CHARSET) != CTCDecoder.decode_batch(predictions, config.CHARSET):
+            print(f"Mismatch between loop and vectorized decoding at batch size {batch_size}")
+            return 1
+        
+        loop_ms = best_time(decode_loop, predictions, config.CHARSET, repeat=args.repeat)
+        vector_ms = best_time(CTCDecoder.decode_batch, predictions, config.CHARSET, repeat=args.repeat)
+        print(f"{batch_size:>8} {loop_ms:>12.3f} {vector_ms:>15.3f} {loop_ms / vector_ms:>8.1f}x")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
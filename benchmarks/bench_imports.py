@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Report import time of the application's entry points with python -X importtime
+
+Every target is imported in a fresh interpreter several times. The report
+shows the median wall-clock time of the whole process, the median time
+spent in imports, the slowest top-level imports and which heavy
+dependencies (NumPy, PIL, onnxruntime, PySide6) were loaded.
+
+Some targets must stay light: ``import core`` must not load onnxruntime
+or PySide6, and the headless entry points must not load PySide6. If one
+of them does, it is reported and the exit code is 1.
+
+Usage:
+    python benchmarks/bench_imports.py [--runs 5] [--top 8] [--targets core cli.batch]
+        [--output imports.json]
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Target name -> code run in a fresh interpreter
+TARGETS = {
+    "interpreter": "pass",
+    "core": "import core",
+    "core.ModelManager": "from core import ModelManager",
+    "core.ModelManager+ort": "from core import ModelManager; import onnxruntime",
+    "utils.logger": "from utils import logger",
+    "cli.batch": "import cli.batch",
+    "cli.server": "import cli.server",
+    "main": "import main",
+    "ui.main_window": "import ui.main_window"
+}
+
+# Heavy dependencies reported for every target
+HEAVY_MODULES = ("numpy", "PIL", "onnxruntime", "PySide6")
+
+# Modules a target must not load
+FORBIDDEN = {
+    "core": ("onnxruntime", "PySide6"),
+    "core.ModelManager": ("onnxruntime", "PySide6"),
+    "utils.logger": ("numpy", "PIL", "onnxruntime", "PySide6"),
+    "cli.batch": ("PySide6",),
+    "cli.server": ("PySide6",),
+    "main": ("numpy", "PIL", "onnxruntime", "PySide6")
+}
+
+
+def parse_importtime(output: str) -> List[Tuple[str, int, int, int]]:
+    """
+    Parse -X importtime output
+    
+    Args:
+        output: stderr of the interpreter
+    
+    Returns:
+        List of (module, nesting level, self us, cumulative us) in output order
+    """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            entries.append((name.strip(), (len(name) - len(name.lstrip()) - 1) // 2,
+                            int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+    return entries
+
+
+def run_target(code: str) -> Dict[str, Any]:
+    """Import a target once in a fresh interpreter"""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            cwd=PROJECT_ROOT, capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - start) * 1000
+    
+    entries = parse_importtime(result.stderr)
+    error = None
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed"
+    
+    return {
+        "wall_ms": wall_ms,
+        "import_ms": sum(cumulative for _, level, _, cumulative in entries if level == 0) / 1000,
+        "entries": entries,
+        "error": error
+    }
+
+
+def bench_target(name: str, code: str, runs: int, top: int) -> Dict[str, Any]:
+    """Import a target runs times and summarize"""
+    samples = [run_target(code) for _ in range(runs)]
+    last = samples[-1]
+    if last["error"]:
+        return {"target": name, "code": code, "error": last["error"]}
+    
+    loaded = {entry[0].split(".")[0] for entry in last["entries"]}
+    # Top-level imports and their direct imports, so the target's own
+    # entry is followed by what made it slow
+    slowest = sorted((entry for entry in last["entries"] if entry[1] <= 1),
+                     key=lambda entry: entry[3], reverse=True)[:top]
+    return {
+        "target": name,
+        "code": code,
+        "wall_ms": statistics.median(sample["wall_ms"] for sample in samples),
+        "import_ms": statistics.median(sample["import_ms"] for sample in samples),
+        "modules": len(last["entries"]),
+        "heavy": [module for module in HEAVY_MODULES if module in loaded],
+        "forbidden": [module for module in FORBIDDEN.get(name, ()) if module in loaded],
+        "slowest": [[module, level, cumulative / 1000] for module, level, _, cumulative in slowest]
+    }
+
+
+def print_report(results: List[Dict[str, Any]]):
+    """Print a summary table followed by the slowest imports of every target"""
+    header = f"{'target':<24} {'wall ms':>9} {'import ms':>10} {'modules':>8}  heavy"
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        if "error" in row:
+            print(f"{row['target']:<24} {'skipped':>9}  {row['error']}")
+            continue
+        print(f"{row['target']:<24} {row['wall_ms']:>9.1f} {row['import_ms']:>10.1f} "
+              f"{row['modules']:>8}  {', '.join(row['heavy']) or '-'}")
+    
+    for row in results:
+        if "error" in row or not row["slowest"]:
+            continue
+        print(f"\n{row['target']} ({row['code']}):")
+        for module, level, cumulative_ms in row["slowest"]:
+            print(f"  {'  ' * level + module:<40} {cumulative_ms:>8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--targets", nargs="+", choices=list(TARGETS), default=list(TARGETS),
+                        help="Targets to measure (default: all)")
+    parser.add_argument("--runs", type=int, default=5,
+                        help="Fresh interpreters per target; medians are reported (default: 5)")
+    parser.add_argument("--top", type=int, default=8,
+                        help="Slowest imports listed per target (default: 8)")
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    args = parser.parse_args()
+    
+    results = [bench_target(name, TARGETS[name], args.runs, args.top) for name in args.targets]
+    print_report(results)
+    
+    if args.output:
+        report = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "environment": {
+                "python": platform.python_version(),
+                "platform": platform.platform()
+            },
+            "runs": args.runs,
+            "results": results
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    
+    violations = [row for row in results if row.get("forbidden")]
+    if violations:
+        print(f"\n{len(violations)} target(s) load modules they must not:")
+        for row in violations:
+            print(f"  {row['target']}: {', '.join(row['forbidden'])}")
+        return 1
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
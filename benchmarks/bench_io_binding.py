@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark IOBinding inference against session.run
+
+Usage:
+    python benchmarks/bench_io_binding.py [--model PATH] [--batch-sizes 1 8 32] [--iterations 200]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import onnxruntime as ort
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.io_binding import IOBindingRunner
+from core.image_processor import ImageProcessor
+from utils.stats import LatencyStats
+import config
+
+
+def measure(func, batch: np.ndarray, iterations: int, warmup: int = 5) -> LatencyStats:
+    """Collect per-call latencies in milliseconds"""
+    for _ in range(warmup):
+        func(batch)
+    
+    stats = LatencyStats()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func(batch)
+        stats.add((time.perf_counter() - start) * 1000)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", type=Path, default=config.MODEL_PATH)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 4, 16, 32])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=0,
+                        help="intra_op_num_threads (0 = ONNX Runtime default)")
+    args = parser.parse_args()
+    
+    if not args.model.exists():
+        print(f"Model not found: {args.model}")
+        return 1
+    
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = args.threads
+    session = ort.InferenceSession(str(args.model), sess_options=options,
+                                   providers=['CPUExecutionProvider'])
+    input_name = session.get_inputs()[0].name
+    output_name = session.get_outputs()[0].name
+    runner = IOBindingRunner(session, input_name, output_name)
+    
+    def session_run(batch):
+        return session.run([output_name], {input_name: batch})[0]
+    
+    print(f"{'batch':>6} {'run p50 ms':>11} {'run p99 ms':>11} "
+          f"{'iobinding p50 ms':>17} {'iobinding p99 ms':>17} {'speedup p50':>12}")
+    
+    rng = np.random.default_rng(0)
+    for batch_size in args.batch_sizes:
+        batch = rng.standard_normal(
+            (batch_size, 3, ImageProcessor.DEFAULT_HEIGHT, ImageProcessor.DEFAULT_WIDTH),
+            dtype=np.float32
+        )
+        
+        if not np.allclose(session_run(batch), runner.run(batch), atol=1e-5):
+            print(f"IOBinding output differs from session.run at batch size {batch_size}")
+            return 1
+        
+        baseline = measure(session_run, batch, args.iterations)
+        bound = measure(runner.run, batch, args.iterations)
+        print(f"{batch_size:>6} {baseline.percentile(50):>11.3f} {baseline.percentile(99):>11.3f} "
+              f"{bound.percentile(50):>17.3f} {bound.percentile(99):>17.3f} "
+              f"{baseline.percentile(50) / bound.percentile(50):>11.2f}x")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark reference vs fused normalization of resized images into a batch
+
+Usage:
+    python benchmarks/bench_preprocessing.py [--batch-sizes 1 8 32 128] [--repeat 20]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.image_processor import ImageProcessor
+from core.buffer_pool import BufferPool
+
+
+def reference_batch(images):
+    """Per-image reference normalization followed by concatenation"""
+    return np.concatenate([ImageProcessor.normalize(image) for image in images], axis=0)
+
+
+def fused_batch(images, pool: BufferPool):
+    """Fused normalization into a pooled buffer"""
+    batch = pool.acquire(len(images))
+    for row, image in zip(batch, images):
+        ImageProcessor.normalize_into(image, row)
+    pool.release(batch)
+    return batch
+
+
+def best_time(func, repeat: int) -> float:
+    """Best wall time of repeat runs in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(0)
+    height, width = ImageProcessor.DEFAULT_HEIGHT, ImageProcessor.DEFAULT_WIDTH
+    pool = BufferPool((3, height, width))
+    
+    print(f"{'batch':>6} {'reference ms':>14} {'fused ms':>10} {'speedup':>9}")
+    for batch_size in args.batch_sizes:
+        images = [
+            Image.fromarray(rng.integers(0, 256, (height, width, 3), dtype=np.uint8))
+            for _ in range(batch_size)
+        ]
+        
+        difference = np.abs(reference_batch(images) - fused_batch(images, pool)).max()
+        if difference > 1e-4:
+            print(f"Fused output differs from reference by {difference}")
+            return 1
+        
+        reference_ms = best_time(lambda: reference_batch(images), args.repeat)
+        fused_ms = best_time(lambda: fused_batch(images, pool), args.repeat)
+        print(f"{batch_size:>6} {reference_ms:>14.3f} {fused_ms:>10.3f} {reference_ms / fused_ms:>8.1f}x")
+    
+    print(f"\nBuffers allocated by pool: {pool.allocations}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
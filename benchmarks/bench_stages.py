@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Benchmark each inference stage separately: decode, resize, normalize, ONNX Runtime and CTC decoding
+
+Every stage is timed per batch over a matrix of batch sizes, source image
+sizes and ONNX Runtime thread counts, and reported as p50/p95/p99 latency
+and throughput. By default the tiny synthetic model in this directory is
+used, so the suite runs without best_model.onnx; pass --model to time the
+real model.
+
+Results can be saved as JSON and compared against an earlier run: stages
+whose p50 latency grew by more than --tolerance are reported as
+regressions and the exit code is 1.
+
+Usage:
+    python benchmarks/bench_stages.py [--batch-sizes 1 8 32] [--threads 1 4]
+        [--image-sizes 256x64 512x128] [--output results.json] [--baseline baseline.json]
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import onnxruntime as ort
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.buffer_pool import BufferPool
+from core.ctc_decoder import CTCDecoder
+from core.image_processor import ImageProcessor
+from core.session_options import build_session_options, merge_session_settings
+from utils.stats import LatencyStats
+from benchmarks.make_synthetic_model import SYNTHETIC_MODEL_PATH
+
+CHARSET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+
+# Fields identifying one measurement, used to match baseline records
+RECORD_KEY = ("stage", "batch_size", "image_size", "threads")
+
+
+def parse_size(text: str) -> Tuple[int, int]:
+    """Parse a WIDTHxHEIGHT image size"""
+    try:
+        width, height = (int(part) for part in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected WIDTHxHEIGHT, got {text!r}")
+    return width, height
+
+
+def make_images(count: int, size: Tuple[int, int], fmt: str, seed: int = 0) -> List[bytes]:
+    """Encode synthetic CAPTCHA-like images (noise over a light background)"""
+    rng = np.random.default_rng(seed)
+    width, height = size
+    encoded = []
+    for _ in range(count):
+        pixels = rng.integers(160, 256, (height, width, 3), dtype=np.uint8)
+        pixels[rng.random((height, width)) < 0.05] = 0
+        buffer = io.BytesIO()
+        Image.fromarray(pixels).save(buffer, format=fmt)
+        encoded.append(buffer.getvalue())
+    return encoded
+
+
+def measure(func: Callable[[], Any], iterations: int, warmup: int) -> LatencyStats:
+    """Collect per-call latencies in milliseconds"""
+    for _ in range(warmup):
+        func()
+    
+    stats = LatencyStats()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        stats.add((time.perf_counter() - start) * 1000)
+    return stats
+
+
+def record(stage: str, batch_size: int, stats: LatencyStats,
+           image_size: Optional[str] = None, threads: Optional[int] = None) -> Dict[str, Any]:
+    """Summarize one measurement"""
+    summary = stats.summary()
+    return {
+        "stage": stage,
+        "batch_size": batch_size,
+        "image_size": image_size,
+        "threads": threads,
+        "p50_ms": summary["p50"],
+        "p95_ms": summary["p95"],
+        "p99_ms": summary["p99"],
+        "mean_ms": summary["mean"],
+        "images_per_second": batch_size * 1000 / summary["mean"] if summary["mean"] else 0.0
+    }
+
+
+def bench_image_stages(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """Decode and resize at every source size, normalize once per batch size"""
+    results = []
+    height, width = ImageProcessor.DEFAULT_HEIGHT, ImageProcessor.DEFAULT_WIDTH
+    pool = BufferPool((3, height, width))
+    
+    for size in args.image_sizes:
+        size_name = f"{size[0]}x{size[1]}"
+        for batch_size in args.batch_sizes:
+            encoded = make_images(batch_size, size, args.format)
+            decoded = [ImageProcessor.load(data) for data in encoded]
+            
+            stats = measure(lambda: [ImageProcessor.load(data) for data in encoded],
+                            args.iterations, args.warmup)
+            results.append(record("decode", batch_size, stats, image_size=size_name))
+            
+            stats = measure(lambda: [ImageProcessor.resize(image) for image in decoded],
+                            args.iterations, args.warmup)
+            results.append(record("resize", batch_size, stats, image_size=size_name))
+    
+    for batch_size in args.batch_sizes:
+        resized = [ImageProcessor.resize(ImageProcessor.load(data))
+                   for data in make_images(batch_size, (width, height), args.format)]
+        
+        def normalize():
+            batch = pool.acquire(len(resized))
+            for row, image in zip(batch, resized):
+                ImageProcessor.normalize_into(image, row)
+            pool.release(batch)
+        
+        stats = measure(normalize, args.iterations, args.warmup)
+        results.append(record("normalize", batch_size, stats))
+    
+    return results
+
+
+def bench_inference(args: argparse.Namespace) -> Tuple[List[Dict[str, Any]], Dict[int, np.ndarray]]:
+    """Time session.run per thread count and batch size
+    
+    Returns:
+        Tuple of (records, model output per batch size for the CTC stage)
+    """
+    results = []
+    outputs = {}
+    rng = np.random.default_rng(0)
+    
+    for threads in args.threads:
+        settings = merge_session_settings({"intra_op_num_threads": threads})
+        model_file, options = build_session_options(args.model, settings)
+        session = ort.InferenceSession(str(model_file), sess_options=options,
+                                       providers=['CPUExecutionProvider'])
+        input_name = session.get_inputs()[0].name
+        output_name = session.get_outputs()[0].name
+        
+        for batch_size in args.batch_sizes:
+            batch = rng.standard_normal(
+                (batch_size, 3, ImageProcessor.DEFAULT_HEIGHT, ImageProcessor.DEFAULT_WIDTH)
+            ).astype(np.float32)
+            
+            def run():
+                return session.run([output_name], {input_name: batch})[0]
+            
+            outputs.setdefault(batch_size, run())
+            stats = measure(run, args.iterations, args.warmup)
+            results.append(record("inference", batch_size, stats, threads=threads))
+    
+    return results, outputs
+
+
+def bench_ctc(args: argparse.Namespace, outputs: Dict[int, np.ndarray]) -> List[Dict[str, Any]]:
+    """Time greedy CTC decoding of real model outputs"""
+    results = []
+    for batch_size in args.batch_sizes:
+        predictions = outputs[batch_size]
+        stats = measure(lambda: CTCDecoder.decode_batch(predictions, CHARSET),
+                        args.iterations, args.warmup)
+        results.append(record("ctc", batch_size, stats))
+    return results
+
+
+def print_table(results: List[Dict[str, Any]], baseline: Optional[Dict[tuple, Dict[str, Any]]] = None):
+    """Print results, with the p50 change against the baseline if given"""
+    header = (f"{'stage':<10} {'batch':>5} {'image':>9} {'threads':>7} "
+              f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'img/s':>10}")
+    if baseline is not None:
+        header += f" {'vs base':>8}"
+    print(header)
+    print("-" * len(header))
+    
+    for row in results:
+        line = (f"{row['stage']:<10} {row['batch_size']:>5} {row['image_size'] or '-':>9} "
+                f"{row['threads'] or '-':>7} {row['p50_ms']:>9.3f} {row['p95_ms']:>9.3f} "
+                f"{row['p99_ms']:>9.3f} {row['images_per_second']:>10.1f}")
+        if baseline is not None:
+            base = baseline.get(tuple(row[field] for field in RECORD_KEY))
+            if base and base["p50_ms"] > 0:
+                line += f" {(row['p50_ms'] / base['p50_ms'] - 1) * 100:>+7.1f}%"
+            else:
+                line += f" {'new':>8}"
+        print(line)
+
+
+def find_regressions(results: List[Dict[str, Any]], baseline: Dict[tuple, Dict[str, Any]],
+                     tolerance: float) -> List[str]:
+    """Describe every measurement whose p50 grew by more than tolerance"""
+    regressions = []
+    for row in results:
+        base = baseline.get(tuple(row[field] for field in RECORD_KEY))
+        if base and base["p50_ms"] > 0 and row["p50_ms"] > base["p50_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{row['stage']} batch={row['batch_size']} image={row['image_size'] or '-'} "
+                f"threads={row['threads'] or '-'}: p50 {base['p50_ms']:.3f} -> {row['p50_ms']:.3f} ms"
+            )
+    return regressions
+
+
+def load_baseline(path: Path) -> Dict[tuple, Dict[str, Any]]:
+    """Load a saved report keyed by RECORD_KEY"""
+    with open(path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    return {tuple(row[field] for field in RECORD_KEY): row for row in report["results"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", type=Path, default=SYNTHETIC_MODEL_PATH,
+                        help="ONNX model to time (default: the synthetic model)")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, os.cpu_count() or 1],
+                        help="intra_op_num_threads values for the inference stage")
+    parser.add_argument("--image-sizes", type=parse_size, nargs="+",
+                        default=[(256, 64), (512, 128), (1024, 256)],
+                        help="Source image sizes as WIDTHxHEIGHT for decode and resize")
+    parser.add_argument("--format", choices=["PNG", "JPEG"], default="PNG",
+                        help="Encoding of the synthetic source images")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="Compare against an earlier JSON report")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Allowed p50 slowdown against the baseline (default: 0.10)")
+    args = parser.parse_args()
+    
+    if not args.model.exists():
+        print(f"Model not found: {args.model}")
+        return 1
+    args.threads = sorted(set(args.threads))
+    
+    results = bench_image_stages(args)
+    inference, outputs = bench_inference(args)
+    results += inference
+    results += bench_ctc(args, outputs)
+    
+    baseline = load_baseline(args.baseline) if args.baseline else None
+    print_table(results, baseline)
+    
+    if args.output:
+        report = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "model": str(args.model),
+            "environment": {
+                "python": platform.python_version(),
+                "onnxruntime": ort.__version__,
+                "numpy": np.__version__,
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count()
+            },
+            "iterations": args.iterations,
+            "results": results
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    
+    if baseline is not None:
+        regressions = find_regressions(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions beyond {args.tolerance:.0%} against {args.baseline}")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark pipelined predict_stream against sequential predict_batch
+
+Synthetic images are written to a temporary directory and predicted from
+their file paths, so file reads and decoding are part of the measurement.
+predict_batch runs decode, inference and CTC decoding one after the
+other; predict_stream overlaps them. For every prefetch pool size the
+report shows throughput and the utilization of each pipeline stage: the
+busiest stage is the bottleneck, and a stage that is mostly starved has
+more workers than it needs.
+
+Usage:
+    python benchmarks/bench_stream.py [--model PATH] [--images 512] [--batch-size 32]
+        [--prefetch-workers 1 2 4] [--image-size 512x128] [--output stream.json]
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import ModelManager, StreamPipeline
+from benchmarks.bench_stages import make_images, parse_size
+from benchmarks.make_synthetic_model import SYNTHETIC_MODEL_PATH
+import config
+
+
+def bench_batch(manager: ModelManager, paths: List[str], batch_size: int) -> Dict[str, Any]:
+    """Time sequential predict_batch over all paths"""
+    start = time.perf_counter()
+    result = manager.predict_batch(paths, batch_size=batch_size)
+    elapsed = time.perf_counter() - start
+    return {
+        "mode": "predict_batch",
+        "prefetch_workers": 0,
+        "images_per_s": len(paths) / elapsed,
+        "errors": sum(1 for error in result.errors if error is not None)
+    }
+
+
+def bench_stream(manager: ModelManager, paths: List[str], batch_size: int,
+                 prefetch_workers: int, ordered: bool) -> Dict[str, Any]:
+    """Time predict_stream over all paths and collect stage utilization"""
+    utilization: Dict[str, Any] = {}
+    errors = 0
+    start = time.perf_counter()
+    for result in manager.predict_stream(paths, batch_size=batch_size,
+                                         prefetch_workers=prefetch_workers, ordered=ordered,
+                                         utilization=utilization):
+        errors += result.error is not None
+    elapsed = time.perf_counter() - start
+    return {
+        "mode": "predict_stream",
+        "prefetch_workers": prefetch_workers,
+        "images_per_s": len(paths) / elapsed,
+        "errors": errors,
+        "stages": {name: utilization[name] for name in StreamPipeline.STAGES}
+    }
+
+
+def print_report(results: List[Dict[str, Any]]):
+    """Print throughput and per-stage utilization"""
+    header = (f"{'mode':<16} {'prefetch':>8} {'images/s':>10}  "
+              + "  ".join(f"{name:>8}" for name in StreamPipeline.STAGES))
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        stages = row.get("stages")
+        utilization = "  ".join(
+            f"{stages[name]['utilization']:>8.0%}" if stages else f"{'-':>8}"
+            for name in StreamPipeline.STAGES
+        )
+        print(f"{row['mode']:<16} {row['prefetch_workers']:>8} {row['images_per_s']:>10.1f}  {utilization}")
+    print("\nStage columns show utilization: busy time / (workers x wall time).")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", type=Path, default=SYNTHETIC_MODEL_PATH,
+                        help="ONNX model (default: the synthetic benchmark model)")
+    parser.add_argument("--config", type=Path, default=config.CONFIG_PATH)
+    parser.add_argument("--images", type=int, default=512)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--prefetch-workers", type=int, nargs="+",
+                        default=sorted({1, 2, min(4, os.cpu_count() or 1)}))
+    parser.add_argument("--image-size", type=parse_size, default=(512, 128),
+                        help="Source image WIDTHxHEIGHT (default: 512x128)")
+    parser.add_argument("--format", choices=["PNG", "JPEG"], default="PNG")
+    parser.add_argument("--unordered", action="store_true",
+                        help="Yield stream results as they complete instead of in input order")
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    args = parser.parse_args()
+    
+    if not args.model.exists():
+        print(f"Model not found: {args.model}")
+        return 1
+    
+    with contextlib.redirect_stdout(sys.stderr):
+        manager = ModelManager(args.model, args.config)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        # A few distinct images repeated, so generating them stays quick
+        encoded = make_images(min(args.images, 32), args.image_size, args.format)
+        paths = []
+        for index in range(args.images):
+            path = os.path.join(directory, f"{index:06d}.{args.format.lower()}")
+            with open(path, 'wb') as f:
+                f.write(encoded[index % len(encoded)])
+            paths.append(path)
+        
+        # Warm up the session and the file cache
+        manager.predict_batch(paths[:args.batch_size], batch_size=args.batch_size)
+        
+        results = [bench_batch(manager, paths, args.batch_size)]
+        for workers in args.prefetch_workers:
+            results.append(bench_stream(manager, paths, args.batch_size, workers,
+                                        ordered=not args.unordered))
+    
+    print_report(results)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"images": args.images, "batch_size": args.batch_size, "results": results},
+                      f, indent=2)
+        print(f"\nResults written to {args.output}")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Generate the tiny synthetic ONNX model used by the benchmark suite
+
+The model has the same interface as best_model.onnx: a float32
+(batch, 3, 64, 256) image batch in, (batch, 64, 63) CTC logits out. It is
+a single strided convolution followed by a linear projection, so timings
+of everything except session.run are representative without the real
+model. Requires the 'onnx' package; the generated file is committed so
+running the benchmarks does not.
+
+Usage:
+    python benchmarks/make_synthetic_model.py [--output benchmarks/synthetic_model.onnx]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+SYNTHETIC_MODEL_PATH = Path(__file__).parent / "synthetic_model.onnx"
+
+# Model interface, matching best_model.onnx
+HEIGHT, WIDTH = 64, 256
+TIME_STEPS = 64
+NUM_CLASSES = 63
+CHANNELS = 8
+
+
+def build_model(seed: int = 0):
+    """Build the synthetic model graph"""
+    from onnx import TensorProto, helper, numpy_helper
+    
+    rng = np.random.default_rng(seed)
+    features = CHANNELS * (WIDTH // 2) // TIME_STEPS
+    
+    initializers = [
+        numpy_helper.from_array(
+            rng.normal(0, 0.2, (CHANNELS, 3, 3, 3)).astype(np.float32), "conv_weight"),
+        numpy_helper.from_array(np.zeros(CHANNELS, dtype=np.float32), "conv_bias"),
+        numpy_helper.from_array(
+            np.array([0, TIME_STEPS, features], dtype=np.int64), "sequence_shape"),
+        numpy_helper.from_array(
+            rng.normal(0, 0.5, (features, NUM_CLASSES)).astype(np.float32), "proj_weight"),
+        numpy_helper.from_array(
+            rng.normal(0, 0.1, NUM_CLASSES).astype(np.float32), "proj_bias"),
+    ]
+    
+    nodes = [
+        # (B, 3, 64, 256) -> (B, 8, 32, 128)
+        helper.make_node("Conv", ["input", "conv_weight", "conv_bias"], ["conv"],
+                         kernel_shape=[3, 3], pads=[1, 1, 1, 1], strides=[2, 2]),
+        helper.make_node("Relu", ["conv"], ["relu"]),
+        # Collapse height: (B, 8, 128)
+        helper.make_node("ReduceMean", ["relu"], ["pooled"], axes=[2], keepdims=0),
+        # (B, 128, 8) -> (B, 64, 16)
+        helper.make_node("Transpose", ["pooled"], ["columns"], perm=[0, 2, 1]),
+        helper.make_node("Reshape", ["columns", "sequence_shape"], ["sequence"]),
+        # (B, 64, 63)
+        helper.make_node("MatMul", ["sequence", "proj_weight"], ["projected"]),
+        helper.make_node("Add", ["projected", "proj_bias"], ["output"]),
+    ]
+    
+    graph = helper.make_graph(
+        nodes,
+        "synthetic_captcha_model",
+        [helper.make_tensor_value_info("input", TensorProto.FLOAT, ["batch", 3, HEIGHT, WIDTH])],
+        [helper.make_tensor_value_info("output", TensorProto.FLOAT, ["batch", TIME_STEPS, NUM_CLASSES])],
+        initializers
+    )
+    
+    # Opset 13 / IR 7 loads on every ONNX Runtime release the app supports
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 7
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", type=Path, default=SYNTHETIC_MODEL_PATH)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    try:
+        import onnx
+    except ImportError:
+        print("The 'onnx' package is required: pip install onnx")
+        return 1
+    
+    model = build_model(args.seed)
+    onnx.checker.check_model(model)
+    onnx.save(model, str(args.output))
+    print(f"Wrote {args.output} ({args.output.stat().st_size} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,14 +2,69 @@
 """
 UltraCaptureV3 - PyInstaller Build Script
 Builds a standalone Windows executable from the Python application
+
+Profiles:
+    onefile     Single executable (default). Every launch unpacks the bundle
+                into a temporary directory before the application starts.
+    fast-start  One-dir layout that starts straight from disk, with PySide6
+                pruned to the Qt modules and plugins the application uses.
+
+Usage:
+    python build.py [--profile onefile|fast-start] [--optimize 0|1|2]
+        [--startup-runs 3] [--report build_report.json]
 """
 
+import argparse
+import ast
+import importlib.util
+import json
 import os
+import re
+import statistics
 import sys
 import shutil
 import subprocess
+import tempfile
+import time
 from pathlib import Path
 
+APP_NAME = "UltraCaptureV3"
+EXE_SUFFIX = ".exe" if os.name == "nt" else ""
+
+# Project sources scanned for PySide6 imports
+SOURCE_DIRS = ("ui", "core", "utils", "cli")
+SOURCE_FILES = ("main.py", "config.py")
+
+# Qt modules never imported directly but needed by the ones that are
+QT_MODULES_REQUIRED = {"QtCore", "QtGui", "QtWidgets"}
+
+# Fallback exclusion list when PySide6 is not importable from this interpreter
+QT_MODULES_HEAVY = (
+    "Qt3DAnimation", "Qt3DCore", "Qt3DExtras", "Qt3DInput", "Qt3DLogic", "Qt3DRender",
+    "QtBluetooth", "QtCharts", "QtDataVisualization", "QtGraphs", "QtLocation", "QtMultimedia",
+    "QtMultimediaWidgets", "QtNetwork", "QtOpenGL", "QtOpenGLWidgets", "QtPdf", "QtPdfWidgets",
+    "QtPositioning", "QtQml", "QtQuick", "QtQuick3D", "QtQuickControls2", "QtQuickWidgets",
+    "QtRemoteObjects", "QtScxml", "QtSensors", "QtSerialPort", "QtSpatialAudio", "QtSql",
+    "QtSvg", "QtSvgWidgets", "QtTest", "QtTextToSpeech", "QtUiTools", "QtWebChannel",
+    "QtWebEngineCore", "QtWebEngineQuick", "QtWebEngineWidgets", "QtWebSockets", "QtXml"
+)
+
+# Files under the bundled PySide6 directory removed by the fast-start
+# profile: translations, the software OpenGL fallback (the UI only uses
+# QtWidgets) and plugins for features the application does not use
+QT_PRUNED_PATHS = (
+    "translations",
+    "opengl32sw.dll",
+    "plugins/platforminputcontexts",
+    "plugins/networkinformation",
+    "plugins/tls",
+    "plugins/generic",
+    "plugins/iconengines"
+)
+
+# Image format plugins kept; PNG support is built into QtGui
+QT_IMAGE_FORMATS_KEPT = ("qjpeg", "qico")
+
 def print_header(text):
     """Print a formatted header"""
     print("\n" + "=" * 40)
@@ -26,9 +81,323 @@ def print_status(status, message):
     }
     print(f"{symbols.get(status, '[*]')} {message}")
 
-def main():
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Build the UltraCaptureV3 executable with PyInstaller")
+    parser.add_argument("--profile", choices=["onefile", "fast-start"], default="onefile",
+                        help="onefile: single executable (default); "
+                             "fast-start: pruned one-dir layout without unpacking on launch")
+    parser.add_argument("--optimize", type=int, choices=[0, 1, 2],
+                        help="Bytecode optimization level of the bundled modules "
+                             "(1 strips asserts, 2 also strips docstrings)")
+    parser.add_argument("--startup-runs", type=int, default=3,
+                        help="Launches used to measure startup time; the first is the cold start (0 to skip)")
+    parser.add_argument("--startup-timeout", type=float, default=120.0,
+                        help="Seconds to wait for one launch to report it is ready (default: 120)")
+    parser.add_argument("--report", type=Path, metavar="PATH",
+                        help="Write the size and startup report as JSON")
+    return parser.parse_args(argv)
+
+
+def find_qt_modules(project_root: Path) -> set:
+    """
+    Find the PySide6 modules imported by the application
+    
+    Args:
+        project_root: Project directory
+        
+    Returns:
+        Qt module names such as 'QtWidgets'
+    """
+    paths = [project_root / name for name in SOURCE_FILES]
+    for directory in SOURCE_DIRS:
+        paths.extend((project_root / directory).rglob("*.py"))
+    
+    modules = set(QT_MODULES_REQUIRED)
+    for path in paths:
+        try:
+            tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+        except (OSError, SyntaxError) as e:
+            print_status("warning", f"Could not scan {path}: {e}")
+            continue
+        
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module:
+                names = [node.module]
+                if node.module == "PySide6":
+                    names += [f"PySide6.{alias.name}" for alias in node.names]
+            else:
+                continue
+            
+            for name in names:
+                parts = name.split(".")
+                if parts[0] == "PySide6" and len(parts) > 1 and parts[1].startswith("Qt"):
+                    modules.add(parts[1])
+    
+    return modules
+
+
+def installed_qt_modules() -> set:
+    """Get the Qt modules shipped with the installed PySide6"""
+    spec = importlib.util.find_spec("PySide6")
+    if spec is None or not spec.submodule_search_locations:
+        return set(QT_MODULES_HEAVY)
+    
+    modules = set()
+    for location in spec.submodule_search_locations:
+        for entry in Path(location).iterdir():
+            if entry.name.startswith("Qt") and entry.suffix in (".pyd", ".so"):
+                modules.add(entry.name.split(".")[0])
+    return modules
+
+
+def pyinstaller_version() -> tuple:
+    """Get the installed PyInstaller version as (major, minor)"""
+    from PyInstaller import __version__
+    return tuple(int(part) for part in re.findall(r"\d+", __version__)[:2])
+
+
+def pyinstaller_command(args: argparse.Namespace, project_root: Path,
+                        dist_dir: Path, build_dir: Path) -> list:
+    """
+    Build the PyInstaller command line for the selected profile
+    
+    Returns:
+        Command line as a list of arguments
+    """
+    command = [sys.executable]
+    if args.optimize and pyinstaller_version() < (6, 6):
+        # Older PyInstaller compiles bundled modules at the interpreter's level
+        command.append("-" + "O" * args.optimize)
+    command += ["-m", "PyInstaller"]
+    
+    if args.profile == "onefile":
+        command += [
+            "--onefile",                                # Single executable file
+            "--windowed",                               # No console window
+            f"--name={APP_NAME}",                       # Executable name
+            "--add-data=resources:resources",           # Include resources directory
+            "--add-data=ui:ui",                         # Include UI directory
+            "--add-data=core:core",                     # Include core directory
+            "--add-data=utils:utils",                   # Include utils directory
+            "--hidden-import=PySide6",                  # Hidden imports
+            "--hidden-import=onnxruntime",
+            "--hidden-import=PIL",
+            "--hidden-import=numpy",
+            "--collect-all=PySide6",                    # Collect all PySide6 files
+        ]
+    else:
+        used = find_qt_modules(project_root)
+        excluded = sorted(installed_qt_modules() - used)
+        print_status("info", f"Qt modules used: {', '.join(sorted(used))}")
+        print_status("info", f"Qt modules excluded: {len(excluded)}")
+        
+        command += [
+            "--onedir",                                 # Start from disk, no unpacking
+            "--windowed",
+            "--noupx",                                  # Compressed DLLs load slower
+            f"--name={APP_NAME}",
+            "--add-data=resources:resources",
+            "--add-data=ui/styles:ui/styles",           # Code is bundled as bytecode
+            "--hidden-import=onnxruntime",
+            "--hidden-import=PIL",
+            "--hidden-import=numpy",
+            "--exclude-module=tkinter",
+        ]
+        # PyInstaller's PySide6 hooks collect only the imported Qt modules
+        # and their plugins; exclusions stop optional imports pulling more in
+        command += [f"--exclude-module=PySide6.{name}" for name in excluded]
+    
+    if args.optimize and pyinstaller_version() >= (6, 6):
+        command.append(f"--optimize={args.optimize}")
+    
+    command += [
+        f"--distpath={dist_dir}",                       # Output directory
+        f"--workpath={build_dir}",                      # Work directory
+        f"--specpath={project_root}",                   # Spec file directory
+    ]
+    
+    # Check for icon file
+    icon_path = project_root / "resources" / "images" / "icon.ico"
+    if icon_path.exists():
+        command.append(f"--icon={icon_path}")
+    
+    command.append(str(project_root / "main.py"))       # Main script
+    return command
+
+
+def prune_qt(app_dir: Path) -> dict:
+    """
+    Remove unused Qt files from a one-dir build
+    
+    Args:
+        app_dir: Application directory in dist
+        
+    Returns:
+        Dictionary with the number of removed files and bytes
+    """
+    removed = {"files": 0, "bytes": 0}
+    pyside_dir = next((path for path in app_dir.rglob("PySide6") if path.is_dir()), None)
+    if pyside_dir is None:
+        print_status("warning", "PySide6 directory not found in build output, nothing pruned")
+        return removed
+    
+    targets = [pyside_dir / relative for relative in QT_PRUNED_PATHS]
+    image_formats = pyside_dir / "plugins" / "imageformats"
+    if image_formats.exists():
+        targets += [path for path in image_formats.iterdir()
+                    if not path.stem.removeprefix("lib").startswith(QT_IMAGE_FORMATS_KEPT)]
+    
+    for target in targets:
+        if not target.exists():
+            continue
+        files = [target] if target.is_file() else [path for path in target.rglob("*") if path.is_file()]
+        removed["files"] += len(files)
+        removed["bytes"] += sum(path.stat().st_size for path in files)
+        if target.is_dir():
+            shutil.rmtree(target)
+        else:
+            target.unlink()
+    
+    return removed
+
+
+def size_report(output: Path, top: int = 10) -> dict:
+    """
+    Measure the build output
+    
+    Args:
+        output: Executable (onefile) or application directory (one-dir)
+        top: Number of largest components and files listed
+        
+    Returns:
+        Dictionary with total size, file count, largest components and files
+    """
+    if output.is_file():
+        size = output.stat().st_size
+        return {"bytes": size, "files": 1, "components": {}, "largest_files": [[output.name, size]]}
+    
+    files = [(path, path.stat().st_size) for path in output.rglob("*") if path.is_file()]
+    
+    # Group by top-level entry below the bundle contents directory
+    contents = output / "_internal" if (output / "_internal").is_dir() else output
+    components = {}
+    for path, size in files:
+        relative = path.relative_to(contents) if contents in path.parents else path.relative_to(output)
+        parts = relative.parts
+        name = "/".join(parts[:2]) if parts[0] == "PySide6" and len(parts) > 2 else parts[0]
+        components[name] = components.get(name, 0) + size
+    
+    largest = sorted(files, key=lambda item: item[1], reverse=True)[:top]
+    return {
+        "bytes": sum(size for _, size in files),
+        "files": len(files),
+        "components": dict(sorted(components.items(), key=lambda item: item[1], reverse=True)[:top]),
+        "largest_files": [[str(path.relative_to(output)), size] for path, size in largest]
+    }
+
+
+def measure_startup(exe_path: Path, runs: int, timeout: float) -> dict:
+    """
+    Launch the frozen application and time it to window and to ready
+    
+    Uses the application's --startup-probe option, which writes its
+    timings and exits as soon as the model is ready. The first launch
+    after a build is the cold start; the rest are warm starts.
+    
+    Args:
+        exe_path: Built executable
+        runs: Number of launches
+        timeout: Seconds allowed per launch
+        
+    Returns:
+        Dictionary with per-launch timings and the cold and warm summaries
+    """
+    launches = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for run in range(runs):
+            probe_path = Path(temp_dir) / f"startup_{run}.json"
+            launch_time = time.time()
+            try:
+                subprocess.run([str(exe_path), "--startup-probe", str(probe_path)],
+                               timeout=timeout, check=False)
+            except subprocess.TimeoutExpired:
+                print_status("error", f"Launch {run + 1} did not become ready within {timeout:.0f} s")
+                launches.append({"error": "timeout"})
+                continue
+            exit_ms = (time.time() - launch_time) * 1000
+            
+            if not probe_path.exists():
+                print_status("error", f"Launch {run + 1} exited without writing startup timings")
+                launches.append({"error": "no startup timings"})
+                continue
+            
+            with open(probe_path, 'r', encoding='utf-8') as f:
+                probe = json.load(f)
+            
+            # Time spent before main.py ran: process start and bundle unpacking
+            bootstrap_ms = (probe["start_epoch"] - launch_time) * 1000
+            launch = {"bootstrap_ms": bootstrap_ms, "exit_ms": exit_ms}
+            for key in ("window_ms", "ready_ms"):
+                if key in probe:
+                    launch[key] = bootstrap_ms + probe[key]
+            if "error" in probe:
+                launch["error"] = probe["error"]
+                print_status("warning", f"Launch {run + 1}: {probe['error']}")
+            launches.append(launch)
+    
+    def summarize(items):
+        summary = {}
+        for key in ("bootstrap_ms", "window_ms", "ready_ms"):
+            values = [item[key] for item in items if key in item]
+            if values:
+                summary[key] = statistics.median(values)
+        return summary
+    
+    return {
+        "launches": launches,
+        "cold": summarize(launches[:1]),
+        "warm": summarize(launches[1:])
+    }
+
+
+def print_report(size: dict, pruned: dict, startup: dict):
+    """Print the size and startup report"""
+    print_header("Build Report")
+    print_status("info", f"Output size: {size['bytes'] / (1024 * 1024):.1f} MB in {size['files']} files")
+    if pruned:
+        print_status("info", f"Pruned: {pruned['bytes'] / (1024 * 1024):.1f} MB in {pruned['files']} files")
+    
+    if size["components"]:
+        print("\nLargest components:")
+        for name, component_size in size["components"].items():
+            print(f"  {name:<40} {component_size / (1024 * 1024):>8.1f} MB")
+    
+    print("\nLargest files:")
+    for name, file_size in size["largest_files"]:
+        print(f"  {name:<60} {file_size / (1024 * 1024):>8.1f} MB")
+    
+    if startup:
+        print("\nStartup time (from launch):")
+        print(f"  {'':<6} {'bootstrap ms':>13} {'window ms':>10} {'ready ms':>10}")
+        for label in ("cold", "warm"):
+            summary = startup[label]
+            if summary:
+                print(f"  {label:<6} " + " ".join(
+                    f"{summary[key]:>{width}.0f}" if key in summary else f"{'-':>{width}}"
+                    for key, width in (("bootstrap_ms", 13), ("window_ms", 10), ("ready_ms", 10))
+                ))
+        if len(startup["launches"]) > 1:
+            print("  (warm values are medians over the launches after the first)")
+
+
+def main(argv=None):
     """Main build function"""
+    args = parse_args(argv)
     print_header("UltraCaptureV3 - Building Executable")
+    print_status("info", f"Build profile: {args.profile}")
     
     # Get project root directory
     project_root = Path(__file__).parent.absolute()
@@ -89,31 +458,7 @@ def main():
     # Build the executable
     print_header("Building Executable with PyInstaller...")
     
-    # PyInstaller arguments
-    pyinstaller_args = [
-        "pyinstaller",
-        "--onefile",                                    # Single executable file
-        "--windowed",                                   # No console window
-        "--name=UltraCaptureV3",                       # Executable name
-        "--add-data=resources:resources",              # Include resources directory
-        "--add-data=ui:ui",                            # Include UI directory
-        "--add-data=core:core",                        # Include core directory
-        "--add-data=utils:utils",                      # Include utils directory
-        "--hidden-import=PySide6",                     # Hidden imports
-        "--hidden-import=onnxruntime",
-        "--hidden-import=PIL",
-        "--hidden-import=numpy",
-        "--collect-all=PySide6",                       # Collect all PySide6 files
-        f"--distpath={dist_dir}",                      # Output directory
-        f"--workpath={build_dir}",                     # Work directory
-        f"--specpath={project_root}",                  # Spec file directory
-        str(project_root / "main.py")                  # Main script
-    ]
-    
-    # Check for icon file
-    icon_path = project_root / "resources" / "images" / "icon.ico"
-    if icon_path.exists():
-        pyinstaller_args.insert(3, f"--icon={icon_path}")
+    pyinstaller_args = pyinstaller_command(args, project_root, dist_dir, build_dir)
     
     print_status("info", f"Running PyInstaller...")
     print_status("info", f"Command: {' '.join(pyinstaller_args)}")
@@ -127,20 +472,52 @@ def main():
     print_status("ok", "PyInstaller build completed successfully")
     
     # Verify the executable was created
-    exe_path = dist_dir / "UltraCaptureV3.exe"
+    if args.profile == "onefile":
+        output_path = dist_dir / f"{APP_NAME}{EXE_SUFFIX}"
+        exe_path = output_path
+    else:
+        output_path = dist_dir / APP_NAME
+        exe_path = output_path / f"{APP_NAME}{EXE_SUFFIX}"
+    
     if exe_path.exists():
-        exe_size = exe_path.stat().st_size / (1024 * 1024)
         print_status("ok", f"Executable created: {exe_path}")
-        print_status("ok", f"Executable size: {exe_size:.2f} MB")
     else:
         print_status("error", f"Executable not found at: {exe_path}")
         return 1
     
+    pruned = {}
+    if args.profile == "fast-start":
+        print_status("info", "Pruning unused Qt files...")
+        pruned = prune_qt(output_path)
+        print_status("ok", f"Removed {pruned['files']} files")
+    
+    size = size_report(output_path)
+    
+    startup = {}
+    if args.startup_runs > 0:
+        print_status("info", f"Measuring startup time over {args.startup_runs} launch(es)...")
+        startup = measure_startup(exe_path, args.startup_runs, args.startup_timeout)
+    
+    print_report(size, pruned, startup)
+    
+    if args.report:
+        report = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "profile": args.profile,
+            "optimize": args.optimize,
+            "size": size,
+            "pruned": pruned,
+            "startup": startup
+        }
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print_status("ok", f"Report written to {args.report}")
+    
     print_header("Build Complete!")
     print_status("info", f"Executable location: {exe_path}")
     print_status("info", f"To test the executable: {exe_path}")
     print_status("info", "To create a distribution package:")
-    print_status("info", "  1. Copy the dist/UltraCaptureV3 folder")
+    print_status("info", f"  1. Copy the {output_path.relative_to(project_root)} {'file' if output_path.is_file() else 'folder'}")
     print_status("info", "  2. Create a zip file or installer")
     
     return 0
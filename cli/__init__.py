@@ -0,0 +1 @@
+"""Headless (Qt-free) entry points"""
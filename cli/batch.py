@@ -0,0 +1,343 @@
+"""
+Headless batch inference over directories, globs and list files
+"""
+import contextlib
+import csv
+import glob
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from core import ModelManager
+from utils import logger, iter_image_files, is_valid_image_file, LatencyStats
+from utils.metrics import InferenceMetrics
+
+
+# Per-process state, set up once by _init_worker
+_worker_manager: Optional[ModelManager] = None
+_worker_threads: Optional[ThreadPoolExecutor] = None
+_worker_batch_size = ModelManager.DEFAULT_BATCH_SIZE
+
+
+def iter_inputs(source: str, recursive: bool = False) -> Iterator[str]:
+    """
+    Lazily enumerate image paths from a batch source
+    
+    Args:
+        source: Directory, glob pattern, single image or text file with
+            one image path per line (blank lines and '#' comments ignored)
+        recursive: Descend into subdirectories when source is a directory
+    
+    Yields:
+        Image paths as strings
+    """
+    path = Path(source)
+    
+    if path.is_dir():
+        for image_path in iter_image_files(path, recursive=recursive):
+            yield str(image_path)
+    elif path.is_file() and is_valid_image_file(path):
+        yield str(path)
+    elif path.is_file():
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    yield line
+    else:
+        for match in glob.iglob(source, recursive=True):
+            if is_valid_image_file(Path(match)):
+                yield match
+
+
+def chunked(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    """Split an iterable into lists of at most size items"""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def result_rows(paths: List[str], result: Any) -> List[Dict[str, Any]]:
+    """
+    Turn a BatchPrediction into result rows
+    
+    Args:
+        paths: Image paths passed to predict_batch
+        result: BatchPrediction for those paths
+    
+    Returns:
+        One row per image with the ResultWriter fields
+    """
+    batch_ms = result.batch_times[0] if result.batch_times else None
+    return [
+        {
+            "path": image_path,
+            "text": text,
+            "error": error,
+            "batch_ms": batch_ms if error is None else None
+        }
+        for image_path, text, error in zip(paths, result.texts, result.errors)
+    ]
+
+
+def _init_worker(model_path: str, config_path: str, threads: int, batch_size: int,
+                 manager_options: Optional[Dict[str, Any]] = None):
+    """Create the model session and thread pool for this worker process"""
+    global _worker_manager, _worker_threads, _worker_batch_size
+    
+    # Keep stdout clean for streamed results
+    with contextlib.redirect_stdout(sys.stderr):
+        _worker_manager = ModelManager(Path(model_path), Path(config_path),
+                                       **(manager_options or {}))
+    _worker_threads = ThreadPoolExecutor(max_workers=threads)
+    _worker_batch_size = batch_size
+
+
+def _predict_chunk(paths: List[str]) -> Tuple[List[Dict[str, Any]], List[float]]:
+    """
+    Run one chunk through this worker's model
+    
+    The chunk is split into sub-batches that run concurrently on the
+    worker's threads; ONNX Runtime releases the GIL in session.run.
+    
+    Returns:
+        Tuple of (result rows, session.run times in ms)
+    """
+    sub_batches = list(chunked(paths, _worker_batch_size))
+    
+    def run(sub_batch: List[str]) -> Tuple[List[Dict[str, Any]], List[float]]:
+        result = _worker_manager.predict_batch(sub_batch, batch_size=_worker_batch_size)
+        return result_rows(sub_batch, result), result.batch_times
+    
+    rows = []
+    batch_times = []
+    for sub_rows, sub_times in _worker_threads.map(run, sub_batches):
+        rows.extend(sub_rows)
+        batch_times.extend(sub_times)
+    return rows, batch_times
+
+
+def _bounded_map(executor: Executor, chunks: Iterable[List[str]],
+                 max_in_flight: int) -> Iterator[tuple]:
+    """
+    Submit chunks with at most max_in_flight pending, yielding in order
+    
+    Unlike Executor.map, input is only consumed as results are drained,
+    so memory stays flat for arbitrarily long inputs.
+    
+    Yields:
+        Tuples of (rows, batch_times, chunk_latency_ms)
+    """
+    pending = deque()
+    
+    for chunk in chunks:
+        pending.append((time.perf_counter(), executor.submit(_predict_chunk, chunk)))
+        if len(pending) >= max_in_flight:
+            submitted, future = pending.popleft()
+            rows, batch_times = future.result()
+            yield rows, batch_times, (time.perf_counter() - submitted) * 1000
+    
+    while pending:
+        submitted, future = pending.popleft()
+        rows, batch_times = future.result()
+        yield rows, batch_times, (time.perf_counter() - submitted) * 1000
+
+
+class ResultWriter:
+    """Stream result rows as JSONL or CSV"""
+    
+    FIELDS = ["path", "text", "error", "batch_ms"]
+    
+    def __init__(self, stream: TextIO, fmt: str = "jsonl", header: bool = True):
+        """
+        Initialize result writer
+        
+        Args:
+            stream: Text stream to write to
+            fmt: 'jsonl' or 'csv'
+            header: Write the CSV header (off when appending to an existing file)
+        """
+        if fmt not in ("jsonl", "csv"):
+            raise ValueError(f"Unsupported output format: {fmt}")
+        
+        self.stream = stream
+        self.fmt = fmt
+        self._csv = None
+        if fmt == "csv":
+            self._csv = csv.DictWriter(stream, fieldnames=self.FIELDS)
+            if header:
+                self._csv.writeheader()
+    
+    def write(self, rows: List[Dict[str, Any]]):
+        """Write rows and flush so consumers see them immediately"""
+        for row in rows:
+            if self._csv is not None:
+                self._csv.writerow(row)
+            else:
+                self.stream.write(json.dumps(row) + "\n")
+        self.stream.flush()
+
+
+def run_batch(source: str, model_path: Path, config_path: Path,
+              output: Optional[str] = None, fmt: str = "jsonl",
+              batch_size: int = ModelManager.DEFAULT_BATCH_SIZE,
+              workers: int = 1, threads: int = 1,
+              recursive: bool = False,
+              manager_options: Optional[Dict[str, Any]] = None,
+              metrics: Optional[InferenceMetrics] = None) -> int:
+    """
+    Run headless batch inference and stream the results
+    
+    Args:
+        source: Directory, glob pattern, image or list file
+        model_path: Path to ONNX model file
+        config_path: Path to model configuration JSON
+        output: Output file path (stdout when None or '-')
+        fmt: Output format, 'jsonl' or 'csv'
+        batch_size: Images per session.run call
+        workers: Number of worker processes
+        threads: Number of inference threads per worker
+        recursive: Descend into subdirectories when source is a directory
+        manager_options: Extra ModelManager keyword arguments
+            (session_settings, variant, decoding_settings)
+        metrics: Optional metrics to report to. With several workers only
+            prediction and error counts are reported, from the results
+    
+    Returns:
+        Process exit code
+    """
+    if batch_size < 1 or workers < 1 or threads < 1:
+        logger.error("batch size, workers and threads must all be at least 1")
+        return 2
+    
+    init_args = (str(model_path), str(config_path), threads, batch_size, manager_options)
+    
+    if workers > 1:
+        # Imported here: multiprocessing adds noticeably to the startup of
+        # short single-process runs
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                       initargs=init_args)
+    else:
+        # Single process: one background thread drives inference so the
+        # main thread can write output while the next chunk runs
+        _init_worker(*init_args)
+        executor = ThreadPoolExecutor(max_workers=1)
+        if metrics is not None:
+            metrics.attach(_worker_manager)
+    
+    chunks = chunked(iter_inputs(source, recursive=recursive), batch_size * threads)
+    
+    images = 0
+    errors = 0
+    batch_stats = LatencyStats()
+    chunk_stats = LatencyStats()
+    start_time = time.perf_counter()
+    
+    if output and output != "-":
+        stream = open(output, 'w', newline='', encoding='utf-8')
+    else:
+        stream = sys.stdout
+    
+    try:
+        writer = ResultWriter(stream, fmt)
+        
+        for rows, batch_times, chunk_ms in _bounded_map(executor, chunks,
+                                                        max_in_flight=workers * 2):
+            writer.write(rows)
+            chunk_stats.add(chunk_ms)
+            for batch_ms in batch_times:
+                batch_stats.add(batch_ms)
+            
+            images += len(rows)
+            errors += sum(1 for row in rows if row["error"] is not None)
+            
+            # Worker processes cannot report to this process's metrics,
+            # so count their results here
+            if metrics is not None and workers > 1:
+                _record_rows(metrics, rows)
+    
+    except KeyboardInterrupt:
+        logger.warning("Batch run interrupted")
+    except BrokenPipeError:
+        # The reader went away (e.g. piped into head); stop quietly
+        logger.info("Output closed by reader, stopping")
+        if stream is sys.stdout:
+            _silence_stdout()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        if stream is not sys.stdout:
+            stream.close()
+    
+    elapsed = time.perf_counter() - start_time
+    _log_summary(images, errors, elapsed, batch_stats, chunk_stats)
+    if workers == 1:
+        log_reuse_stats(_worker_manager)
+    
+    return 0 if errors == 0 else 1
+
+
+def _silence_stdout():
+    """Point stdout at devnull so flushing it at exit does not raise again"""
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+    os.close(devnull)
+
+
+def _record_rows(metrics: InferenceMetrics, rows: List[Dict[str, Any]]):
+    """Count results returned by worker processes"""
+    for row in rows:
+        if row["error"] is None:
+            metrics.predictions.inc(source="model")
+        elif row["error"].startswith("Error during prediction"):
+            metrics.record_error("inference")
+        else:
+            metrics.record_error("invalid_image")
+
+
+def _log_summary(images: int, errors: int, elapsed: float,
+                 batch_stats: LatencyStats, chunk_stats: LatencyStats):
+    """Log throughput and latency summary"""
+    throughput = images / elapsed if elapsed > 0 else 0.0
+    batch = batch_stats.summary()
+    chunk = chunk_stats.summary()
+    
+    logger.info(f"Processed {images} images ({errors} errors) in {elapsed:.2f} s")
+    logger.info(f"Throughput: {throughput:.1f} images/s")
+    logger.info(
+        f"session.run latency per batch (ms): p50={batch['p50']:.2f} "
+        f"p95={batch['p95']:.2f} p99={batch['p99']:.2f} mean={batch['mean']:.2f}"
+    )
+    logger.info(
+        f"End-to-end latency per chunk (ms): p50={chunk['p50']:.2f} "
+        f"p95={chunk['p95']:.2f} p99={chunk['p99']:.2f} mean={chunk['mean']:.2f}"
+    )
+
+
+def log_reuse_stats(manager: ModelManager):
+    """Log prediction cache and near-duplicate index effectiveness"""
+    stats = manager.reuse_stats()
+    
+    if "cache" in stats:
+        cache = stats["cache"]
+        logger.info(
+            f"Prediction cache: {cache['hits']} hits, {cache['misses']} misses "
+            f"({cache['hit_ratio']:.1%}), {cache['evictions']} evictions, {cache['entries']} entries"
+        )
+    if "near_duplicates" in stats:
+        index = stats["near_duplicates"]
+        logger.info(
+            f"Near-duplicate index: {index['hits']} hits, {index['misses']} misses "
+            f"({index['hit_ratio']:.1%}), lookup p50={index['lookup_ms_p50']:.3f} ms "
+            f"p99={index['lookup_ms_p99']:.3f} ms, {index['lookup_ms_total']:.1f} ms spent "
+            f"vs {index['saved_ms']:.1f} ms inference saved"
+        )
@@ -0,0 +1,173 @@
+"""
+Accuracy and speed evaluation on a labelled image set
+"""
+import contextlib
+import csv
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from core import ModelManager, ImageProcessor
+from utils import logger, iter_image_files
+from cli.batch import chunked
+
+
+def iter_labelled_samples(source: Path, labels_file: Optional[Path] = None,
+                          recursive: bool = False) -> Iterator[Tuple[str, str]]:
+    """
+    Enumerate (image path, label) pairs
+    
+    Without a labels file the label is taken from the file name: the stem
+    up to the first underscore, so 'aB3xY9.png' and 'aB3xY9_2.png' are
+    both labelled 'aB3xY9'.
+    
+    Args:
+        source: Directory of images
+        labels_file: Optional CSV with 'path,label' rows; relative paths
+            are resolved against source
+        recursive: Descend into subdirectories
+        
+    Yields:
+        Tuples of (image path, label)
+    """
+    if labels_file is not None:
+        with open(labels_file, 'r', newline='', encoding='utf-8') as f:
+            for row in csv.reader(f):
+                if len(row) < 2 or row[0].startswith('#') or row[0] == 'path':
+                    continue
+                path = Path(row[0])
+                if not path.is_absolute():
+                    path = source / path
+                yield str(path), row[1]
+        return
+    
+    for image_path in iter_image_files(source, recursive=recursive):
+        yield str(image_path), image_path.stem.split('_')[0]
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance between two strings"""
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def evaluate(manager: ModelManager, source: Path, labels_file: Optional[Path] = None,
+             batch_size: int = ModelManager.DEFAULT_BATCH_SIZE,
+             recursive: bool = False) -> Dict[str, Any]:
+    """
+    Measure accuracy and speed of a model manager on a labelled image set
+    
+    Character accuracy is 1 - (total edit distance / total label length),
+    sequence accuracy the share of exact matches.
+    
+    Returns:
+        Dictionary of metrics
+    """
+    images = 0
+    errors = 0
+    exact = 0
+    label_chars = 0
+    distance = 0
+    run_ms = 0.0
+    start_time = time.perf_counter()
+    
+    samples = iter_labelled_samples(source, labels_file, recursive)
+    for chunk in chunked(samples, batch_size):
+        paths = [path for path, _ in chunk]
+        result = manager.predict_batch(paths, batch_size=batch_size)
+        run_ms += sum(result.batch_times)
+        
+        for (_, label), text, error in zip(chunk, result.texts, result.errors):
+            images += 1
+            label_chars += len(label)
+            if error is not None:
+                errors += 1
+                distance += len(label)
+                continue
+            exact += text == label
+            distance += min(edit_distance(text, label), len(label))
+    
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+    
+    return {
+        "images": images,
+        "errors": errors,
+        "sequence_accuracy": 100.0 * exact / images if images else 0.0,
+        "character_accuracy": 100.0 * (1 - distance / label_chars) if label_chars else 0.0,
+        "total_ms_per_image": elapsed_ms / images if images else 0.0,
+        "run_ms_per_image": run_ms / images if images else 0.0,
+        "images_per_second": 1000.0 * images / elapsed_ms if elapsed_ms > 0 else 0.0
+    }
+
+
+def run_evaluate(source: str, model_path: Path, config_path: Path,
+                 labels_file: Optional[str] = None,
+                 resize_strategies: Optional[List[str]] = None,
+                 jpeg_draft: Optional[bool] = None,
+                 batch_size: int = ModelManager.DEFAULT_BATCH_SIZE,
+                 recursive: bool = False, output: Optional[str] = None,
+                 manager_options: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Evaluate one or more resize strategies on a labelled image set
+    
+    Args:
+        source: Directory of labelled images
+        model_path: Path to ONNX model file
+        config_path: Path to model configuration JSON
+        labels_file: Optional CSV of 'path,label' rows
+        resize_strategies: Strategies to compare ('all' for every one);
+            defaults to the configured strategy
+        jpeg_draft: Override the configured JPEG draft mode setting
+        batch_size: Images per inference call
+        recursive: Descend into subdirectories
+        output: Optional path for a JSON report
+        manager_options: Extra ModelManager keyword arguments
+            (session_settings, variant)
+        
+    Returns:
+        Process exit code
+    """
+    with contextlib.redirect_stdout(sys.stderr):
+        manager = ModelManager(model_path, config_path, **(manager_options or {}))
+    
+    if jpeg_draft is not None:
+        manager.jpeg_draft = jpeg_draft
+    
+    strategies = resize_strategies or [manager.resize_strategy]
+    if 'all' in strategies:
+        strategies = list(ImageProcessor.RESIZE_FILTERS)
+    for strategy in strategies:
+        if strategy not in ImageProcessor.RESIZE_FILTERS:
+            logger.error(f"Unknown resize strategy: {strategy}")
+            return 2
+    
+    report = {}
+    for strategy in strategies:
+        manager.resize_strategy = strategy
+        logger.info(f"Evaluating resize strategy '{strategy}' (jpeg_draft={manager.jpeg_draft})")
+        report[strategy] = evaluate(manager, Path(source),
+                                    Path(labels_file) if labels_file else None,
+                                    batch_size, recursive)
+    
+    print(f"{'strategy':<10} {'images':>7} {'errors':>7} {'seq acc %':>10} "
+          f"{'char acc %':>11} {'ms/image':>9} {'run ms/image':>13} {'images/s':>9}")
+    for strategy, metrics in report.items():
+        print(f"{strategy:<10} {metrics['images']:>7} {metrics['errors']:>7} "
+              f"{metrics['sequence_accuracy']:>10.2f} {metrics['character_accuracy']:>11.2f} "
+              f"{metrics['total_ms_per_image']:>9.3f} {metrics['run_ms_per_image']:>13.3f} "
+              f"{metrics['images_per_second']:>9.1f}")
+    
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump({"jpeg_draft": manager.jpeg_draft, "strategies": report}, f, indent=2)
+        logger.info(f"Report written to {output}")
+    
+    return 0
@@ -0,0 +1,267 @@
+"""
+Local HTTP inference server with dynamic micro-batching
+"""
+import contextlib
+import email.parser
+import email.policy
+import json
+import sys
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from core import ModelManager
+from core.micro_batcher import MicroBatcher, QueueFullError
+from cli.batch import log_reuse_stats
+from utils import logger
+from utils.metrics import CONTENT_TYPE, InferenceMetrics
+import config
+
+
+class InferenceRequestHandler(BaseHTTPRequestHandler):
+    """Handle health, readiness and prediction requests
+    
+    Endpoints:
+        GET  /healthz  - process is up
+        GET  /readyz   - model session loaded and batcher running (503 while loading)
+        GET  /metrics  - Prometheus text format metrics
+        POST /predict  - image as raw body or multipart/form-data file
+    """
+    
+    # The server instance carries model_manager, batcher, metrics and
+    # request_timeout, set by run_server; model_manager and batcher stay
+    # None until the model has loaded
+    server_version = f"{config.APP_NAME}/{config.APP_VERSION}"
+    
+    # Paths reported by name in request metrics; anything else is 'other'
+    KNOWN_PATHS = ("/healthz", "/readyz", "/metrics", "/predict")
+    
+    def do_GET(self):
+        if self.path == "/metrics":
+            self._send(200, self.server.metrics.registry.render().encode("utf-8"), CONTENT_TYPE)
+        elif self.path == "/healthz":
+            self._send_json(200, {"status": "ok"})
+        elif self.path == "/readyz":
+            manager, batcher = self.server.model_manager, self.server.batcher
+            ready = (manager is not None and manager.is_ready()
+                     and batcher is not None and batcher.is_running())
+            self._send_json(200 if ready else 503, {
+                "ready": ready,
+                "queue_depth": batcher.queue_depth if batcher is not None else 0
+            })
+        else:
+            self._send_json(404, {"error": "Not found"})
+    
+    def do_POST(self):
+        if self.path != "/predict":
+            self._send_json(404, {"error": "Not found"})
+            return
+        
+        if self.server.model_manager is None:
+            self._send_error(503, "Model is still loading", "not_ready")
+            return
+        
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            self._send_error(400, "Invalid Content-Length header", "bad_request")
+            return
+        if length <= 0:
+            self._send_error(400, "Empty request body", "bad_request")
+            return
+        if length > config.MAX_IMAGE_SIZE:
+            self._send_error(413, f"Image larger than {config.MAX_IMAGE_SIZE} bytes", "too_large")
+            return
+        
+        body = self.rfile.read(length)
+        content_type = self.headers.get("Content-Type", "")
+        
+        try:
+            image_bytes = self._extract_image(body, content_type)
+        except Exception as e:
+            self._send_error(400, f"Malformed request body: {e}", "bad_request")
+            return
+        
+        manager = self.server.model_manager
+        try:
+            # Decode on this request's thread so decoding runs in parallel
+            prior = manager.lookup(image_bytes)
+            if prior.text is not None:
+                self._send_json(200, {
+                    "text": prior.text,
+                    "inference_ms": 0.0,
+                    "batch_size": 0,
+                    "cached": True
+                })
+                return
+            
+            prepared = manager.prepare(prior.image)
+        except ValueError as e:
+            self._send_error(400, str(e), "invalid_image")
+            return
+        except Exception as e:
+            self._send_error(500, f"Error preparing image: {e}", "internal")
+            return
+        
+        try:
+            future = self.server.batcher.submit(prepared)
+            text, inference_ms, batch_size = future.result(timeout=self.server.request_timeout)
+        except QueueFullError as e:
+            self._send_error(503, str(e), "queue_full")
+            return
+        except FutureTimeoutError:
+            future.cancel()
+            self._send_error(504, "Inference timed out", "timeout")
+            return
+        except Exception as e:
+            self._send_error(500, str(e), "inference")
+            return
+        
+        manager.remember(prior, text, inference_ms / batch_size)
+        
+        self._send_json(200, {
+            "text": text,
+            "inference_ms": inference_ms,
+            "batch_size": batch_size,
+            "cached": False
+        })
+    
+    @staticmethod
+    def _extract_image(body: bytes, content_type: str) -> bytes:
+        """Get the image bytes from a raw or multipart/form-data body"""
+        if not content_type.startswith("multipart/form-data"):
+            return body
+        
+        message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body
+        )
+        if not message.is_multipart():
+            raise ValueError("Malformed multipart body")
+        
+        for part in message.iter_parts():
+            if part.get_filename() or part.get_param("name", header="content-disposition") in ("image", "file"):
+                payload = part.get_payload(decode=True)
+                if payload:
+                    return payload
+        
+        raise ValueError("No image file found in multipart body")
+    
+    def _send_error(self, status: int, message: str, error_type: str):
+        """Write a JSON error response and count it by type"""
+        self.server.metrics.record_error(error_type)
+        self._send_json(status, {"error": message})
+    
+    def _send_json(self, status: int, payload: Dict[str, Any]):
+        """Write a JSON response"""
+        self._send(status, json.dumps(payload).encode("utf-8"), "application/json")
+    
+    def _send(self, status: int, data: bytes, content_type: str):
+        """Write a response and count the request"""
+        path = self.path if self.path in self.KNOWN_PATHS else "other"
+        self.server.requests.inc(path=path, status=status)
+        
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+
+class InferenceServer(ThreadingHTTPServer):
+    """Threading HTTP server with a listen backlog sized for the batcher queue
+    
+    The default backlog of 5 makes the kernel reset connections in a burst
+    long before the batcher queue fills, so overload would never reach the
+    batcher's 503 response.
+    """
+    
+    daemon_threads = True
+    
+    def __init__(self, address, request_queue_size: int):
+        # Read by server_activate() inside the base constructor
+        self.request_queue_size = request_queue_size
+        super().__init__(address, InferenceRequestHandler)
+        self.model_manager: Optional[ModelManager] = None
+        self.batcher: Optional[MicroBatcher] = None
+        self.load_failed = False
+
+
+def run_server(model_path: Path, config_path: Path, host: str = "127.0.0.1",
+               port: int = 8000, max_batch_size: int = 32, max_wait_ms: float = 5.0,
+               max_queue: int = 1024, manager_options: Optional[Dict[str, Any]] = None,
+               metrics: Optional[InferenceMetrics] = None) -> int:
+    """
+    Serve the model over HTTP until interrupted
+    
+    The port is bound before the model loads, so /healthz answers right
+    away and /readyz reports 503 until the model is ready.
+    
+    Args:
+        model_path: Path to ONNX model file
+        config_path: Path to model configuration JSON
+        host: Interface to bind
+        port: Port to bind
+        max_batch_size: Maximum requests per model run
+        max_wait_ms: Longest wait for a batch to fill
+        max_queue: Maximum requests waiting for inference
+        manager_options: Extra ModelManager keyword arguments
+            (session_settings, variant)
+        metrics: Metrics to report to and serve on /metrics (created if None)
+    
+    Returns:
+        Process exit code
+    """
+    if max_batch_size < 1 or max_queue < 1:
+        logger.error("max batch size and max queue must both be at least 1")
+        return 2
+    
+    metrics = metrics or InferenceMetrics()
+    
+    server = InferenceServer((host, port), request_queue_size=max_queue)
+    server.metrics = metrics
+    server.requests = metrics.registry.counter(
+        f"{metrics.prefix}_http_requests_total", "HTTP requests by path and status", ["path", "status"])
+    server.request_timeout = config.INFERENCE_TIMEOUT
+    
+    def load_model():
+        try:
+            with contextlib.redirect_stdout(sys.stderr):
+                model_manager = ModelManager(model_path, config_path, **(manager_options or {}))
+        except Exception as e:
+            logger.error(f"Could not load model: {e}")
+            server.load_failed = True
+            server.shutdown()
+            return
+        
+        batcher = MicroBatcher(model_manager, max_batch_size=max_batch_size,
+                               max_wait_ms=max_wait_ms, max_queue=max_queue)
+        batcher.start()
+        metrics.attach(model_manager)
+        metrics.queue_depth.set_function(lambda: batcher.queue_depth, queue="server")
+        
+        # Handlers treat a set model_manager as loaded, so set it last
+        server.batcher = batcher
+        server.model_manager = model_manager
+        logger.info("Model loaded, ready for requests")
+    
+    logger.info(f"Serving on http://{host}:{server.server_address[1]} "
+                f"(max batch {max_batch_size}, max wait {max_wait_ms} ms)")
+    threading.Thread(target=load_model, name="model-loader", daemon=True).start()
+    
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down")
+    finally:
+        server.server_close()
+        if server.batcher is not None:
+            server.batcher.stop(timeout=5)
+        if server.model_manager is not None:
+            log_reuse_stats(server.model_manager)
+    
+    return 1 if server.load_failed else 0
@@ -0,0 +1,411 @@
+"""
+Watch-folder mode: continuous incremental inference on a spool directory
+"""
+import contextlib
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+from core import ModelManager
+from cli.batch import ResultWriter, result_rows, log_reuse_stats, _log_summary
+from utils import logger, iter_image_files, LatencyStats
+from utils.metrics import InferenceMetrics
+
+# Suffix appended to an image path for its sidecar result file
+SIDECAR_SUFFIX = ".json"
+
+
+class FolderWatcher:
+    """Poll a directory and queue new or changed images
+    
+    A scanning thread walks the directory every poll_interval seconds and
+    queues files that are new or changed since they were last processed.
+    The consumer calls mark_done() once a path's result is written, which
+    records its (size, mtime) in the index and appends it to a journal
+    next to the index file, so a crash loses at most the batch in flight
+    and each batch costs only its own entries. The journal is folded into
+    the index file on start and stop. Queued paths are not queued again
+    until they change. Files modified within the last settle seconds are
+    left for a later scan, since producers may still be writing them.
+    Entries of deleted files are dropped from the index.
+    
+    Queued paths wait in a backlog of at most max_backlog entries. When it
+    is full the scan blocks until the consumer catches up, so a burst of
+    many thousands of files never holds more than max_backlog paths.
+    """
+    
+    def __init__(self, directory: Path, recursive: bool = False, max_backlog: int = 1024,
+                 poll_interval: float = 1.0, settle: float = 0.5,
+                 index_path: Optional[Path] = None):
+        """
+        Initialize folder watcher
+        
+        Args:
+            directory: Directory to watch
+            recursive: Also watch subdirectories
+            max_backlog: Maximum paths waiting to be processed
+            poll_interval: Seconds between scans
+            settle: Seconds a file must be unmodified before it is queued
+            index_path: JSON file keeping the index across restarts, so
+                files processed before are not processed again; entries
+                added since the last save go to <index_path>.journal
+        """
+        if max_backlog < 1:
+            raise ValueError("max_backlog must be at least 1")
+        
+        self.directory = Path(directory)
+        self.recursive = recursive
+        self.poll_interval = poll_interval
+        self.settle = settle
+        self.index_path = Path(index_path) if index_path else None
+        self.journal_path = (self.index_path.with_name(self.index_path.name + ".journal")
+                             if self.index_path else None)
+        
+        self._index: Dict[str, Tuple[int, int]] = self._load_index()
+        self._pending: Dict[str, Tuple[int, int]] = {}  # Queued, result not yet written
+        self._lock = threading.Lock()
+        self._journal: Optional[TextIO] = None
+        self._backlog: "queue.Queue[str]" = queue.Queue(maxsize=max_backlog)
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        
+        self.scans = 0
+        self.queued = 0
+        self.backpressure_s = 0.0
+    
+    @property
+    def backlog(self) -> int:
+        """Number of paths waiting to be processed"""
+        return self._backlog.qsize()
+    
+    @property
+    def indexed(self) -> int:
+        """Number of files in the index"""
+        return len(self._index)
+    
+    def is_running(self) -> bool:
+        """Check if the scanning thread is running"""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self):
+        """Start the scanning thread"""
+        if self.is_running():
+            return
+        if not self.directory.is_dir():
+            raise ValueError(f"Not a directory: {self.directory}")
+        # Fold the previous run's journal into the index file
+        self._save_index()
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._loop, name="folder-watcher", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop the scanning thread and save the index
+        
+        Paths still in the backlog were never marked done, so the next run
+        queues them again.
+        """
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._save_index()
+    
+    def mark_done(self, paths: List[str]):
+        """
+        Record paths whose results have been written
+        
+        The entries are appended to the journal, so the cost per batch does
+        not grow with the size of the index.
+        
+        Args:
+            paths: Paths returned by next_batch
+        """
+        entries = []
+        with self._lock:
+            for path in paths:
+                key = self._pending.pop(path, None)
+                if key is not None:
+                    self._index[path] = key
+                    entries.append(json.dumps([path, *key]) + "\n")
+        
+        if self.journal_path is None or not entries:
+            return
+        try:
+            if self._journal is None:
+                self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+                self._journal = open(self.journal_path, 'a', encoding='utf-8')
+            self._journal.writelines(entries)
+            self._journal.flush()
+        except OSError as e:
+            logger.warning(f"Could not write watch journal {self.journal_path}: {e}")
+    
+    def next_batch(self, max_size: int, max_wait_ms: float = 200.0,
+                   timeout: float = 0.5) -> List[str]:
+        """
+        Take the next group of queued paths
+        
+        Blocks up to timeout seconds for the first path, then keeps
+        collecting arrivals until max_size paths are in hand or
+        max_wait_ms has passed.
+        
+        Returns:
+            Paths to process (empty if nothing arrived within timeout)
+        """
+        try:
+            batch = [self._backlog.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        
+        deadline = time.perf_counter() + max_wait_ms / 1000.0
+        while len(batch) < max_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining <= 0:
+                    batch.append(self._backlog.get_nowait())
+                else:
+                    batch.append(self._backlog.get(timeout=remaining))
+            except queue.Empty:
+                break
+        
+        return batch
+    
+    def scan(self) -> int:
+        """
+        Walk the directory once and queue new or changed images
+        
+        Returns:
+            Number of paths queued
+        """
+        queued = 0
+        seen = set()
+        now = time.time()
+        
+        for image_path in iter_image_files(self.directory, recursive=self.recursive):
+            path = str(image_path)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                # Removed between listing and stat
+                continue
+            
+            seen.add(path)
+            key = (stat.st_size, stat.st_mtime_ns)
+            with self._lock:
+                known = key in (self._index.get(path), self._pending.get(path))
+            if known or now - stat.st_mtime < self.settle:
+                continue
+            
+            if not self._put(path):
+                return queued
+            with self._lock:
+                self._pending[path] = key
+            queued += 1
+        
+        # Forget deleted files so the index does not grow without bound
+        with self._lock:
+            for path in [path for path in self._index if path not in seen]:
+                del self._index[path]
+        
+        self.scans += 1
+        self.queued += queued
+        return queued
+    
+    def _put(self, path: str) -> bool:
+        """Queue a path, blocking while the backlog is full (False if stopped)"""
+        blocked_since = None
+        while not self._stopping.is_set():
+            try:
+                self._backlog.put(path, timeout=0.1)
+                break
+            except queue.Full:
+                if blocked_since is None:
+                    blocked_since = time.perf_counter()
+        
+        if blocked_since is not None:
+            self.backpressure_s += time.perf_counter() - blocked_since
+        return not self._stopping.is_set()
+    
+    def _loop(self):
+        """Scanning thread main loop"""
+        while not self._stopping.is_set():
+            try:
+                self.scan()
+            except Exception as e:
+                logger.error(f"Error scanning {self.directory}: {e}")
+            self._stopping.wait(self.poll_interval)
+    
+    def _load_index(self) -> Dict[str, Tuple[int, int]]:
+        """Read the index file and replay the journal written after it"""
+        index: Dict[str, Tuple[int, int]] = {}
+        if self.index_path is None:
+            return index
+        
+        if self.index_path.exists():
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    index = {path: tuple(key) for path, key in json.load(f).items()}
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable watch index {self.index_path}: {e}")
+        
+        if self.journal_path.exists():
+            try:
+                with open(self.journal_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            path, size, mtime_ns = json.loads(line)
+                        except (ValueError, TypeError):
+                            # Partial last line of a run that was killed
+                            continue
+                        index[path] = (size, mtime_ns)
+            except OSError as e:
+                logger.warning(f"Ignoring unreadable watch journal {self.journal_path}: {e}")
+        
+        return index
+    
+    def _save_index(self):
+        """Write the whole index file and start a new journal"""
+        if self.index_path is None:
+            return
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        with self._lock:
+            index = dict(self._index)
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(index, f)
+            os.replace(temp_path, self.index_path)
+            self.journal_path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Could not save watch index {self.index_path}: {e}")
+
+
+def write_sidecar(row: Dict[str, Any]):
+    """Write a result row next to its image as <image>.json"""
+    sidecar_path = Path(row["path"] + SIDECAR_SUFFIX)
+    temp_path = sidecar_path.with_suffix(f".{os.getpid()}.tmp")
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(row, f)
+    os.replace(temp_path, sidecar_path)
+
+
+def open_results_log(output: str, fmt: str) -> Tuple[TextIO, ResultWriter]:
+    """
+    Open a results log for appending
+    
+    Returns:
+        Tuple of (stream, writer); the CSV header is only written to new files
+    """
+    stream = open(output, 'a', newline='', encoding='utf-8')
+    return stream, ResultWriter(stream, fmt, header=stream.tell() == 0)
+
+
+def run_watch(directory: str, model_path: Path, config_path: Path,
+              output: Optional[str] = None, fmt: str = "jsonl", sidecar: bool = False,
+              batch_size: int = ModelManager.DEFAULT_BATCH_SIZE, max_backlog: int = 1024,
+              poll_interval: float = 1.0, max_wait_ms: float = 200.0,
+              recursive: bool = False, index_path: Optional[Path] = None,
+              manager_options: Optional[Dict[str, Any]] = None,
+              metrics: Optional[InferenceMetrics] = None) -> int:
+    """
+    Watch a directory and predict new or changed images until interrupted
+    
+    Args:
+        directory: Directory to watch
+        model_path: Path to ONNX model file
+        config_path: Path to model configuration JSON
+        output: Results log, appended to (stdout when None or '-')
+        fmt: Output format, 'jsonl' or 'csv'
+        sidecar: Also write each result next to its image as <image>.json
+        batch_size: Maximum images per inference call
+        max_backlog: Maximum paths waiting to be processed
+        poll_interval: Seconds between directory scans
+        max_wait_ms: Longest time to wait for more arrivals to fill a batch
+        recursive: Also watch subdirectories
+        index_path: JSON file keeping the file index across restarts
+        manager_options: Extra ModelManager keyword arguments
+            (session_settings, variant)
+        metrics: Optional metrics to report to
+    
+    Returns:
+        Process exit code
+    """
+    if batch_size < 1 or max_backlog < 1:
+        logger.error("batch size and max backlog must both be at least 1")
+        return 2
+    
+    # Keep stdout clean for streamed results
+    with contextlib.redirect_stdout(sys.stderr):
+        model_manager = ModelManager(model_path, config_path, **(manager_options or {}))
+    
+    watcher = FolderWatcher(Path(directory), recursive=recursive, max_backlog=max_backlog,
+                            poll_interval=poll_interval, index_path=index_path)
+    if metrics is not None:
+        metrics.attach(model_manager)
+        metrics.queue_depth.set_function(lambda: watcher.backlog, queue="watch")
+    
+    if output and output != "-":
+        stream, writer = open_results_log(output, fmt)
+    else:
+        stream, writer = sys.stdout, ResultWriter(sys.stdout, fmt)
+    
+    images = 0
+    errors = 0
+    batch_stats = LatencyStats()
+    chunk_stats = LatencyStats()
+    start_time = time.perf_counter()
+    
+    try:
+        watcher.start()
+        logger.info(f"Watching {directory} (batch size {batch_size}, backlog {max_backlog})")
+        
+        while True:
+            paths = watcher.next_batch(batch_size, max_wait_ms)
+            if not paths:
+                continue
+            
+            batch_start = time.perf_counter()
+            result = model_manager.predict_batch(paths, batch_size=batch_size)
+            rows = result_rows(paths, result)
+            writer.write(rows)
+            if sidecar:
+                for row in rows:
+                    try:
+                        write_sidecar(row)
+                    except OSError as e:
+                        logger.warning(f"Could not write sidecar for {row['path']}: {e}")
+            watcher.mark_done(paths)
+            
+            chunk_stats.add((time.perf_counter() - batch_start) * 1000)
+            for batch_ms in result.batch_times:
+                batch_stats.add(batch_ms)
+            images += len(rows)
+            errors += sum(1 for row in rows if row["error"] is not None)
+            logger.debug(f"Processed {len(rows)} images, {watcher.backlog} waiting")
+    
+    except KeyboardInterrupt:
+        logger.info("Stopping watch")
+    except ValueError as e:
+        logger.error(str(e))
+        return 2
+    finally:
+        watcher.stop(timeout=5)
+        if stream is not sys.stdout:
+            stream.close()
+    
+    elapsed = time.perf_counter() - start_time
+    _log_summary(images, errors, elapsed, batch_stats, chunk_stats)
+    logger.info(f"Watch index: {watcher.indexed} files, {watcher.scans} scans, "
+                f"{watcher.backpressure_s:.1f} s scanning blocked by a full backlog")
+    log_reuse_stats(model_manager)
+    
+    return 0 if errors == 0 else 1
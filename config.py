@@ -29,6 +29,15 @@ WINDOW_HEIGHT = 800
 MIN_WINDOW_WIDTH = 800
 MIN_WINDOW_HEIGHT = 600
 
+# Per-user cache directory (pre-scaled UI images)
+CACHE_DIR = Path(
+    os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+) / APP_NAME
+THUMBNAIL_CACHE_DIR = CACHE_DIR / "thumbnails"
+
+# Results log written into folders watched from the GUI
+WATCH_RESULTS_FILE = "captcha_results.jsonl"
+
 # Theme settings
 DEFAULT_THEME = "dark"
 THEME_STYLESHEET = STYLES_DIR / "fallout_theme.qss"
@@ -1,8 +1,52 @@
-"""Core modules for model inference"""
-from .model_manager import ModelManager
-from .image_processor import ImageProcessor
-from .ctc_decoder import CTCDecoder
-from .config_loader import ConfigLoader
+"""Core modules for model inference
 
-__all__ = ['ModelManager', 'ImageProcessor', 'CTCDecoder', 'ConfigLoader']
+Submodules are imported on first use of one of their names, so
+``import core`` is cheap and never needs PySide6. onnxruntime is only
+imported once a ModelManager loads its model.
+"""
+import importlib
+from typing import TYPE_CHECKING
 
+# Public name -> submodule defining it
+_EXPORTS = {
+    'ModelManager': 'model_manager',
+    'BatchPrediction': 'model_manager',
+    'StreamPipeline': 'stream_pipeline',
+    'StreamResult': 'stream_pipeline',
+    'AsyncModelManager': 'async_model_manager',
+    'ImageProcessor': 'image_processor',
+    'ImageSource': 'image_processor',
+    'CTCDecoder': 'ctc_decoder',
+    'DecodingConstraints': 'ctc_beam_search',
+    'ConfigLoader': 'config_loader',
+    'PredictionResult': 'timing',
+    'StageHistograms': 'timing'
+}
+
+# Static imports for type checkers and for PyInstaller's import analysis,
+# which cannot see the importlib calls below
+if TYPE_CHECKING:
+    from .model_manager import ModelManager, BatchPrediction
+    from .stream_pipeline import StreamPipeline, StreamResult
+    from .async_model_manager import AsyncModelManager
+    from .image_processor import ImageProcessor, ImageSource
+    from .ctc_decoder import CTCDecoder
+    from .ctc_beam_search import DecodingConstraints
+    from .config_loader import ConfigLoader
+    from .timing import PredictionResult, StageHistograms
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """Import the submodule defining name on first access"""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,153 @@
+"""
+asyncio facade over ModelManager
+"""
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional, Tuple, Union
+
+from .model_manager import ModelManager
+from .image_processor import ImageSource
+
+
+class AsyncModelManager:
+    """Await predictions without blocking the event loop
+    
+    Image decoding/resizing runs on a decode thread pool and session.run
+    plus CTC decoding on a separate inference pool, so slow decodes never
+    hold up the model. A semaphore bounds how many requests are in flight;
+    excess callers wait on the event loop instead of piling up threads.
+    
+    Cancelling a request (or hitting its deadline) drops it at the next
+    stage boundary; work that has not started yet is never run.
+    
+    Example:
+        async with AsyncModelManager(manager, max_concurrency=16) as predictor:
+            text, inference_ms = await predictor.predict(image_bytes, timeout=2.0)
+    """
+    
+    def __init__(self, model_manager: ModelManager, max_concurrency: int = 8,
+                 decode_workers: Optional[int] = None, inference_workers: int = 1,
+                 default_timeout: Optional[float] = None):
+        """
+        Initialize async model manager
+        
+        Args:
+            model_manager: Loaded ModelManager
+            max_concurrency: Maximum requests in flight at once
+            decode_workers: Threads for decoding images (default: min(4, CPUs))
+            inference_workers: Threads calling session.run
+            default_timeout: Deadline in seconds applied when a call gives none
+        """
+        if max_concurrency < 1 or inference_workers < 1:
+            raise ValueError("max_concurrency and inference_workers must be at least 1")
+        
+        self.model_manager = model_manager
+        self.max_concurrency = max_concurrency
+        self.default_timeout = default_timeout
+        self._decode_executor = ThreadPoolExecutor(
+            max_workers=decode_workers or min(4, os.cpu_count() or 1),
+            thread_name_prefix="decode"
+        )
+        self._inference_executor = ThreadPoolExecutor(
+            max_workers=inference_workers,
+            thread_name_prefix="inference"
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._in_flight = 0
+    
+    @property
+    def in_flight(self) -> int:
+        """Number of requests currently holding a concurrency slot"""
+        return self._in_flight
+    
+    async def predict(self, image: ImageSource, timeout: Optional[float] = None) -> Tuple[str, float]:
+        """
+        Predict CAPTCHA text from image
+        
+        Args:
+            image: Image file path, encoded bytes, uint8 array or PIL image
+            timeout: Deadline in seconds, including time spent waiting for a
+                concurrency slot (default: default_timeout)
+        
+        Returns:
+            Tuple of (predicted_text, inference_time_ms); inference time
+            is 0.0 for prediction cache and near-duplicate hits
+        
+        Raises:
+            asyncio.TimeoutError: If the deadline passes
+            RuntimeError: If decoding or inference fails
+        """
+        timeout = self.default_timeout if timeout is None else timeout
+        if timeout is None:
+            return await self._predict(image)
+        return await asyncio.wait_for(self._predict(image), timeout)
+    
+    async def predict_many(self, images: Iterable[ImageSource], timeout: Optional[float] = None,
+                           return_exceptions: bool = True) -> List[Union[Tuple[str, float], BaseException]]:
+        """
+        Predict many images concurrently, bounded by max_concurrency
+        
+        Args:
+            images: Image sources
+            timeout: Per-request deadline in seconds
+            return_exceptions: Return failures in place instead of raising
+        
+        Returns:
+            Results (or exceptions) in input order
+        """
+        return await asyncio.gather(
+            *(self.predict(image, timeout) for image in images),
+            return_exceptions=return_exceptions
+        )
+    
+    async def _predict(self, image: ImageSource) -> Tuple[str, float]:
+        """Run the decode and inference stages on their executors"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        loop = asyncio.get_running_loop()
+        async with self._semaphore:
+            self._in_flight += 1
+            try:
+                try:
+                    return await self._run_stages(loop, image)
+                except (asyncio.CancelledError, asyncio.TimeoutError):
+                    raise
+                except Exception as e:
+                    self.model_manager._report_error(e)
+                    raise RuntimeError(f"Error during prediction: {e}")
+            finally:
+                self._in_flight -= 1
+    
+    async def _run_stages(self, loop: asyncio.AbstractEventLoop, image: ImageSource) -> Tuple[str, float]:
+        """Cache lookup and decode on the decode pool, then inference on the inference pool"""
+        manager = self.model_manager
+        
+        def lookup_and_prepare():
+            prior = manager.lookup(image)
+            if prior.text is not None:
+                return prior, None
+            return prior, manager.prepare(prior.image)
+        
+        prior, prepared = await loop.run_in_executor(self._decode_executor, lookup_and_prepare)
+        if prepared is None:
+            # Cache or near-duplicate hit: no inference ran
+            return prior.text, 0.0
+        
+        texts, inference_time = await loop.run_in_executor(
+            self._inference_executor, manager.infer, [prepared]
+        )
+        manager.remember(prior, texts[0], inference_time)
+        return texts[0], inference_time
+    
+    def close(self, wait: bool = True):
+        """Shut down the executors; pending work that has not started is cancelled"""
+        self._decode_executor.shutdown(wait=wait, cancel_futures=True)
+        self._inference_executor.shutdown(wait=wait, cancel_futures=True)
+    
+    async def __aenter__(self) -> 'AsyncModelManager':
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
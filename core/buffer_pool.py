@@ -0,0 +1,62 @@
+"""
+Reusable preallocated input buffers
+"""
+import threading
+import numpy as np
+from typing import List, Tuple
+
+
+class BufferPool:
+    """Pool of C-contiguous (B, *item_shape) arrays
+    
+    acquire() hands out a view of the first batch_size rows of a pooled
+    buffer, which stays C-contiguous, so one buffer serves every batch
+    size up to its capacity. Views must be given back with release().
+    Safe to use from several threads.
+    """
+    
+    def __init__(self, item_shape: Tuple[int, ...], dtype=np.float32, max_buffers: int = 4):
+        """
+        Initialize buffer pool
+        
+        Args:
+            item_shape: Shape of one item, e.g. (3, H, W)
+            dtype: Buffer dtype
+            max_buffers: Number of idle buffers kept for reuse
+        """
+        self.item_shape = tuple(item_shape)
+        self.dtype = np.dtype(dtype)
+        self.max_buffers = max_buffers
+        self._free: List[np.ndarray] = []
+        self._lock = threading.Lock()
+        self.allocations = 0
+    
+    def acquire(self, batch_size: int) -> np.ndarray:
+        """
+        Get a (batch_size, *item_shape) buffer
+        
+        Contents are undefined; callers overwrite every row.
+        """
+        with self._lock:
+            # Smallest idle buffer that is big enough
+            best = None
+            for i, buffer in enumerate(self._free):
+                if len(buffer) >= batch_size and (best is None or len(buffer) < len(self._free[best])):
+                    best = i
+            
+            if best is not None:
+                return self._free.pop(best)[:batch_size]
+            
+            self.allocations += 1
+        
+        return np.empty((batch_size,) + self.item_shape, dtype=self.dtype)[:batch_size]
+    
+    def release(self, view: np.ndarray):
+        """Return a buffer obtained from acquire() to the pool"""
+        buffer = view if view.base is None else view.base
+        
+        with self._lock:
+            self._free.append(buffer)
+            if len(self._free) > self.max_buffers:
+                # Drop the smallest buffer; large ones serve more batch sizes
+                self._free.remove(min(self._free, key=len))
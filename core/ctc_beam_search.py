@@ -0,0 +1,317 @@
+"""
+CTC prefix beam search decoding with optional output constraints
+"""
+import heapq
+import math
+import re
+import numpy as np
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+NEG_INF = float('-inf')
+
+
+def _log_add(a: float, b: float) -> float:
+    """Numerically stable log(exp(a) + exp(b)) for Python floats"""
+    if a == NEG_INF:
+        return b
+    if b == NEG_INF:
+        return a
+    if a > b:
+        return a + math.log1p(math.exp(b - a))
+    return b + math.log1p(math.exp(a - b))
+
+
+def log_softmax(predictions: np.ndarray) -> np.ndarray:
+    """
+    Log-softmax over the class axis
+    
+    Idempotent, so it is safe to apply to outputs that are already
+    log-probabilities.
+    """
+    predictions = np.asarray(predictions, dtype=np.float32)
+    shifted = predictions - predictions.max(axis=-1, keepdims=True)
+    return shifted - np.log(np.exp(shifted).sum(axis=-1, keepdims=True))
+
+
+class LexiconTrie:
+    """Prefix tree over class indices for lexicon-constrained decoding"""
+    
+    _END = -1
+    
+    def __init__(self, words: Iterable[str], charset: str):
+        self.root: Dict[int, Any] = {}
+        lookup = {c: i for i, c in enumerate(charset)}
+        
+        for word in words:
+            word = word.strip()
+            if not word or any(c not in lookup for c in word):
+                continue
+            node = self.root
+            for c in word:
+                node = node.setdefault(lookup[c], {})
+            node[self._END] = True
+    
+    def child(self, node: Optional[Dict], index: int) -> Optional[Dict]:
+        """Get the child node for index, or None if the prefix leaves the trie"""
+        if node is None:
+            return None
+        return node.get(index)
+    
+    def is_word(self, node: Optional[Dict]) -> bool:
+        """Check whether node terminates a lexicon word"""
+        return node is not None and self._END in node
+
+
+class DecodingConstraints:
+    """Restrictions on the text a beam search may produce
+    
+    Args:
+        length: Exact output length
+        min_length: Minimum output length
+        max_length: Maximum output length
+        allowed_pattern: Regular expression every output character must
+            match, for example '[A-Z0-9]'
+        lexicon: Iterable of allowed words; outputs must be one of them
+    
+    When no surviving beam meets min_length or ends on a lexicon word,
+    the constrained decoders return an empty string rather than an
+    output that breaks the constraints.
+    """
+    
+    def __init__(self, length: Optional[int] = None,
+                 min_length: Optional[int] = None,
+                 max_length: Optional[int] = None,
+                 allowed_pattern: Optional[str] = None,
+                 lexicon: Optional[Iterable[str]] = None):
+        if length is not None:
+            min_length = max_length = length
+        self.min_length = min_length or 0
+        self.max_length = max_length
+        self.allowed_pattern = allowed_pattern
+        self.lexicon = list(lexicon) if lexicon is not None else None
+        self._compiled: Dict[Tuple[str, int], Tuple[Optional[np.ndarray], Optional[LexiconTrie]]] = {}
+    
+    @classmethod
+    def from_config(cls, settings: Optional[Dict[str, Any]]) -> Optional['DecodingConstraints']:
+        """
+        Build constraints from the 'constraints' section of the decoding config
+        
+        Recognised keys: length, min_length, max_length, allowed_pattern,
+        lexicon (list of words) and lexicon_file (one word per line).
+        
+        Returns:
+            DecodingConstraints, or None when no constraint is set
+        """
+        if not settings:
+            return None
+        
+        lexicon = settings.get('lexicon')
+        lexicon_file = settings.get('lexicon_file')
+        if lexicon_file:
+            with open(Path(lexicon_file), 'r', encoding='utf-8') as f:
+                lexicon = [line.strip() for line in f if line.strip()]
+        
+        constraints = cls(
+            length=settings.get('length'),
+            min_length=settings.get('min_length'),
+            max_length=settings.get('max_length'),
+            allowed_pattern=settings.get('allowed_pattern'),
+            lexicon=lexicon
+        )
+        return None if constraints.is_empty() else constraints
+    
+    def is_empty(self) -> bool:
+        """Check whether no constraint is set"""
+        return (self.min_length == 0 and self.max_length is None
+                and not self.allowed_pattern and self.lexicon is None)
+    
+    def compile(self, charset: str, num_classes: int) -> Tuple[Optional[np.ndarray], Optional[LexiconTrie]]:
+        """
+        Resolve the constraints against a charset
+        
+        Returns:
+            Tuple of (allowed class mask or None, lexicon trie or None)
+        """
+        key = (charset, num_classes)
+        if key not in self._compiled:
+            allowed = None
+            if self.allowed_pattern:
+                pattern = re.compile(self.allowed_pattern)
+                allowed = np.zeros(num_classes, dtype=bool)
+                for i, c in enumerate(charset[:num_classes]):
+                    allowed[i] = pattern.fullmatch(c) is not None
+            
+            trie = LexiconTrie(self.lexicon, charset) if self.lexicon is not None else None
+            self._compiled[key] = (allowed, trie)
+        
+        return self._compiled[key]
+
+
+def _candidates(log_probs: np.ndarray, blank: int, top_k: int,
+                prune_log_prob: float, allowed: Optional[np.ndarray]) -> List[np.ndarray]:
+    """
+    Select the non-blank classes worth extending at every time step
+    
+    Args:
+        log_probs: Log-probabilities (T, C)
+        
+    Returns:
+        List of T arrays of class indices
+    """
+    scores = log_probs.copy()
+    scores[:, blank] = NEG_INF
+    if allowed is not None:
+        scores[:, ~allowed[:scores.shape[1]]] = NEG_INF
+    
+    k = min(top_k, scores.shape[1])
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    keep = top_scores >= prune_log_prob
+    return [row[mask] for row, mask in zip(top, keep)]
+
+
+def prefix_beam_search(log_probs: np.ndarray, charset: str, blank: int,
+                       beam_width: int = 10, top_k: int = 8,
+                       prune_log_prob: float = math.log(1e-4),
+                       constraints: Optional[DecodingConstraints] = None,
+                       candidates: Optional[List[np.ndarray]] = None) -> str:
+    """
+    Decode one sequence with CTC prefix beam search
+    
+    Scores are kept in log space as separate blank/non-blank ending
+    probabilities per prefix. At every time step only the top_k non-blank
+    classes above prune_log_prob are considered, and the beam is cut back
+    to beam_width prefixes.
+    
+    Args:
+        log_probs: Log-probabilities (T, C)
+        charset: Character set string
+        blank: Index of the CTC blank class
+        beam_width: Number of prefixes kept per time step
+        top_k: Number of classes considered per time step
+        prune_log_prob: Classes below this log-probability are skipped
+        constraints: Optional output constraints
+        candidates: Precomputed per-step candidate classes (see batch variant)
+        
+    Returns:
+        Decoded text string; empty if constraints are given and no prefix
+        satisfies them
+    """
+    time_steps, num_classes = log_probs.shape
+    allowed, trie = (None, None)
+    max_length = None
+    if constraints is not None:
+        allowed, trie = constraints.compile(charset, num_classes)
+        max_length = constraints.max_length
+    
+    if candidates is None:
+        candidates = _candidates(log_probs, blank, top_k, prune_log_prob, allowed)
+    
+    # prefix -> [log P(ends in blank), log P(ends in non-blank), trie node]
+    root = trie.root if trie is not None else None
+    beams: Dict[Tuple[int, ...], list] = {(): [0.0, NEG_INF, root]}
+    
+    for t in range(time_steps):
+        frame = log_probs[t]
+        blank_lp = float(frame[blank])
+        step_candidates = [(int(c), float(frame[c])) for c in candidates[t]]
+        next_beams: Dict[Tuple[int, ...], list] = {}
+        
+        for prefix, (p_b, p_nb, node) in beams.items():
+            total = _log_add(p_b, p_nb)
+            
+            # Extend with blank: prefix unchanged
+            entry = next_beams.get(prefix)
+            if entry is None:
+                entry = next_beams[prefix] = [NEG_INF, NEG_INF, node]
+            entry[0] = _log_add(entry[0], total + blank_lp)
+            
+            last = prefix[-1] if prefix else None
+            for c, lp in step_candidates:
+                if c == last:
+                    # Repeated character without a blank collapses
+                    entry[1] = _log_add(entry[1], p_nb + lp)
+                    score = p_b + lp
+                else:
+                    score = total + lp
+                
+                if score == NEG_INF:
+                    continue
+                if max_length is not None and len(prefix) >= max_length:
+                    continue
+                
+                child = node
+                if trie is not None:
+                    child = trie.child(node, c)
+                    if child is None:
+                        continue
+                
+                new_prefix = prefix + (c,)
+                new_entry = next_beams.get(new_prefix)
+                if new_entry is None:
+                    new_entry = next_beams[new_prefix] = [NEG_INF, NEG_INF, child]
+                new_entry[1] = _log_add(new_entry[1], score)
+        
+        # Keep the best beam_width prefixes
+        if len(next_beams) > beam_width:
+            beams = dict(heapq.nlargest(beam_width, next_beams.items(),
+                                        key=lambda item: _log_add(item[1][0], item[1][1])))
+        else:
+            beams = next_beams
+    
+    ranked = sorted(beams.items(), key=lambda item: _log_add(item[1][0], item[1][1]),
+                    reverse=True)
+    
+    best = ranked[0][0]
+    if constraints is not None:
+        # Best prefix that is a complete, valid output; none means no
+        # output satisfies the constraints
+        best = ()
+        for prefix, (_, _, node) in ranked:
+            if len(prefix) < constraints.min_length:
+                continue
+            if trie is not None and not trie.is_word(node):
+                continue
+            best = prefix
+            break
+    
+    return ''.join(charset[i] for i in best if i < len(charset))
+
+
+def prefix_beam_search_batch(predictions_batch: np.ndarray, charset: str, blank: int,
+                             beam_width: int = 10, top_k: int = 8,
+                             prune_log_prob: float = math.log(1e-4),
+                             constraints: Optional[DecodingConstraints] = None) -> List[str]:
+    """
+    Beam search decode a batch of raw model outputs
+    
+    Log-softmax and per-step candidate selection run vectorized over the
+    whole batch; only the beam bookkeeping runs per sequence.
+    
+    Args:
+        predictions_batch: Model outputs (B, T, C), logits or log-probabilities
+        
+    Returns:
+        List of decoded text strings; empty where constraints are given
+        and no prefix satisfies them
+    """
+    log_probs = log_softmax(predictions_batch)
+    if log_probs.shape[0] == 0 or log_probs.shape[1] == 0:
+        return [''] * log_probs.shape[0]
+    
+    batch_size, time_steps, num_classes = log_probs.shape
+    allowed = None
+    if constraints is not None:
+        allowed, _ = constraints.compile(charset, num_classes)
+    
+    candidates = _candidates(log_probs.reshape(-1, num_classes), blank, top_k,
+                             prune_log_prob, allowed)
+    
+    return [
+        prefix_beam_search(log_probs[b], charset, blank, beam_width, top_k,
+                           prune_log_prob, constraints,
+                           candidates=candidates[b * time_steps:(b + 1) * time_steps])
+        for b in range(batch_size)
+    ]
@@ -2,7 +2,10 @@
 CTC decoding for model predictions
 """
 import numpy as np
-from typing import List
+from functools import lru_cache
+from typing import List, Optional
+
+from .ctc_beam_search import DecodingConstraints, prefix_beam_search_batch
 
 
 class CTCDecoder:
@@ -57,6 +60,10 @@ class CTCDecoder:
         """
         Decode batch of CTC predictions
         
+        Argmax, duplicate collapse and blank removal run as single NumPy
+        operations over the whole batch; only the final bytes-to-str
+        conversion touches each row.
+        
         Args:
             predictions_batch: Batch of predictions (B, T, C)
             charset: Character set string
@@ -64,9 +71,113 @@ class CTCDecoder:
         Returns:
             List of decoded text strings
         """
-        results = []
-        for predictions in predictions_batch:
-            text = CTCDecoder.decode(predictions, charset)
-            results.append(text)
-        return results
-
+        try:
+            predictions_batch = np.asarray(predictions_batch)
+            if predictions_batch.ndim != 3:
+                raise ValueError(f"Expected (B, T, C) predictions, got shape {predictions_batch.shape}")
+            
+            batch_size, time_steps, num_classes = predictions_batch.shape
+            if batch_size == 0:
+                return []
+            if time_steps == 0:
+                return [''] * batch_size
+            
+            # Get argmax indices (B, T)
+            indices = np.argmax(predictions_batch, axis=2)
+            
+            # Keep the first index of every run that is not a blank
+            keep = np.empty(indices.shape, dtype=bool)
+            keep[:, 0] = True
+            np.not_equal(indices[:, 1:], indices[:, :-1], out=keep[:, 1:])
+            keep &= indices != CTCDecoder.BLANK_LABEL
+            
+            codes, ascii_only = CTCDecoder._charset_lookup(charset, num_classes)
+            if not ascii_only:
+                chars = np.array(list(charset) + [''], dtype=object)
+                lookup = np.where(np.arange(num_classes) < len(charset),
+                                  np.arange(num_classes), len(charset))
+                row_chars = chars[lookup[indices]]
+                return [''.join(row[mask]) for row, mask in zip(row_chars, keep)]
+            
+            # Map to ASCII codes; dropped and out-of-charset positions become 0
+            row_codes = np.where(keep, codes[indices], 0).astype(np.uint8)
+            
+            # Move kept characters to the front of each row (stable), then
+            # view rows as fixed-width byte strings; NumPy strips the
+            # trailing NUL padding
+            order = np.argsort(row_codes == 0, axis=1, kind='stable')
+            row_codes = np.ascontiguousarray(np.take_along_axis(row_codes, order, axis=1))
+            packed = row_codes.view(f'S{time_steps}').ravel()
+            
+            return [text.decode('ascii') for text in packed.tolist()]
+            
+        except Exception as e:
+            raise ValueError(f"Error decoding predictions: {e}")
+    
+    @staticmethod
+    def decode_beam(predictions: np.ndarray, charset: str, beam_width: int = 10,
+                    top_k: int = 8,
+                    constraints: Optional[DecodingConstraints] = None) -> str:
+        """
+        Decode CTC predictions using prefix beam search
+        
+        Args:
+            predictions: Model output predictions (T, C)
+            charset: Character set string
+            beam_width: Number of prefixes kept per time step
+            top_k: Number of classes considered per time step
+            constraints: Optional length/pattern/lexicon constraints
+            
+        Returns:
+            Decoded text string
+        """
+        return CTCDecoder.decode_beam_batch(
+            np.asarray(predictions)[np.newaxis], charset, beam_width, top_k, constraints
+        )[0]
+    
+    @staticmethod
+    def decode_beam_batch(predictions_batch: np.ndarray, charset: str,
+                          beam_width: int = 10, top_k: int = 8,
+                          constraints: Optional[DecodingConstraints] = None) -> List[str]:
+        """
+        Decode batch of CTC predictions using prefix beam search
+        
+        Args:
+            predictions_batch: Batch of predictions (B, T, C)
+            charset: Character set string
+            beam_width: Number of prefixes kept per time step
+            top_k: Number of classes considered per time step
+            constraints: Optional length/pattern/lexicon constraints
+            
+        Returns:
+            List of decoded text strings; a sequence for which no output
+            satisfies the constraints decodes to an empty string
+        """
+        try:
+            if beam_width < 1 or top_k < 1:
+                raise ValueError("beam_width and top_k must be at least 1")
+            
+            return prefix_beam_search_batch(
+                predictions_batch, charset, CTCDecoder.BLANK_LABEL,
+                beam_width=beam_width, top_k=top_k, constraints=constraints
+            )
+            
+        except Exception as e:
+            raise ValueError(f"Error decoding predictions: {e}")
+    
+    @staticmethod
+    @lru_cache(maxsize=16)
+    def _charset_lookup(charset: str, num_classes: int):
+        """
+        Precompute class index to character code lookup
+        
+        Returns:
+            Tuple of (uint8 code array of length num_classes, ascii_only).
+            Indices outside the charset map to 0.
+        """
+        ascii_only = all(0 < ord(c) < 128 for c in charset)
+        codes = np.zeros(num_classes, dtype=np.uint8)
+        if ascii_only:
+            limit = min(len(charset), num_classes)
+            codes[:limit] = np.frombuffer(charset[:limit].encode('ascii'), dtype=np.uint8)
+        return codes, ascii_only
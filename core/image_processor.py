@@ -1,10 +1,16 @@
 """
 Image preprocessing for ONNX model inference
 """
+import io
 import numpy as np
-from PIL import Image
+from PIL import Image, UnidentifiedImageError
 from pathlib import Path
-from typing import Tuple
+from typing import Optional, Tuple, Union
+
+
+# Anything ImageProcessor can decode: a file path, encoded image bytes,
+# an (H, W) or (H, W, C) uint8 array, or an already decoded PIL image
+ImageSource = Union[str, Path, bytes, bytearray, memoryview, np.ndarray, Image.Image]
 
 
 class ImageProcessor:
@@ -14,81 +20,279 @@ class ImageProcessor:
     MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
     STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
     
+    # (x / 255 - MEAN) / STD folded into one multiply-add per channel,
+    # shaped to broadcast over CHW
+    SCALE = (1.0 / (255.0 * STD)).astype(np.float32).reshape(3, 1, 1)
+    BIAS = (-MEAN / STD).astype(np.float32).reshape(3, 1, 1)
+    
+    DEFAULT_HEIGHT = 64
+    DEFAULT_WIDTH = 256
+    
+    # Resize strategies. 'reduce' shrinks by an integer factor with a box
+    # filter first (Image.reduce) and only resamples the remainder with
+    # LANCZOS, which is much cheaper for sources far above model size
+    RESIZE_FILTERS = {
+        'lanczos': Image.Resampling.LANCZOS,
+        'bilinear': Image.Resampling.BILINEAR,
+        'box': Image.Resampling.BOX,
+        'reduce': Image.Resampling.LANCZOS
+    }
+    DEFAULT_RESIZE = 'lanczos'
+    
+    VALID_EXTENSIONS = {'.png', '.jpg', '.jpeg'}
+    MIN_SIZE = 10
+    
     @staticmethod
-    def preprocess(image_path: str, target_height: int = 64, 
-                   target_width: int = 256) -> np.ndarray:
+    def load(source: ImageSource, draft_size: Optional[Tuple[int, int]] = None) -> Image.Image:
         """
-        Preprocess image for model inference
+        Decode and validate an image exactly once
         
         Args:
-            image_path: Path to image file
-            target_height: Target image height
-            target_width: Target image width
+            source: File path, encoded bytes, uint8 array or PIL image
+            draft_size: Optional (width, height). JPEGs are then decoded in
+                draft mode at the smallest DCT scale that is still at least
+                this size, skipping most of a full-resolution decode
             
         Returns:
-            Preprocessed image as numpy array (1, 3, H, W)
+            Decoded PIL image
+            
+        Raises:
+            ValueError: If the source cannot be decoded or fails validation
         """
-        try:
-            # Load image
-            image = Image.open(image_path)
+        image = ImageProcessor.decode(source, draft_size)
+        
+        is_valid, error_msg = ImageProcessor.validate_loaded(image)
+        if not is_valid:
+            raise ValueError(error_msg)
+        
+        return image
+    
+    @staticmethod
+    def read_bytes(path: Union[str, Path]) -> bytes:
+        """
+        Read an image file's encoded bytes with the same checks as load()
+        
+        Args:
+            path: Image file path
             
-            # Convert to RGB if necessary
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
+        Returns:
+            Encoded image bytes
             
-            # Resize image
-            image = image.resize((target_width, target_height), Image.Resampling.LANCZOS)
+        Raises:
+            ValueError: If the file has an unsupported extension or is missing
+        """
+        path = Path(path)
+        if path.suffix.lower() not in ImageProcessor.VALID_EXTENSIONS:
+            raise ValueError(f"Invalid file format. Supported: {ImageProcessor.VALID_EXTENSIONS}")
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            raise ValueError("File does not exist")
+        except OSError as e:
+            raise ValueError(f"Error reading image: {e}")
+    
+    @staticmethod
+    def decode(source: ImageSource, draft_size: Optional[Tuple[int, int]] = None) -> Image.Image:
+        """Turn any supported source into a decoded PIL image without validating it"""
+        if isinstance(source, Image.Image):
+            return source
+        
+        if isinstance(source, np.ndarray):
+            if source.dtype != np.uint8:
+                raise ValueError(f"Expected a uint8 image array, got {source.dtype}")
+            if source.ndim == 3 and source.shape[2] == 1:
+                source = source[:, :, 0]
+            if source.ndim not in (2, 3) or (source.ndim == 3 and source.shape[2] not in (3, 4)):
+                raise ValueError(f"Expected an (H, W), (H, W, 3) or (H, W, 4) array, got {source.shape}")
+            return Image.fromarray(source)
+        
+        try:
+            if isinstance(source, (bytes, bytearray, memoryview)):
+                try:
+                    image = Image.open(io.BytesIO(source))
+                except UnidentifiedImageError:
+                    raise ValueError("Error decoding image: unrecognized image data")
+            else:
+                path = Path(source)
+                if path.suffix.lower() not in ImageProcessor.VALID_EXTENSIONS:
+                    raise ValueError(f"Invalid file format. Supported: {ImageProcessor.VALID_EXTENSIONS}")
+                image = Image.open(path)
             
-            # Convert to numpy array
-            image_array = np.array(image, dtype=np.float32)
+            if draft_size is not None and image.format == 'JPEG':
+                image.draft('RGB', draft_size)
             
-            # Normalize to [0, 1]
-            image_array = image_array / 255.0
+            # Decode now so the data is read once and the file is closed
+            image.load()
+            return image
             
-            # Apply ImageNet normalization
-            image_array = (image_array - ImageProcessor.MEAN) / ImageProcessor.STD
+        except FileNotFoundError:
+            raise ValueError("File does not exist")
+        except ValueError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Error decoding image: {e}")
+    
+    @staticmethod
+    def dhash(image: Image.Image, hash_size: int = 16) -> int:
+        """
+        Difference hash of a decoded image
+        
+        The image is reduced to a (hash_size + 1) x hash_size grayscale
+        thumbnail and every pixel is compared with its right neighbour. The
+        hash survives re-encoding and small resizes, so it identifies the
+        same CAPTCHA saved at a different JPEG quality or scale.
+        
+        Args:
+            image: Decoded PIL image
+            hash_size: Grid size; the hash has hash_size ** 2 bits
             
-            # Convert to CHW format
-            image_array = np.transpose(image_array, (2, 0, 1))
+        Returns:
+            Hash as an integer
+        """
+        thumbnail = image.convert('L').resize((hash_size + 1, hash_size), Image.Resampling.BOX)
+        pixels = np.asarray(thumbnail, dtype=np.int16)
+        bits = np.packbits(pixels[:, 1:] > pixels[:, :-1])
+        return int.from_bytes(bits.tobytes(), 'big')
+    
+    @staticmethod
+    def validate_loaded(image: Image.Image) -> Tuple[bool, str]:
+        """
+        Validate a decoded image
+        
+        Args:
+            image: Decoded PIL image
             
-            # Add batch dimension
-            image_array = np.expand_dims(image_array, axis=0)
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        if image.size[0] < ImageProcessor.MIN_SIZE or image.size[1] < ImageProcessor.MIN_SIZE:
+            return False, "Image too small"
+        
+        return True, ""
+    
+    @staticmethod
+    def preprocess(image: ImageSource, target_height: int = DEFAULT_HEIGHT,
+                   target_width: int = DEFAULT_WIDTH) -> np.ndarray:
+        """
+        Preprocess image for model inference
+        
+        Args:
+            image: Decoded PIL image, or any source accepted by load()
+            target_height: Target image height
+            target_width: Target image width
             
-            return image_array
+        Returns:
+            Preprocessed image as numpy array (1, 3, H, W)
+        """
+        try:
+            # Load image unless it has already been decoded
+            if not isinstance(image, Image.Image):
+                image = ImageProcessor.decode(image)
+            
+            image = ImageProcessor.resize(image, target_height, target_width)
+            return ImageProcessor.normalize(image)
             
         except Exception as e:
             raise ValueError(f"Error preprocessing image: {e}")
     
     @staticmethod
-    def validate_image(image_path: str) -> Tuple[bool, str]:
+    def resize(image: Image.Image, target_height: int = DEFAULT_HEIGHT,
+               target_width: int = DEFAULT_WIDTH, strategy: str = DEFAULT_RESIZE) -> Image.Image:
         """
-        Validate image file
+        Convert a decoded image to RGB at the model input size
         
         Args:
-            image_path: Path to image file
+            image: Decoded PIL image
+            target_height: Target image height
+            target_width: Target image width
+            strategy: One of RESIZE_FILTERS
             
         Returns:
-            Tuple of (is_valid, error_message)
+            Resized RGB image
         """
-        try:
-            path = Path(image_path)
-            
-            # Check file exists
-            if not path.exists():
-                return False, "File does not exist"
+        if strategy not in ImageProcessor.RESIZE_FILTERS:
+            raise ValueError(f"Unknown resize strategy: {strategy}. "
+                             f"Supported: {tuple(ImageProcessor.RESIZE_FILTERS)}")
+        
+        # Convert to RGB if necessary
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        
+        size = (target_width, target_height)
+        if image.size == size:
+            return image
+        
+        # Resize image
+        resample = ImageProcessor.RESIZE_FILTERS[strategy]
+        if strategy == 'reduce':
+            return image.resize(size, resample, reducing_gap=2.0)
+        return image.resize(size, resample)
+    
+    @staticmethod
+    def normalize(image: Image.Image) -> np.ndarray:
+        """
+        Reference normalization of a resized RGB image
+        
+        Args:
+            image: Resized RGB image
             
-            # Check file extension
-            valid_extensions = {'.png', '.jpg', '.jpeg'}
-            if path.suffix.lower() not in valid_extensions:
-                return False, f"Invalid file format. Supported: {valid_extensions}"
+        Returns:
+            Normalized image as numpy array (1, 3, H, W)
+        """
+        # Convert to numpy array
+        image_array = np.array(image, dtype=np.float32)
+        
+        # Normalize to [0, 1]
+        image_array = image_array / 255.0
+        
+        # Apply ImageNet normalization
+        image_array = (image_array - ImageProcessor.MEAN) / ImageProcessor.STD
+        
+        # Convert to CHW format
+        image_array = np.transpose(image_array, (2, 0, 1))
+        
+        # Add batch dimension
+        return np.expand_dims(image_array, axis=0)
+    
+    @staticmethod
+    def normalize_into(image: Image.Image, out: np.ndarray) -> np.ndarray:
+        """
+        Fused normalization of a resized RGB image into a preallocated buffer
+        
+        Reads the uint8 pixels without copying and writes
+        pixels * SCALE + BIAS straight into out in CHW layout, so no
+        full-size float temporaries are created.
+        
+        Args:
+            image: Resized RGB image
+            out: float32 (3, H, W) destination, e.g. one row of a batch buffer
             
-            # Try to open image
-            with Image.open(image_path) as img:
-                if img.size[0] < 10 or img.size[1] < 10:
-                    return False, "Image too small"
+        Returns:
+            out
+        """
+        pixels = np.asarray(image).transpose(2, 0, 1)
+        np.multiply(pixels, ImageProcessor.SCALE, out=out)
+        np.add(out, ImageProcessor.BIAS, out=out)
+        return out
+    
+    @staticmethod
+    def validate_image(image_path: ImageSource) -> Tuple[bool, str]:
+        """
+        Validate image file
+        
+        Prefer load(), which validates and returns the decoded image, so
+        the file does not have to be decoded a second time.
+        
+        Args:
+            image_path: Path to image file, or any source accepted by load()
             
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        try:
+            ImageProcessor.load(image_path)
             return True, ""
-            
+        except ValueError as e:
+            return False, str(e)
         except Exception as e:
             return False, f"Error validating image: {e}"
-
@@ -0,0 +1,146 @@
+"""
+Dynamic micro-batching of concurrent inference requests
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional, Tuple
+
+from PIL import Image
+
+from .model_manager import ModelManager
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the micro-batch queue cannot take more requests"""
+
+
+class MicroBatcher:
+    """Collect requests from many threads into batched model runs
+    
+    Callers prepare their image (decode/resize) on their own thread and
+    submit it. A single batching thread takes the first waiting request,
+    then keeps collecting until max_batch_size requests are in hand or
+    max_wait_ms has passed, and runs them through ModelManager.infer()
+    as one tensor. Each caller gets a Future resolving to
+    (text, inference_time_ms, batch_size).
+    """
+    
+    def __init__(self, model_manager: ModelManager, max_batch_size: int = 32,
+                 max_wait_ms: float = 5.0, max_queue: int = 1024):
+        """
+        Initialize micro-batcher
+        
+        Args:
+            model_manager: Loaded ModelManager
+            max_batch_size: Maximum requests per model run
+            max_wait_ms: Longest time the first request of a batch waits
+                for others to join
+            max_queue: Maximum requests waiting; further submits are rejected
+        """
+        if max_batch_size < 1 or max_queue < 1:
+            raise ValueError("max_batch_size and max_queue must be at least 1")
+        
+        self.model_manager = model_manager
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: "queue.Queue[Tuple[Image.Image, Future]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+    
+    @property
+    def queue_depth(self) -> int:
+        """Number of requests waiting to be batched"""
+        return self._queue.qsize()
+    
+    def is_running(self) -> bool:
+        """Check if the batching thread is running"""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self):
+        """Start the batching thread"""
+        if self.is_running():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._loop, name="micro-batcher", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the batching thread; waiting requests fail"""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        
+        while True:
+            try:
+                _, future = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if future.set_running_or_notify_cancel():
+                future.set_exception(RuntimeError("Micro-batcher stopped"))
+    
+    def submit(self, prepared: Image.Image) -> Future:
+        """
+        Queue a prepared image for the next batch
+        
+        Args:
+            prepared: Image returned by ModelManager.prepare()
+            
+        Returns:
+            Future resolving to (text, inference_time_ms, batch_size)
+            
+        Raises:
+            QueueFullError: If max_queue requests are already waiting
+        """
+        if not self.is_running():
+            raise RuntimeError("Micro-batcher is not running")
+        
+        future = Future()
+        try:
+            self._queue.put_nowait((prepared, future))
+        except queue.Full:
+            raise QueueFullError("Inference queue is full")
+        return future
+    
+    def _collect(self) -> List[Tuple[Image.Image, Future]]:
+        """Block for the first request, then gather more until full or timed out"""
+        try:
+            batch = [self._queue.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+        
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        
+        return batch
+    
+    def _loop(self):
+        """Batching thread main loop"""
+        while not self._stopping.is_set():
+            batch = self._collect()
+            
+            # Skip requests whose callers gave up while queued
+            batch = [(image, future) for image, future in batch
+                     if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            
+            try:
+                texts, inference_time = self.model_manager.infer([image for image, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(RuntimeError(f"Error during prediction: {e}"))
+                continue
+            
+            for (_, future), text in zip(batch, texts):
+                future.set_result((text, inference_time, len(batch)))
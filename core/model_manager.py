@@ -1,35 +1,176 @@
 """
 ONNX model management and inference
 """
+import hashlib
+import os
 import time
 import numpy as np
+from PIL import Image
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Tuple
-import onnxruntime as ort
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
-from .image_processor import ImageProcessor
+from .image_processor import ImageProcessor, ImageSource
+from .buffer_pool import BufferPool
 from .ctc_decoder import CTCDecoder
+from .ctc_beam_search import DecodingConstraints
+from .session_options import merge_session_settings, build_session_options
+from .io_binding import IOBindingRunner
+from .prediction_cache import PredictionCache, content_key
+from .perceptual_index import PerceptualIndex
+from .timing import PredictionResult, StageHistograms, stage
+from .stream_pipeline import StreamPipeline, StreamResult
 from .config_loader import ConfigLoader
 
 
+@dataclass
+class BatchPrediction:
+    """Result of a batched prediction run
+    
+    ``texts`` and ``errors`` are aligned with the inputs: for every item
+    exactly one of them is set. ``batch_times`` holds the ``session.run``
+    time in milliseconds for each chunk, and ``batch_sizes`` the number of
+    images that went into that chunk. ``timings_ns`` holds the total time
+    of each pipeline stage over the whole call.
+    """
+    texts: List[Optional[str]] = field(default_factory=list)
+    errors: List[Optional[str]] = field(default_factory=list)
+    batch_times: List[float] = field(default_factory=list)
+    batch_sizes: List[int] = field(default_factory=list)
+    timings_ns: Dict[str, int] = field(default_factory=dict)
+    
+    def __len__(self) -> int:
+        return len(self.texts)
+
+
+@dataclass
+class PriorLookup:
+    """Outcome of looking an image up in the prediction cache and
+    near-duplicate index
+    
+    ``text`` is the prior prediction, or None on a miss. ``image`` is the
+    source to preprocess on a miss; it is already decoded when the
+    near-duplicate index is enabled. ``key`` and ``phash`` are passed back
+    to remember() once the image has been predicted.
+    """
+    text: Optional[str]
+    image: ImageSource
+    key: Optional[str] = None
+    phash: Optional[int] = None
+
+
 class ModelManager:
     """Manage ONNX model loading and inference"""
     
-    def __init__(self, model_path: Path, config_path: Path):
+    # Default number of images stacked into one session.run call
+    DEFAULT_BATCH_SIZE = 32
+    
+    # Supported CTC decoding methods
+    DECODING_METHODS = ('greedy', 'beam')
+    
+    # Model variants; every variant except 'fp32' is loaded from a file
+    # next to the base model named '<stem>.<variant>.onnx'
+    MODEL_VARIANTS = ('fp32', 'int8_dynamic', 'int8_static')
+    
+    # Supported preprocessing modes: 'fused' writes normalized pixels
+    # straight into pooled batch buffers, 'reference' is the original
+    # step-by-step NumPy pipeline
+    PREPROCESS_MODES = ('fused', 'reference')
+    
+    # Recent per-image samples kept for each stage in stage_stats
+    TIMING_WINDOW = 1000
+    
+    def __init__(self, model_path: Path, config_path: Path,
+                 session_settings: Optional[Dict[str, Any]] = None,
+                 variant: Optional[str] = None,
+                 cache_settings: Optional[Dict[str, Any]] = None,
+                 near_duplicate_settings: Optional[Dict[str, Any]] = None,
+                 decoding_settings: Optional[Dict[str, Any]] = None):
         """
         Initialize model manager
         
         Args:
-            model_path: Path to ONNX model file
+            model_path: Path to the base (FP32) ONNX model file
             config_path: Path to model configuration JSON
+            session_settings: ONNX Runtime settings overriding the
+                'onnxruntime' section of the config (see session_options)
+            variant: Model variant overriding 'model_variant' in the config
+            cache_settings: Prediction cache settings overriding the
+                'cache' section of the config (None values are ignored)
+            near_duplicate_settings: Near-duplicate index settings overriding
+                the 'near_duplicates' section of the config
+            decoding_settings: set_decoding arguments overriding the
+                'decoding' section of the config (None values are ignored)
         """
-        self.model_path = model_path
         self.config_loader = ConfigLoader(config_path)
+        self.variant = variant or self.config_loader.get('model_variant', 'fp32')
+        self.model_path = self.variant_path(Path(model_path), self.variant)
         self.session = None
+        self.input_name = None
+        self.output_name = None
+        self.io_binding = None
+        self.supports_batching = True
         self.charset = self.config_loader.get('charset', 
             "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz")
         
+        self.decoding_method = 'greedy'
+        self.beam_width = 10
+        self.top_k = 8
+        self.constraints = None
+        self.set_decoding(**self._settings('decoding', decoding_settings))
+        
+        preprocessing = self.config_loader.get('preprocessing', {})
+        self.preprocess_mode = preprocessing.get('mode', 'fused')
+        if self.preprocess_mode not in self.PREPROCESS_MODES:
+            raise ValueError(f"Unknown preprocessing mode: {self.preprocess_mode}. "
+                             f"Supported: {self.PREPROCESS_MODES}")
+        self.resize_strategy = preprocessing.get('resize', ImageProcessor.DEFAULT_RESIZE)
+        if self.resize_strategy not in ImageProcessor.RESIZE_FILTERS:
+            raise ValueError(f"Unknown resize strategy: {self.resize_strategy}. "
+                             f"Supported: {tuple(ImageProcessor.RESIZE_FILTERS)}")
+        self.jpeg_draft = preprocessing.get('jpeg_draft', False)
+        self.buffer_pool = BufferPool(
+            (3, ImageProcessor.DEFAULT_HEIGHT, ImageProcessor.DEFAULT_WIDTH),
+            max_buffers=preprocessing.get('max_buffers', 4)
+        )
+        
+        # Rolling per-stage latencies of every prediction path
+        self.stage_stats = StageHistograms(self.TIMING_WINDOW)
+        
+        # Optional metrics sink (utils.metrics.InferenceMetrics.attach)
+        self.metrics = None
+        
+        self.session_settings = merge_session_settings(
+            self.config_loader.get('onnxruntime', {}), session_settings
+        )
+        
+        load_start = time.perf_counter()
         self._load_model()
+        self.load_ms = (time.perf_counter() - load_start) * 1000
+        
+        # Run the session on dummy input so the first real prediction does
+        # not pay for lazy allocations and kernel selection
+        warmup = self.config_loader.get('warmup', {})
+        self.warmup_ms = self.warmup(warmup.get('runs', 1), warmup.get('batch_size', 1))
+        
+        cache = self._settings('cache', cache_settings)
+        self.cache = PredictionCache.from_config(cache) if cache.get('enabled') else None
+        self.cache_check_interval = cache.get('check_interval_s', 2.0)
+        
+        near_duplicates = self._settings('near_duplicates', near_duplicate_settings)
+        self.near_duplicates = None
+        if near_duplicates.get('enabled'):
+            self.near_duplicates = PerceptualIndex.from_config(near_duplicates)
+        
+        self._identity_checked = 0.0
+        self._file_signatures = None
+        self._refresh_identity(force=True)
+    
+    def _settings(self, section: str, overrides: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Config section with non-None overrides applied"""
+        settings = dict(self.config_loader.get(section, {}))
+        settings.update({k: v for k, v in (overrides or {}).items() if v is not None})
+        return settings
     
     def _load_model(self):
         """Load ONNX model"""
@@ -37,51 +178,511 @@ class ModelManager:
             if not self.model_path.exists():
                 raise FileNotFoundError(f"Model not found: {self.model_path}")
             
+            # Imported here so that importing core stays cheap; the
+            # onnxruntime import is a large part of startup
+            import onnxruntime as ort
+            
+            model_file, session_options = build_session_options(
+                self.model_path, self.session_settings
+            )
+            
             # Create ONNX Runtime session with CPU provider
             self.session = ort.InferenceSession(
-                str(self.model_path),
+                str(model_file),
+                sess_options=session_options,
                 providers=['CPUExecutionProvider']
             )
-            print(f"Model loaded successfully: {self.model_path}")
+            print(f"Model loaded successfully: {model_file}")
             
+            # Cache input/output metadata instead of querying it per call
+            model_input = self.session.get_inputs()[0]
+            self.input_name = model_input.name
+            self.output_name = self.session.get_outputs()[0].name
+            
+            # Models exported with a fixed batch dimension can only take
+            # one image per session.run call
+            batch_dim = model_input.shape[0]
+            self.supports_batching = not isinstance(batch_dim, int) or batch_dim != 1
+            
+            if self.session_settings["io_binding"]:
+                self.io_binding = IOBindingRunner(self.session, self.input_name, self.output_name)
+        
         except Exception as e:
             raise RuntimeError(f"Error loading model: {e}")
     
-    def predict(self, image_path: str) -> Tuple[str, float]:
+    def warmup(self, runs: int = 1, batch_size: int = 1) -> float:
+        """
+        Run the model on zero-filled input
+        
+        Args:
+            runs: Number of warm-up runs (0 to skip)
+            batch_size: Images per warm-up run
+        
+        Returns:
+            Total warm-up time in milliseconds
+        """
+        if runs < 1:
+            return 0.0
+        
+        batch = np.zeros(
+            (batch_size, 3, ImageProcessor.DEFAULT_HEIGHT, ImageProcessor.DEFAULT_WIDTH),
+            dtype=np.float32
+        )
+        start = time.perf_counter()
+        try:
+            for _ in range(runs):
+                self._decode(self._run(batch))
+        except Exception as e:
+            raise RuntimeError(f"Error during warm-up: {e}")
+        return (time.perf_counter() - start) * 1000
+    
+    def predict(self, image: ImageSource) -> PredictionResult:
         """
         Predict CAPTCHA text from image
         
         Args:
-            image_path: Path to image file
-            
+            image: Image file path, encoded bytes, uint8 array or PIL image
+        
         Returns:
-            Tuple of (predicted_text, inference_time_ms)
+            PredictionResult with the text and per-stage timings; it also
+            unpacks as (predicted_text, inference_time_ms)
         """
         try:
-            # Validate image
-            is_valid, error_msg = ImageProcessor.validate_image(image_path)
-            if not is_valid:
-                raise ValueError(error_msg)
+            timings = {}
+            prior = self.lookup(image, timings)
+            if prior.text is not None:
+                return PredictionResult(prior.text, timings, cached=True)
             
-            # Preprocess image
-            image_array = ImageProcessor.preprocess(image_path)
-            
-            # Run inference
-            start_time = time.time()
-            
-            input_name = self.session.get_inputs()[0].name
-            output = self.session.run(None, {input_name: image_array})
+            texts, inference_time = self.infer([self.prepare(prior.image, timings)], timings)
+            self.remember(prior, texts[0], inference_time)
+            return PredictionResult(texts[0], timings)
+        
+        except Exception as e:
+            self._report_error(e)
+            raise RuntimeError(f"Error during prediction: {e}")
+    
+    def predict_batch(self, images: Sequence[ImageSource],
+                      batch_size: int = DEFAULT_BATCH_SIZE) -> BatchPrediction:
+        """
+        Predict CAPTCHA text for many images with batched inference
+        
+        Images are validated and preprocessed one by one, then stacked into
+        a single (B, 3, H, W) tensor per chunk so the ONNX session runs once
+        per chunk. An image that fails validation or preprocessing only
+        records an error for itself; the rest of the chunk still runs.
+        Cache and near-duplicate hits are filled in without being run.
+        
+        Args:
+            images: Image file paths, encoded bytes, uint8 arrays or PIL images
+            batch_size: Maximum number of images per session.run call
+        
+        Returns:
+            BatchPrediction with per-item texts/errors and per-chunk timings
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        
+        images = list(images)
+        result = BatchPrediction(
+            texts=[None] * len(images),
+            errors=[None] * len(images)
+        )
+        
+        for start in range(0, len(images), batch_size):
+            chunk = images[start:start + batch_size]
             
-            inference_time = (time.time() - start_time) * 1000  # Convert to ms
+            # Decode and resize each image, keeping track of which rows are valid
+            prepared = []
+            indices = []
+            priors = []
+            for offset, image in enumerate(chunk):
+                index = start + offset
+                try:
+                    prior = self.lookup(image, result.timings_ns)
+                    if prior.text is not None:
+                        result.texts[index] = prior.text
+                        continue
+                    
+                    prepared.append(self.prepare(prior.image, result.timings_ns))
+                    indices.append(index)
+                    priors.append(prior)
+                except Exception as e:
+                    self._report_error(e)
+                    result.errors[index] = str(e)
             
-            # Decode predictions
-            predictions = output[0]  # Get first output
-            predicted_text = CTCDecoder.decode(predictions[0], self.charset)
+            if not prepared:
+                continue
             
-            return predicted_text, inference_time
+            try:
+                texts, batch_time = self.infer(prepared, result.timings_ns)
+                for index, prior, text in zip(indices, priors, texts):
+                    result.texts[index] = text
+                    self.remember(prior, text, batch_time / len(texts))
+                
+                result.batch_times.append(batch_time)
+                result.batch_sizes.append(len(indices))
             
-        except Exception as e:
-            raise RuntimeError(f"Error during prediction: {e}")
+            except Exception as e:
+                for index in indices:
+                    self._report_error(e)
+                    result.errors[index] = f"Error during prediction: {e}"
+        
+        return result
+    
+    def predict_stream(self, images: Iterable[ImageSource],
+                       batch_size: int = DEFAULT_BATCH_SIZE,
+                       prefetch_workers: Optional[int] = None, ordered: bool = True,
+                       max_pending: Optional[int] = None,
+                       utilization: Optional[Dict[str, Any]] = None) -> Iterator[StreamResult]:
+        """
+        Predict a stream of images with pipelined batched inference
+        
+        Unlike predict_batch, decoding the next images overlaps the
+        session run of the current batch and CTC decoding of the previous
+        one (see StreamPipeline). The input is consumed lazily and at most
+        max_pending images are held at once, so it may be arbitrarily long.
+        
+        Args:
+            images: Image file paths, encoded bytes, uint8 arrays or PIL images
+            batch_size: Maximum number of images per session.run call
+            prefetch_workers: Threads decoding images (default: min(4, CPUs))
+            ordered: Yield results in input order; otherwise as they complete
+            max_pending: Maximum images in the pipeline (default: 4 batches)
+            utilization: Optional dict filled with per-stage busy, starved
+                and blocked times and utilization once the stream ends
+        
+        Yields:
+            StreamResult per image with its text or error
+        """
+        pipeline = StreamPipeline(self, batch_size=batch_size, prefetch_workers=prefetch_workers,
+                                  ordered=ordered, max_pending=max_pending)
+        try:
+            yield from pipeline.run(images)
+        finally:
+            if utilization is not None:
+                utilization.update(pipeline.utilization())
+    
+    def prepare(self, image: ImageSource, timings: Optional[Dict[str, int]] = None) -> Image.Image:
+        """
+        Decode, validate and resize one image for infer()
+        
+        This is the CPU-heavy per-image stage; PIL releases the GIL while
+        decoding and resizing, so it can run on a thread pool.
+        
+        Args:
+            image: Image file path, encoded bytes, uint8 array or PIL image
+            timings: Optional dict the decode, validate and resize times
+                are added to, in nanoseconds
+        
+        Returns:
+            Resized RGB image at model input size
+        
+        Raises:
+            ValueError: If the image cannot be decoded or fails validation
+        """
+        local = {}
+        image = self._load(image, local)
+        with stage(local, 'resize'):
+            image = self._resize(image)
+        
+        self._record(local, timings)
+        return image
+    
+    def infer(self, prepared: Sequence[Image.Image],
+              timings: Optional[Dict[str, int]] = None) -> Tuple[List[str], float]:
+        """
+        Run prepared images through the model as one batch
+        
+        Args:
+            prepared: Images returned by prepare()
+            timings: Optional dict the normalize, run and ctc times of the
+                whole batch are added to, in nanoseconds
+        
+        Returns:
+            Tuple of (decoded texts, session run time in ms)
+        """
+        prepared = list(prepared)
+        local = {}
+        
+        with stage(local, 'normalize'):
+            batch = self._stack(prepared)
+        try:
+            with stage(local, 'run'):
+                predictions = self._run(batch)
+        finally:
+            self._release(batch)
+        
+        with stage(local, 'ctc'):
+            texts = self._decode(predictions)
+        
+        self._record(local, timings, images=len(prepared))
+        if self.metrics is not None:
+            self.metrics.record_batch(len(prepared))
+        return texts, local['run'] / 1e6
+    
+    def _record(self, local: Dict[str, int], timings: Optional[Dict[str, int]], images: int = 1):
+        """Add stage times to the rolling histograms, metrics and the caller's timings"""
+        self.stage_stats.record(local, images)
+        if self.metrics is not None:
+            self.metrics.record_stages(local, images)
+        if timings is not None:
+            for name, duration in local.items():
+                timings[name] = timings.get(name, 0) + duration
+    
+    @staticmethod
+    def variant_path(model_path: Path, variant: str) -> Path:
+        """
+        Get the file of a model variant
+        
+        Args:
+            model_path: Path to the base (FP32) model
+            variant: One of MODEL_VARIANTS
+        
+        Returns:
+            Path of the variant's ONNX file
+        """
+        if variant not in ModelManager.MODEL_VARIANTS:
+            raise ValueError(f"Unknown model variant: {variant}. Supported: {ModelManager.MODEL_VARIANTS}")
+        if variant == 'fp32':
+            return model_path
+        return model_path.with_name(f"{model_path.stem}.{variant}{model_path.suffix}")
+    
+    def set_decoding(self, method: str = 'greedy', beam_width: int = 10, top_k: int = 8,
+                     constraints: Optional[Union[Dict[str, Any], DecodingConstraints]] = None):
+        """
+        Select how model outputs are decoded to text
+        
+        Args:
+            method: 'greedy' (argmax) or 'beam' (prefix beam search)
+            beam_width: Number of prefixes kept per time step (beam only)
+            top_k: Number of classes considered per time step (beam only)
+            constraints: DecodingConstraints or its config dict (beam only)
+        """
+        if method not in self.DECODING_METHODS:
+            raise ValueError(f"Unknown decoding method: {method}. Supported: {self.DECODING_METHODS}")
+        if beam_width < 1 or top_k < 1:
+            raise ValueError("beam_width and top_k must be at least 1")
+        
+        if isinstance(constraints, dict):
+            constraints = DecodingConstraints.from_config(constraints)
+        
+        self.decoding_method = method
+        self.beam_width = beam_width
+        self.top_k = top_k
+        self.constraints = constraints
+    
+    def lookup(self, image: ImageSource, timings: Optional[Dict[str, int]] = None) -> PriorLookup:
+        """
+        Look for a prior prediction of an image
+        
+        Checks the exact-content cache first, then the near-duplicate
+        index. Both are skipped when disabled.
+        
+        Args:
+            image: Image file path, encoded bytes, uint8 array or PIL image
+            timings: Optional dict the lookup time (and the decode and
+                validate times of the near-duplicate index) are added to
+        
+        Returns:
+            PriorLookup; pass it to remember() after predicting a miss
+        
+        Raises:
+            ValueError: If the image cannot be read or decoded
+        """
+        if self.cache is None and self.near_duplicates is None:
+            return PriorLookup(None, image)
+        
+        local = {}
+        prior = PriorLookup(None, image)
+        
+        with stage(local, 'lookup'):
+            self._refresh_identity()
+            if self.cache is not None:
+                prior.key, prior.image = self.cache_key(image)
+                prior.text = self.cache.get(prior.key)
+        
+        if prior.text is None and self.near_duplicates is not None:
+            prior.image = self._load(prior.image, local)
+            with stage(local, 'lookup'):
+                prior.phash = ImageProcessor.dhash(prior.image, self.near_duplicates.hash_size)
+                prior.text = self.near_duplicates.lookup(prior.phash)
+                if prior.text is not None and prior.key is not None:
+                    self.cache.put(prior.key, prior.text)
+        
+        self._record(local, timings)
+        if prior.text is not None and self.metrics is not None:
+            self.metrics.record_reuse()
+        return prior
+    
+    def remember(self, prior: PriorLookup, text: str, inference_ms: float):
+        """
+        Store a new prediction in the cache and near-duplicate index
+        
+        Args:
+            prior: Lookup that missed
+            text: Predicted text
+            inference_ms: Inference time of the prediction
+        """
+        if prior.key is not None:
+            self.cache.put(prior.key, text)
+        if prior.phash is not None:
+            self.near_duplicates.add(prior.phash, text, inference_ms)
+    
+    def cache_key(self, image: ImageSource) -> Tuple[str, ImageSource]:
+        """
+        Compute the content key of an image for the prediction cache
+        
+        File paths are read here and returned as bytes so the file is not
+        read a second time if the image has to be decoded.
+        
+        Args:
+            image: Image file path, encoded bytes, uint8 array or PIL image
+        
+        Returns:
+            Tuple of (cache key, image source to decode on a miss)
+        """
+        if isinstance(image, (str, Path)):
+            image = ImageProcessor.read_bytes(image)
+        
+        if isinstance(image, (bytes, bytearray, memoryview)):
+            return content_key(image), image
+        if isinstance(image, np.ndarray):
+            header = f"{image.dtype}{image.shape}".encode()
+            return content_key(header + np.ascontiguousarray(image).tobytes()), image
+        
+        header = f"{image.mode}{image.size}".encode()
+        return content_key(header + image.tobytes()), image
+    
+    def _refresh_identity(self, force: bool = False):
+        """
+        Re-key the prediction cache and near-duplicate index when the
+        model, config or settings change
+        
+        File metadata is checked at most every check_interval_s seconds;
+        decoding settings are compared on every call.
+        """
+        if self.cache is None and self.near_duplicates is None:
+            return
+        
+        now = time.monotonic()
+        if force or now - self._identity_checked >= self.cache_check_interval:
+            self._identity_checked = now
+            self._file_signatures = [
+                self._file_signature(self.model_path),
+                self._file_signature(Path(self.config_loader.config_path))
+            ]
+        
+        constraints = None
+        if self.constraints is not None:
+            constraints = (self.constraints.min_length, self.constraints.max_length,
+                           self.constraints.allowed_pattern, self.constraints.lexicon)
+        identity = repr((
+            self._file_signatures, self.variant, self.charset,
+            self.decoding_method, self.beam_width, self.top_k, constraints,
+            self.resize_strategy, self.jpeg_draft
+        ))
+        identity = hashlib.blake2b(identity.encode(), digest_size=16).hexdigest()
+        if self.cache is not None:
+            self.cache.set_identity(identity)
+        if self.near_duplicates is not None:
+            self.near_duplicates.set_identity(identity)
+    
+    @staticmethod
+    def _file_signature(path: Path) -> Tuple[str, int, int]:
+        """(path, size, mtime) of a file, or zeros if it is missing"""
+        try:
+            stat = os.stat(path)
+            return str(path), stat.st_size, stat.st_mtime_ns
+        except OSError:
+            return str(path), 0, 0
+    
+    def _decode(self, predictions: np.ndarray) -> List[str]:
+        """Decode a (B, T, C) prediction batch with the selected method"""
+        if self.decoding_method == 'beam':
+            return CTCDecoder.decode_beam_batch(
+                predictions, self.charset, self.beam_width, self.top_k, self.constraints
+            )
+        return CTCDecoder.decode_batch(predictions, self.charset)
+    
+    def _load(self, image: ImageSource, timings: Optional[Dict[str, int]] = None) -> Image.Image:
+        """Decode and validate an image with the configured draft setting"""
+        draft_size = None
+        if self.jpeg_draft:
+            draft_size = (ImageProcessor.DEFAULT_WIDTH, ImageProcessor.DEFAULT_HEIGHT)
+        
+        # Already decoded images (including those decoded by lookup())
+        # have no decode stage to time
+        if not isinstance(image, Image.Image):
+            with stage(timings, 'decode'):
+                image = ImageProcessor.decode(image, draft_size)
+        with stage(timings, 'validate'):
+            is_valid, error_msg = ImageProcessor.validate_loaded(image)
+        if not is_valid:
+            raise ValueError(error_msg)
+        return image
+    
+    def _resize(self, image: Image.Image) -> Image.Image:
+        """Resize a decoded image with the configured strategy"""
+        return ImageProcessor.resize(image, strategy=self.resize_strategy)
+    
+    def _stack(self, resized: List[Image.Image]) -> np.ndarray:
+        """
+        Normalize resized images into one (B, 3, H, W) batch
+        
+        In fused mode the batch is a pooled buffer that must be handed
+        back with _release() once the session has run.
+        """
+        if self.preprocess_mode == 'reference':
+            return np.concatenate([ImageProcessor.normalize(image) for image in resized], axis=0)
+        
+        batch = self.buffer_pool.acquire(len(resized))
+        for row, image in zip(batch, resized):
+            ImageProcessor.normalize_into(image, row)
+        return batch
+    
+    def _release(self, batch: np.ndarray):
+        """Return a batch created by _stack() to the buffer pool"""
+        if self.preprocess_mode == 'fused':
+            self.buffer_pool.release(batch)
+    
+    def _run(self, batch: np.ndarray) -> np.ndarray:
+        """
+        Run the ONNX session on a preprocessed (B, 3, H, W) batch
+        
+        Args:
+            batch: Preprocessed image batch
+        
+        Returns:
+            Model predictions (B, T, C). With IOBinding this is a reused
+            buffer, so it must be decoded before the next run
+        """
+        if self.supports_batching or len(batch) == 1:
+            return self._run_once(batch)
+        
+        # Fall back to one run per row for fixed-batch models; rows are
+        # copied because IOBinding reuses its output buffer
+        outputs = [self._run_once(batch[i:i + 1]).copy() for i in range(len(batch))]
+        return np.concatenate(outputs, axis=0)
+    
+    def _run_once(self, batch: np.ndarray) -> np.ndarray:
+        """Single session run through IOBinding or session.run"""
+        if self.io_binding is not None:
+            return self.io_binding.run(batch)
+        return self.session.run([self.output_name], {self.input_name: batch})[0]
+    
+    def _report_error(self, error: Exception):
+        """Count a failed prediction in the attached metrics"""
+        if self.metrics is not None:
+            self.metrics.record_error('invalid_image' if isinstance(error, ValueError) else 'inference')
+    
+    def reuse_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get counters of the enabled prediction cache and near-duplicate index"""
+        stats = {}
+        if self.cache is not None:
+            stats["cache"] = self.cache.stats()
+        if self.near_duplicates is not None:
+            stats["near_duplicates"] = self.near_duplicates.stats()
+        return stats
     
     def is_ready(self) -> bool:
         """Check if model is ready for inference"""
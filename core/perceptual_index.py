@@ -0,0 +1,179 @@
+"""
+Near-duplicate lookup of prior predictions by perceptual hash
+"""
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+
+class PerceptualIndex:
+    """Bounded multi-index hash table of perceptual hashes
+    
+    Each hash is split into max_distance + 1 chunks, with one exact-match
+    table per chunk. By the pigeonhole principle, two hashes within
+    max_distance bits of each other agree exactly on at least one chunk, so
+    a lookup only has to compare against entries sharing a chunk with the
+    query instead of scanning the whole index.
+    
+    Entries are evicted least recently used once max_entries is reached.
+    Lookup latency is tracked, along with the inference time saved by hits,
+    so the index can be switched off when it does not pay for itself.
+    
+    Thread-safe.
+    """
+    
+    # Number of recent lookups kept for latency percentiles
+    LATENCY_WINDOW = 1024
+    
+    def __init__(self, max_distance: int = 24, hash_size: int = 16, max_entries: int = 10000):
+        """
+        Initialize perceptual index
+        
+        Args:
+            max_distance: Largest Hamming distance treated as a duplicate
+            hash_size: dHash grid size; hashes have hash_size ** 2 bits
+            max_entries: Maximum number of hashes kept
+        """
+        self.hash_bits = hash_size * hash_size
+        if not 0 <= max_distance < self.hash_bits:
+            raise ValueError(f"max_distance must be between 0 and {self.hash_bits - 1}")
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        
+        self.max_distance = max_distance
+        self.hash_size = hash_size
+        self.max_entries = max_entries
+        self.identity = ""
+        
+        # Bit ranges of the chunks, as (shift, mask)
+        chunks = max_distance + 1
+        bounds = [round(i * self.hash_bits / chunks) for i in range(chunks + 1)]
+        self._chunks = [(lo, (1 << (hi - lo)) - 1) for lo, hi in zip(bounds, bounds[1:])]
+        
+        self._entries: "OrderedDict[int, Tuple[str, float]]" = OrderedDict()
+        self._tables: List[Dict[int, Set[int]]] = [{} for _ in self._chunks]
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.saved_ms = 0.0
+        self.lookup_ms = 0.0
+        self._latencies = deque(maxlen=self.LATENCY_WINDOW)
+    
+    @classmethod
+    def from_config(cls, settings: Dict[str, Any]) -> 'PerceptualIndex':
+        """Build an index from the 'near_duplicates' config section"""
+        return cls(
+            max_distance=settings.get('max_distance', 24),
+            hash_size=settings.get('hash_size', 16),
+            max_entries=settings.get('max_entries', 10000)
+        )
+    
+    def set_identity(self, identity: str):
+        """Drop all entries when the model/config identity changes"""
+        with self._lock:
+            if identity != self.identity:
+                self.identity = identity
+                self._clear()
+    
+    def lookup(self, phash: int) -> Optional[str]:
+        """
+        Find the prediction of the nearest indexed hash
+        
+        Args:
+            phash: Perceptual hash of the query image
+            
+        Returns:
+            Prior prediction within max_distance bits, or None
+        """
+        start = time.perf_counter()
+        with self._lock:
+            candidates = set()
+            for table, (shift, mask) in zip(self._tables, self._chunks):
+                candidates.update(table.get((phash >> shift) & mask, ()))
+            
+            best, best_distance = None, self.max_distance + 1
+            for candidate in candidates:
+                distance = (candidate ^ phash).bit_count()
+                if distance < best_distance:
+                    best, best_distance = candidate, distance
+            
+            text = None
+            if best is not None:
+                self._entries.move_to_end(best)
+                text, cost_ms = self._entries[best]
+                self.hits += 1
+                self.saved_ms += cost_ms
+            else:
+                self.misses += 1
+            
+            elapsed = (time.perf_counter() - start) * 1000
+            self.lookup_ms += elapsed
+            self._latencies.append(elapsed)
+            return text
+    
+    def add(self, phash: int, text: str, cost_ms: float = 0.0):
+        """
+        Index a prediction
+        
+        Args:
+            phash: Perceptual hash of the image
+            text: Predicted text
+            cost_ms: Inference time a later hit on this entry saves
+        """
+        with self._lock:
+            if phash in self._entries:
+                self._entries.move_to_end(phash)
+                self._entries[phash] = (text, cost_ms)
+                return
+            
+            self._entries[phash] = (text, cost_ms)
+            for table, (shift, mask) in zip(self._tables, self._chunks):
+                table.setdefault((phash >> shift) & mask, set()).add(phash)
+            
+            while len(self._entries) > self.max_entries:
+                old, _ = self._entries.popitem(last=False)
+                self._unlink(old)
+                self.evictions += 1
+    
+    def _unlink(self, phash: int):
+        """Remove a hash from the chunk tables (lock held)"""
+        for table, (shift, mask) in zip(self._tables, self._chunks):
+            chunk = (phash >> shift) & mask
+            bucket = table.get(chunk)
+            if bucket is not None:
+                bucket.discard(phash)
+                if not bucket:
+                    del table[chunk]
+    
+    def _clear(self):
+        """Drop all entries (lock held)"""
+        self._entries.clear()
+        for table in self._tables:
+            table.clear()
+    
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            self._clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters, lookup latency and estimated time saved"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            latencies = np.array(self._latencies) if self._latencies else np.zeros(1)
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "lookup_ms_p50": float(np.percentile(latencies, 50)),
+                "lookup_ms_p99": float(np.percentile(latencies, 99)),
+                "lookup_ms_total": self.lookup_ms,
+                "saved_ms": self.saved_ms
+            }
@@ -0,0 +1,204 @@
+"""
+Content-addressed cache of prediction results
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+# Rough per-entry bookkeeping overhead (dict slot, key and value objects)
+_ENTRY_OVERHEAD = 120
+
+
+def content_key(data: bytes) -> str:
+    """Fast content hash used as the cache key for an image"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class PredictionCache:
+    """LRU cache of decoded texts keyed by image content
+    
+    Entries live under an identity string describing the model file,
+    config file and decoding settings; changing the identity drops the
+    in-memory entries. An optional SQLite file keeps entries across
+    restarts and is consulted on memory misses. Rows are scoped by
+    identity, so processes with different models or decoding settings can
+    share one file; rows of identities unused for STALE_IDENTITY_AGE
+    seconds are removed when a cache opens.
+    
+    Thread-safe.
+    """
+    
+    # Identities not used for this long are pruned from the SQLite file
+    STALE_IDENTITY_AGE = 30 * 24 * 3600
+    
+    def __init__(self, max_entries: Optional[int] = 10000, max_bytes: Optional[int] = None,
+                 disk_path: Optional[Path] = None):
+        """
+        Initialize prediction cache
+        
+        Args:
+            max_entries: Maximum entries kept in memory (None for no limit)
+            max_bytes: Approximate memory bound in bytes (None for no limit)
+            disk_path: Optional SQLite file for persistence
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.identity = ""
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self.invalidations = 0
+        
+        self._db = None
+        if disk_path is not None:
+            disk_path = Path(disk_path)
+            disk_path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(disk_path), timeout=30.0, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS predictions ("
+                "identity TEXT NOT NULL, key TEXT NOT NULL, text TEXT NOT NULL, "
+                "PRIMARY KEY (identity, key))"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS identities ("
+                "identity TEXT PRIMARY KEY, last_used REAL NOT NULL)"
+            )
+            self._db.commit()
+    
+    @classmethod
+    def from_config(cls, settings: Dict[str, Any]) -> 'PredictionCache':
+        """Build a cache from the 'cache' config section"""
+        return cls(
+            max_entries=settings.get('max_entries', 10000),
+            max_bytes=settings.get('max_bytes'),
+            disk_path=settings.get('disk_path')
+        )
+    
+    def set_identity(self, identity: str):
+        """
+        Switch to a new model/config identity
+        
+        Memory entries of the old identity are dropped. On-disk rows of
+        other identities are kept unless they have gone unused for
+        STALE_IDENTITY_AGE.
+        """
+        with self._lock:
+            if identity == self.identity:
+                return
+            
+            if self.identity:
+                self.invalidations += 1
+            self.identity = identity
+            self._entries.clear()
+            self._bytes = 0
+            
+            if self._db is not None:
+                now = time.time()
+                self._touch_identity(now)
+                self._db.execute("DELETE FROM identities WHERE last_used < ?",
+                                 (now - self.STALE_IDENTITY_AGE,))
+                self._db.execute(
+                    "DELETE FROM predictions WHERE identity NOT IN (SELECT identity FROM identities)"
+                )
+                self._db.commit()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Look up a cached text, or None on a miss"""
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return text
+            
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT text FROM predictions WHERE identity = ? AND key = ?",
+                    (self.identity, key)
+                ).fetchone()
+                if row is not None:
+                    self.hits += 1
+                    self.disk_hits += 1
+                    self._insert(key, row[0])
+                    return row[0]
+            
+            self.misses += 1
+            return None
+    
+    def put(self, key: str, text: str):
+        """Store a decoded text"""
+        with self._lock:
+            self._insert(key, text)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO predictions (identity, key, text) VALUES (?, ?, ?)",
+                    (self.identity, key, text)
+                )
+                self._touch_identity(time.time())
+                self._db.commit()
+    
+    def _touch_identity(self, now: float):
+        """Mark the current identity as used in the SQLite file (lock held)"""
+        self._db.execute(
+            "INSERT OR REPLACE INTO identities (identity, last_used) VALUES (?, ?)",
+            (self.identity, now)
+        )
+    
+    def _insert(self, key: str, text: str):
+        """Add to the in-memory LRU and evict down to the bounds (lock held)"""
+        if key in self._entries:
+            self._bytes -= self._entry_size(key, self._entries.pop(key))
+        
+        self._entries[key] = text
+        self._bytes += self._entry_size(key, text)
+        
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            old_key, old_text = self._entries.popitem(last=False)
+            self._bytes -= self._entry_size(old_key, old_text)
+            self.evictions += 1
+    
+    @staticmethod
+    def _entry_size(key: str, text: str) -> int:
+        return len(key) + len(text) + _ENTRY_OVERHEAD
+    
+    def clear(self):
+        """Drop all in-memory entries"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss/eviction counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_ratio": self.hits / lookups if lookups else 0.0
+            }
+    
+    def close(self):
+        """Close the on-disk store"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,137 @@
+"""
+ONNX Runtime session tuning from configuration
+"""
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Tuple
+
+if TYPE_CHECKING:
+    import onnxruntime as ort
+
+
+# Default session settings; every key can be overridden from the
+# 'onnxruntime' section of model_config.json or the command line.
+# Thread counts of 0 let ONNX Runtime pick (one per physical core).
+DEFAULT_SESSION_SETTINGS: Dict[str, Any] = {
+    "intra_op_num_threads": 0,
+    "inter_op_num_threads": 0,
+    "execution_mode": "sequential",
+    "graph_optimization_level": "all",
+    "allow_spinning": True,
+    "enable_cpu_mem_arena": True,
+    "enable_mem_pattern": True,
+    "optimized_model_path": None,
+    "io_binding": False
+}
+
+# Names of the ort.ExecutionMode and ort.GraphOptimizationLevel members;
+# onnxruntime itself is only imported once a session is built
+EXECUTION_MODES = {
+    "sequential": "ORT_SEQUENTIAL",
+    "parallel": "ORT_PARALLEL"
+}
+
+GRAPH_OPTIMIZATION_LEVELS = {
+    "disable": "ORT_DISABLE_ALL",
+    "basic": "ORT_ENABLE_BASIC",
+    "extended": "ORT_ENABLE_EXTENDED",
+    "all": "ORT_ENABLE_ALL"
+}
+
+
+def merge_session_settings(*layers: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merge session settings over the defaults
+    
+    Later layers win; None values in a layer are ignored so unset
+    command line options fall through to the config file.
+    """
+    settings = dict(DEFAULT_SESSION_SETTINGS)
+    for layer in layers:
+        for key, value in (layer or {}).items():
+            if key not in DEFAULT_SESSION_SETTINGS:
+                raise ValueError(f"Unknown onnxruntime setting: {key}")
+            if value is not None:
+                settings[key] = value
+    return settings
+
+
+def build_session_options(model_path: Path, settings: Dict[str, Any]) -> Tuple[Path, "ort.SessionOptions"]:
+    """
+    Create SessionOptions and pick the model file to load
+    
+    When optimized_model_path is set and the optimized graph on disk is
+    newer than the model, that graph is loaded with graph optimization
+    disabled so startup skips the optimization passes. Otherwise ONNX
+    Runtime is asked to write the optimized graph there for next time.
+    The graph is saved per model file and optimization level (see
+    optimized_model_file), so variants never load each other's graphs.
+    
+    Args:
+        model_path: Path to the source ONNX model
+        settings: Merged session settings
+    
+    Returns:
+        Tuple of (model file to load, SessionOptions)
+    """
+    import onnxruntime as ort
+    
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = int(settings["intra_op_num_threads"])
+    options.inter_op_num_threads = int(settings["inter_op_num_threads"])
+    
+    execution_mode = settings["execution_mode"]
+    if execution_mode not in EXECUTION_MODES:
+        raise ValueError(f"Unknown execution mode: {execution_mode}. Supported: {tuple(EXECUTION_MODES)}")
+    options.execution_mode = getattr(ort.ExecutionMode, EXECUTION_MODES[execution_mode])
+    
+    level = settings["graph_optimization_level"]
+    if level not in GRAPH_OPTIMIZATION_LEVELS:
+        raise ValueError(f"Unknown graph optimization level: {level}. "
+                         f"Supported: {tuple(GRAPH_OPTIMIZATION_LEVELS)}")
+    options.graph_optimization_level = getattr(ort.GraphOptimizationLevel, GRAPH_OPTIMIZATION_LEVELS[level])
+    
+    spinning = "1" if settings["allow_spinning"] else "0"
+    options.add_session_config_entry("session.intra_op.allow_spinning", spinning)
+    options.add_session_config_entry("session.inter_op.allow_spinning", spinning)
+    
+    options.enable_cpu_mem_arena = bool(settings["enable_cpu_mem_arena"])
+    options.enable_mem_pattern = bool(settings["enable_mem_pattern"])
+    
+    model_file = model_path
+    optimized_path = settings["optimized_model_path"]
+    if optimized_path:
+        optimized_path = Path(optimized_path)
+        if not optimized_path.is_absolute():
+            optimized_path = model_path.parent / optimized_path
+        optimized_path = optimized_model_file(optimized_path, model_path, level)
+        
+        if optimized_path.exists() and optimized_path.stat().st_mtime >= model_path.stat().st_mtime:
+            model_file = optimized_path
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+        else:
+            optimized_path.parent.mkdir(parents=True, exist_ok=True)
+            options.optimized_model_filepath = str(optimized_path)
+    
+    return model_file, options
+
+
+def optimized_model_file(optimized_path: Path, model_path: Path, level: str) -> Path:
+    """
+    Get the file an optimized graph is saved to
+    
+    The model file stem and the optimization level are added to the
+    configured name, e.g. 'best_model.opt.onnx' becomes
+    'best_model.opt.best_model.int8_dynamic.all.onnx', so a graph
+    optimized for one variant or level is never loaded for another.
+    
+    Args:
+        optimized_path: Configured optimized_model_path
+        model_path: Model file being loaded (already resolved to its variant)
+        level: Graph optimization level name
+    
+    Returns:
+        Path of the optimized graph for this model and level
+    """
+    suffix = optimized_path.suffix or model_path.suffix
+    stem = optimized_path.stem if optimized_path.suffix else optimized_path.name
+    return optimized_path.with_name(f"{stem}.{model_path.stem}.{level}{suffix}")
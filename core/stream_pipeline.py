@@ -0,0 +1,397 @@
+"""
+Pipelined streaming inference with decode prefetch
+"""
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, Optional
+
+import numpy as np
+
+from .image_processor import ImageSource
+from .timing import stage
+
+if TYPE_CHECKING:
+    from .model_manager import ModelManager
+
+
+@dataclass
+class StreamResult:
+    """One prediction from ModelManager.predict_stream
+    
+    ``index`` is the position of the image in the input and ``source`` the
+    input itself. Exactly one of ``text`` and ``error`` is set. ``cached``
+    is True when the text came from the prediction cache or
+    near-duplicate index instead of the model.
+    """
+    index: int
+    source: ImageSource
+    text: Optional[str] = None
+    error: Optional[str] = None
+    cached: bool = False
+
+
+class StageMeter:
+    """Busy and waiting time of one pipeline stage
+    
+    ``starved`` is time spent waiting for input from the previous stage,
+    ``blocked`` time spent waiting for room in the queue to the next one.
+    A stage that is busy nearly all the time is the bottleneck; one that
+    is mostly blocked has more capacity than the stages after it.
+    """
+    
+    def __init__(self, workers: int = 1):
+        self.workers = workers
+        self.items = 0
+        self.busy_ns = 0
+        self.starved_ns = 0
+        self.blocked_ns = 0
+        self._lock = threading.Lock()
+    
+    def add(self, busy_ns: int = 0, starved_ns: int = 0, blocked_ns: int = 0, items: int = 0):
+        with self._lock:
+            self.busy_ns += busy_ns
+            self.starved_ns += starved_ns
+            self.blocked_ns += blocked_ns
+            self.items += items
+    
+    def summary(self, wall_ns: int) -> Dict[str, float]:
+        """Times in ms and utilization (busy share of workers x wall time)"""
+        capacity = self.workers * wall_ns
+        return {
+            "workers": self.workers,
+            "items": self.items,
+            "busy_ms": self.busy_ns / 1e6,
+            "starved_ms": self.starved_ns / 1e6,
+            "blocked_ms": self.blocked_ns / 1e6,
+            "utilization": self.busy_ns / capacity if capacity > 0 else 0.0
+        }
+
+
+# Queue markers
+_END = object()
+_STOPPED = object()
+
+
+class StreamPipeline:
+    """Four-stage inference pipeline over an iterable of images
+    
+    1. prefetch: a thread pool looks images up in the cache and decodes,
+       validates and resizes them (PIL releases the GIL while decoding)
+    2. batch: one thread groups prepared images into batches
+    3. infer: one thread normalizes each batch and runs the ONNX session
+    4. ctc: one thread decodes the model output into text
+    
+    Bounded queues sit between the stages, so a slow stage holds up the
+    ones before it instead of letting work pile up, and at most
+    max_pending images are in the pipeline at once (including results
+    waiting to be yielded in order). While the session runs one batch the
+    prefetch pool is already decoding the next, and CTC decoding of the
+    previous batch overlaps both.
+    """
+    
+    STAGES = ('prefetch', 'batch', 'infer', 'ctc')
+    
+    def __init__(self, model_manager: "ModelManager", batch_size: int = 32,
+                 prefetch_workers: Optional[int] = None, ordered: bool = True,
+                 max_pending: Optional[int] = None, queue_size: int = 2,
+                 max_wait_ms: float = 5.0):
+        """
+        Initialize pipeline
+        
+        Args:
+            model_manager: Loaded ModelManager
+            batch_size: Maximum images per session run
+            prefetch_workers: Threads decoding images (default: min(4, CPUs))
+            ordered: Yield results in input order; otherwise as they complete
+            max_pending: Maximum images in the pipeline (default: 4 batches)
+            queue_size: Batches allowed to wait between the batch, infer
+                and ctc stages
+            max_wait_ms: Longest time a partial batch waits for more
+                prepared images
+        """
+        if batch_size < 1 or queue_size < 1:
+            raise ValueError("batch_size and queue_size must be at least 1")
+        
+        self.model_manager = model_manager
+        self.batch_size = batch_size
+        self.prefetch_workers = prefetch_workers or min(4, os.cpu_count() or 1)
+        self.ordered = ordered
+        self.max_pending = max(max_pending or 4 * batch_size, batch_size)
+        self.max_wait_ns = int(max_wait_ms * 1e6)
+        
+        self.meters = {
+            'prefetch': StageMeter(self.prefetch_workers),
+            'batch': StageMeter(),
+            'infer': StageMeter(),
+            'ctc': StageMeter()
+        }
+        self._prepared: "queue.Queue[Any]" = queue.Queue(maxsize=self.max_pending)
+        self._batches: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._outputs: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        # Results are bounded by the pending slots, so this queue needs no limit
+        self._results: "queue.Queue[Any]" = queue.Queue()
+        self._slots = threading.Semaphore(self.max_pending)
+        self._stopping = threading.Event()
+        self._failure: Optional[BaseException] = None
+        self._started_ns = 0
+        self._finished_ns = 0
+    
+    def run(self, images: Iterable[ImageSource]) -> Iterator[StreamResult]:
+        """
+        Stream predictions for images
+        
+        Args:
+            images: Image file paths, encoded bytes, uint8 arrays or PIL images
+        
+        Yields:
+            StreamResult per image, in input order when ordered is set
+        
+        Raises:
+            RuntimeError: If a pipeline stage fails (per-image errors are
+                reported in the results instead)
+        """
+        self._started_ns = time.perf_counter_ns()
+        executor = ThreadPoolExecutor(max_workers=self.prefetch_workers, thread_name_prefix="prefetch")
+        threads = [
+            threading.Thread(target=self._guard, args=(self._feed, images, executor),
+                             name="stream-feed", daemon=True),
+            threading.Thread(target=self._guard, args=(self._batch,), name="stream-batch", daemon=True),
+            threading.Thread(target=self._guard, args=(self._infer,), name="stream-infer", daemon=True),
+            threading.Thread(target=self._guard, args=(self._ctc,), name="stream-ctc", daemon=True)
+        ]
+        for thread in threads:
+            thread.start()
+        
+        try:
+            waiting: Dict[int, StreamResult] = {}
+            next_index = 0
+            while True:
+                result = self._results.get()
+                if result is _END or result is _STOPPED:
+                    break
+                
+                if not self.ordered:
+                    self._slots.release()
+                    yield result
+                    continue
+                
+                waiting[result.index] = result
+                while next_index in waiting:
+                    self._slots.release()
+                    yield waiting.pop(next_index)
+                    next_index += 1
+            
+            if self._failure is not None:
+                raise RuntimeError(f"Error during streaming prediction: {self._failure}")
+        finally:
+            # Also reached when the caller stops iterating early
+            self._stopping.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+            for thread in threads:
+                thread.join()
+            self._finished_ns = time.perf_counter_ns()
+    
+    def utilization(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get per-stage utilization of the last run
+        
+        Returns:
+            Dict of stage name -> workers, items, busy_ms, starved_ms,
+            blocked_ms and utilization (0-1), plus 'wall_ms'
+        """
+        wall_ns = (self._finished_ns or time.perf_counter_ns()) - self._started_ns
+        stats: Dict[str, Any] = {name: self.meters[name].summary(wall_ns) for name in self.STAGES}
+        stats['wall_ms'] = wall_ns / 1e6
+        return stats
+    
+    def _guard(self, target, *args):
+        """Run a stage; on an unexpected error stop the pipeline"""
+        try:
+            target(*args)
+        except BaseException as e:
+            self._failure = e
+            self._stopping.set()
+            self._results.put(_STOPPED)
+    
+    def _put(self, target: queue.Queue, item: Any, meter: StageMeter) -> bool:
+        """Put item, waiting while target is full (False if stopped)"""
+        start = time.perf_counter_ns()
+        try:
+            while not self._stopping.is_set():
+                try:
+                    target.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        finally:
+            meter.add(blocked_ns=time.perf_counter_ns() - start)
+    
+    def _get(self, source: queue.Queue, meter: StageMeter, timeout: Optional[float] = None) -> Any:
+        """
+        Get the next item, waiting while source is empty
+        
+        Returns:
+            The item, _STOPPED if the pipeline stopped, or None if timeout
+            seconds passed
+        """
+        start = time.perf_counter_ns()
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        try:
+            while not self._stopping.is_set():
+                wait = 0.1 if deadline is None else min(0.1, deadline - time.perf_counter())
+                if wait <= 0:
+                    return None
+                try:
+                    return source.get(timeout=wait)
+                except queue.Empty:
+                    continue
+            return _STOPPED
+        finally:
+            meter.add(starved_ns=time.perf_counter_ns() - start)
+    
+    def _feed(self, images: Iterable[ImageSource], executor: ThreadPoolExecutor):
+        """Submit images to the prefetch pool while pending slots are free"""
+        futures = []
+        for index, image in enumerate(images):
+            while not self._slots.acquire(timeout=0.1):
+                if self._stopping.is_set():
+                    return
+            if self._stopping.is_set():
+                return
+            
+            futures.append(executor.submit(self._prefetch, index, image))
+            # Drop finished futures so a long stream does not keep them all
+            if len(futures) >= self.max_pending:
+                futures = [future for future in futures if not future.done()]
+        
+        for future in futures:
+            future.result()
+        self._put(self._prepared, _END, self.meters['prefetch'])
+    
+    def _prefetch(self, index: int, image: ImageSource):
+        """Look one image up and prepare it (runs on the prefetch pool)"""
+        manager = self.model_manager
+        start = time.perf_counter_ns()
+        try:
+            prior = manager.lookup(image)
+            if prior.text is not None:
+                item: Any = StreamResult(index, image, text=prior.text, cached=True)
+            else:
+                item = (index, image, manager.prepare(prior.image), prior)
+        except Exception as e:
+            manager._report_error(e)
+            item = StreamResult(index, image, error=str(e))
+        self.meters['prefetch'].add(busy_ns=time.perf_counter_ns() - start, items=1)
+        
+        self._put(self._prepared, item, self.meters['prefetch'])
+    
+    def _batch(self):
+        """Group prepared images into batches"""
+        meter = self.meters['batch']
+        while True:
+            item = self._get(self._prepared, meter)
+            if item is _STOPPED:
+                return
+            
+            batch = []
+            deadline = time.perf_counter_ns() + self.max_wait_ns
+            while item is not _END:
+                start = time.perf_counter_ns()
+                if isinstance(item, StreamResult):
+                    # Cache hits and failed images skip the model
+                    self._results.put(item)
+                else:
+                    batch.append(item)
+                meter.add(busy_ns=time.perf_counter_ns() - start, items=1)
+                if len(batch) >= self.batch_size:
+                    break
+                
+                remaining = (deadline - time.perf_counter_ns()) / 1e9
+                item = self._get(self._prepared, meter, timeout=max(remaining, 0.0005))
+                if item is None:
+                    break
+                if item is _STOPPED:
+                    return
+            
+            if batch and not self._put(self._batches, batch, meter):
+                return
+            if item is _END:
+                self._put(self._batches, _END, meter)
+                return
+    
+    def _infer(self):
+        """Normalize batches and run the ONNX session"""
+        manager = self.model_manager
+        meter = self.meters['infer']
+        while True:
+            batch = self._get(self._batches, meter)
+            if batch is _STOPPED:
+                return
+            if batch is _END:
+                self._put(self._outputs, _END, meter)
+                return
+            
+            start = time.perf_counter_ns()
+            timings: Dict[str, int] = {}
+            try:
+                with stage(timings, 'normalize'):
+                    tensor = manager._stack([prepared for _, _, prepared, _ in batch])
+                try:
+                    with stage(timings, 'run'):
+                        predictions = manager._run(tensor)
+                    # IOBinding reuses its output buffer on the next run
+                    if manager.io_binding is not None:
+                        predictions = np.array(predictions, copy=True)
+                finally:
+                    manager._release(tensor)
+                manager._record(timings, None, images=len(batch))
+                if manager.metrics is not None:
+                    manager.metrics.record_batch(len(batch))
+                output: Any = (batch, predictions, timings['run'] / 1e6)
+            except Exception as e:
+                for index, image, _, _ in batch:
+                    manager._report_error(e)
+                    self._results.put(StreamResult(index, image, error=f"Error during prediction: {e}"))
+                output = None
+            meter.add(busy_ns=time.perf_counter_ns() - start, items=len(batch))
+            
+            if output is not None and not self._put(self._outputs, output, meter):
+                return
+    
+    def _ctc(self):
+        """Decode model output into text"""
+        manager = self.model_manager
+        meter = self.meters['ctc']
+        while True:
+            output = self._get(self._outputs, meter)
+            if output is _STOPPED:
+                return
+            if output is _END:
+                self._results.put(_END)
+                return
+            
+            batch, predictions, run_ms = output
+            start = time.perf_counter_ns()
+            timings = {}
+            try:
+                with stage(timings, 'ctc'):
+                    texts = manager._decode(predictions)
+                manager._record(timings, None, images=len(batch))
+                results = []
+                for (index, image, _, prior), text in zip(batch, texts):
+                    manager.remember(prior, text, run_ms / len(batch))
+                    results.append(StreamResult(index, image, text=text))
+            except Exception as e:
+                results = []
+                for index, image, _, _ in batch:
+                    manager._report_error(e)
+                    results.append(StreamResult(index, image, error=f"Error during prediction: {e}"))
+            meter.add(busy_ns=time.perf_counter_ns() - start, items=len(batch))
+            
+            for result in results:
+                self._results.put(result)
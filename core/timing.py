@@ -0,0 +1,141 @@
+"""
+Per-stage inference timing
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional
+
+import numpy as np
+
+
+# Pipeline stages in execution order. 'lookup' only appears when the
+# prediction cache or near-duplicate index is enabled
+STAGES = ('lookup', 'decode', 'validate', 'resize', 'normalize', 'run', 'ctc')
+
+
+@contextmanager
+def stage(timings: Optional[Dict[str, int]], name: str) -> Iterator[None]:
+    """
+    Add the perf_counter_ns duration of a block to timings[name]
+    
+    Does nothing when timings is None, so callers that do not collect
+    timings pay only for the check.
+    """
+    if timings is None:
+        yield
+        return
+    
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0) + time.perf_counter_ns() - start
+
+
+@dataclass
+class PredictionResult:
+    """Prediction with a per-stage timing breakdown
+    
+    Unpacks like the (text, inference_time_ms) tuple predict() used to
+    return, where inference_time_ms is the session.run time.
+    """
+    text: str
+    timings_ns: Dict[str, int] = field(default_factory=dict)
+    cached: bool = False
+    
+    @property
+    def inference_ms(self) -> float:
+        """session.run time in milliseconds"""
+        return self.timings_ns.get('run', 0) / 1e6
+    
+    @property
+    def total_ms(self) -> float:
+        """Time across all stages in milliseconds"""
+        return sum(self.timings_ns.values()) / 1e6
+    
+    def breakdown_ms(self) -> Dict[str, float]:
+        """Stage times in milliseconds, in pipeline order"""
+        return {name: self.timings_ns[name] / 1e6 for name in STAGES if name in self.timings_ns}
+    
+    def __iter__(self):
+        return iter((self.text, self.inference_ms))
+
+
+class StageHistograms:
+    """Rolling window of per-image stage latencies
+    
+    Keeps the most recent window samples of every stage, so percentiles
+    reflect current behaviour rather than the whole process lifetime.
+    
+    Thread-safe.
+    """
+    
+    def __init__(self, window: int = 1000):
+        """
+        Initialize stage histograms
+        
+        Args:
+            window: Number of recent samples kept per stage
+        """
+        self.window = window
+        self._samples: Dict[str, deque] = {name: deque(maxlen=window) for name in STAGES}
+        self._lock = threading.Lock()
+    
+    def record(self, timings_ns: Dict[str, int], images: int = 1):
+        """
+        Add one prediction's stage timings
+        
+        Args:
+            timings_ns: Stage durations in nanoseconds
+            images: Number of images the timings cover; durations are
+                divided by it so samples are always per image
+        """
+        with self._lock:
+            for name, duration in timings_ns.items():
+                self._samples.setdefault(name, deque(maxlen=self.window)).append(duration / images)
+    
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Get count, mean and p50/p95/p99 in milliseconds for each recorded stage"""
+        with self._lock:
+            samples = {name: np.array(values) / 1e6 for name, values in self._samples.items() if values}
+        
+        return {
+            name: {
+                "count": len(values),
+                "mean_ms": float(values.mean()),
+                "p50_ms": float(np.percentile(values, 50)),
+                "p95_ms": float(np.percentile(values, 95)),
+                "p99_ms": float(np.percentile(values, 99))
+            }
+            for name, values in samples.items()
+        }
+    
+    def histogram(self, name: str, bins: int = 20):
+        """
+        Bucket the recent samples of one stage
+        
+        Args:
+            name: Stage name
+            bins: Number of log-spaced buckets
+        
+        Returns:
+            Tuple of (counts, bucket edges in milliseconds)
+        """
+        with self._lock:
+            values = np.array(self._samples.get(name, ())) / 1e6
+        
+        if not len(values):
+            return np.zeros(bins, dtype=np.int64), np.zeros(bins + 1)
+        
+        low = max(values.min(), 1e-6)
+        high = max(values.max(), low * 1.01)
+        return np.histogram(values, bins=np.geomspace(low, high, bins + 1))
+    
+    def clear(self):
+        """Drop all samples"""
+        with self._lock:
+            for values in self._samples.values():
+                values.clear()
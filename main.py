@@ -2,26 +2,324 @@
 UltraCaptureV3 Desktop Application
 Main entry point
 """
+import argparse
 import sys
+import time
 from pathlib import Path
 
+# Reference point for the startup timings logged by the GUI
+START_TIME = time.perf_counter()
+
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from PySide6.QtWidgets import QApplication, QMessageBox
-from PySide6.QtCore import Qt
-
-from ui.main_window import MainWindow
-from core import ModelManager
-from utils import logger
 import config
 
 
-def main():
-    """Main application entry point"""
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        description=f"{config.APP_NAME} CAPTCHA recognition. "
+                    "Starts the desktop application unless a headless mode is selected."
+    )
+    
+    # Headless batch mode
+    batch = parser.add_argument_group("headless batch mode")
+    batch.add_argument("--batch", metavar="SOURCE",
+                       help="Run without the GUI on a directory, glob pattern or "
+                            "text file listing one image path per line")
+    batch.add_argument("--output", "-o", metavar="PATH", default="-",
+                       help="Write results to PATH instead of stdout")
+    batch.add_argument("--format", choices=["jsonl", "csv"], default="jsonl",
+                       help="Result format (default: jsonl)")
+    batch.add_argument("--batch-size", type=int, default=32,
+                       help="Images per inference call (default: 32)")
+    batch.add_argument("--workers", type=int, default=1,
+                       help="Worker processes, each with its own model session (default: 1)")
+    batch.add_argument("--threads", type=int, default=1,
+                       help="Inference threads per worker (default: 1)")
+    batch.add_argument("--recursive", action="store_true",
+                       help="Descend into subdirectories of a SOURCE directory")
+    
+    # Watch mode
+    watch = parser.add_argument_group("watch mode")
+    watch.add_argument("--watch", metavar="DIR",
+                       help="Run without the GUI, predicting new and changed images in DIR "
+                            "until interrupted (uses --output, --format, --batch-size and --recursive)")
+    watch.add_argument("--sidecar", action="store_true",
+                       help="Also write each result next to its image as <image>.json")
+    watch.add_argument("--max-backlog", type=int, default=1024,
+                       help="Images allowed to wait for inference before scanning pauses (default: 1024)")
+    watch.add_argument("--poll-interval", type=float, default=1.0,
+                       help="Seconds between directory scans (default: 1)")
+    watch.add_argument("--watch-max-wait-ms", type=float, default=200.0,
+                       help="Longest time to wait for more arrivals to fill a batch (default: 200)")
+    watch.add_argument("--watch-index", metavar="PATH", type=Path,
+                       help="Keep the processed-file index in PATH so restarts skip processed files")
+    
+    # Server mode
+    serve = parser.add_argument_group("http server mode")
+    serve.add_argument("--serve", action="store_true",
+                       help="Serve the model over HTTP without the GUI")
+    serve.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=8000, help="Port to bind (default: 8000)")
+    serve.add_argument("--max-wait-ms", type=float, default=5.0,
+                       help="Longest time a request waits for its micro-batch to fill (default: 5)")
+    serve.add_argument("--max-queue", type=int, default=1024,
+                       help="Requests allowed to wait for inference before rejecting (default: 1024)")
+    
+    # Evaluation mode
+    evaluation = parser.add_argument_group("evaluation mode")
+    evaluation.add_argument("--evaluate", metavar="DIR",
+                            help="Measure accuracy and speed on a directory of labelled images "
+                                 "(label = file name up to the first underscore)")
+    evaluation.add_argument("--labels", metavar="CSV",
+                            help="CSV of 'path,label' rows instead of file-name labels")
+    evaluation.add_argument("--resize", nargs="+", metavar="STRATEGY",
+                            help="Resize strategies to compare: lanczos, bilinear, box, "
+                                 "reduce or all (default: from model config)")
+    evaluation.add_argument("--jpeg-draft", action=argparse.BooleanOptionalAction, default=None,
+                            help="Decode JPEGs in draft mode at reduced scale "
+                                 "(default: from model config)")
+    evaluation.add_argument("--report", metavar="PATH",
+                            help="Write the evaluation report as JSON")
+    
+    # Metrics export
+    metrics = parser.add_argument_group("metrics")
+    metrics.add_argument("--metrics-port", type=int, metavar="PORT",
+                         help="Serve Prometheus metrics on http://127.0.0.1:PORT/metrics")
+    metrics.add_argument("--metrics-file", metavar="PATH",
+                         help="Periodically write Prometheus metrics to PATH")
+    metrics.add_argument("--metrics-interval", type=float, default=15.0,
+                         help="Seconds between metrics file writes (default: 15)")
+    
+    # Startup measurement (used by build.py on the frozen application)
+    parser.add_argument("--startup-probe", metavar="PATH",
+                        help="Start the GUI, write startup timings as JSON to PATH "
+                             "and exit once the model is ready")
+    
+    # Model selection
+    parser.add_argument("--model", type=Path, default=config.MODEL_PATH,
+                        help="Path to the ONNX model")
+    parser.add_argument("--config", type=Path, default=config.CONFIG_PATH,
+                        help="Path to the model configuration JSON")
+    parser.add_argument("--variant", choices=["fp32", "int8_dynamic", "int8_static"],
+                        help="Model variant to load (default: from model config)")
+    parser.add_argument("--decoder", choices=["greedy", "beam"],
+                        help="CTC decoding method (default: from model config)")
+    parser.add_argument("--beam-width", type=int,
+                        help="Beam width for beam search decoding (default: from model config)")
+    parser.add_argument("--cache", action=argparse.BooleanOptionalAction, default=None,
+                        help="Serve repeated images from the prediction cache (default: from model config)")
+    parser.add_argument("--cache-db", metavar="PATH",
+                        help="Persist the prediction cache in a SQLite file (implies --cache)")
+    parser.add_argument("--near-duplicates", action=argparse.BooleanOptionalAction, default=None,
+                        help="Reuse predictions of perceptually similar images (default: from model config)")
+    parser.add_argument("--max-hamming", type=int, metavar="BITS",
+                        help="Largest perceptual hash distance treated as a near duplicate")
+    
+    # ONNX Runtime tuning (defaults come from the model config)
+    runtime = parser.add_argument_group("onnx runtime tuning")
+    runtime.add_argument("--intra-op-threads", type=int,
+                         help="Threads used inside each operator (0 = one per core)")
+    runtime.add_argument("--inter-op-threads", type=int,
+                         help="Threads used across operators in parallel execution mode")
+    runtime.add_argument("--execution-mode", choices=["sequential", "parallel"])
+    runtime.add_argument("--graph-optimization", choices=["disable", "basic", "extended", "all"])
+    runtime.add_argument("--spinning", action=argparse.BooleanOptionalAction, default=None,
+                         help="Let idle ONNX Runtime threads spin-wait for work")
+    runtime.add_argument("--mem-arena", action=argparse.BooleanOptionalAction, default=None,
+                         help="Use the CPU memory arena")
+    runtime.add_argument("--mem-pattern", action=argparse.BooleanOptionalAction, default=None,
+                         help="Use memory pattern planning")
+    runtime.add_argument("--optimized-model", metavar="PATH",
+                         help="Save the optimized graph to PATH and reuse it on later starts")
+    runtime.add_argument("--io-binding", action=argparse.BooleanOptionalAction, default=None,
+                         help="Run inference through IOBinding with reusable buffers")
+    
+    return parser.parse_args(argv)
+
+
+def manager_options_from_args(args: argparse.Namespace) -> dict:
+    """Collect ModelManager keyword arguments given on the command line"""
+    return {
+        "variant": args.variant,
+        "session_settings": session_settings_from_args(args),
+        "cache_settings": cache_settings_from_args(args),
+        "near_duplicate_settings": {
+            "enabled": args.near_duplicates,
+            "max_distance": args.max_hamming
+        },
+        "decoding_settings": {
+            "method": args.decoder,
+            "beam_width": args.beam_width
+        }
+    }
+
+
+def cache_settings_from_args(args: argparse.Namespace) -> dict:
+    """Collect prediction cache overrides given on the command line"""
+    enabled = args.cache
+    if enabled is None and args.cache_db:
+        enabled = True
+    return {
+        "enabled": enabled,
+        "disk_path": args.cache_db
+    }
+
+
+def session_settings_from_args(args: argparse.Namespace) -> dict:
+    """Collect ONNX Runtime overrides given on the command line"""
+    return {
+        "intra_op_num_threads": args.intra_op_threads,
+        "inter_op_num_threads": args.inter_op_threads,
+        "execution_mode": args.execution_mode,
+        "graph_optimization_level": args.graph_optimization,
+        "allow_spinning": args.spinning,
+        "enable_cpu_mem_arena": args.mem_arena,
+        "enable_mem_pattern": args.mem_pattern,
+        "optimized_model_path": args.optimized_model,
+        "io_binding": args.io_binding
+    }
+
+
+def start_metrics_exporters(args: argparse.Namespace, metrics) -> list:
+    """Start the metrics endpoint and file writer requested on the command line"""
+    from utils.metrics import MetricsFileWriter, MetricsServer
+    from utils import logger
+    
+    exporters = []
+    if args.metrics_port is not None:
+        exporter = MetricsServer(metrics.registry, port=args.metrics_port)
+        logger.info(f"Serving metrics on http://127.0.0.1:{exporter.port}/metrics")
+        exporters.append(exporter)
+    if args.metrics_file:
+        exporters.append(MetricsFileWriter(metrics.registry, Path(args.metrics_file),
+                                           interval=args.metrics_interval))
+    
+    for exporter in exporters:
+        exporter.start()
+    return exporters
+
+
+def run_headless(args: argparse.Namespace) -> int:
+    """Run a headless mode without importing PySide6"""
+    from utils import logger
+    from utils.metrics import InferenceMetrics
+    
+    if not args.model.exists():
+        logger.error(f"Model not found: {args.model}")
+        return 1
+    
+    metrics = InferenceMetrics()
+    exporters = start_metrics_exporters(args, metrics)
+    try:
+        return _run_headless_mode(args, metrics)
+    finally:
+        for exporter in exporters:
+            exporter.stop()
+
+
+def _run_headless_mode(args: argparse.Namespace, metrics) -> int:
+    """Dispatch to the selected headless mode"""
+    if args.serve:
+        from cli.server import run_server
+        return run_server(
+            args.model,
+            args.config,
+            host=args.host,
+            port=args.port,
+            max_batch_size=args.batch_size,
+            max_wait_ms=args.max_wait_ms,
+            max_queue=args.max_queue,
+            manager_options=manager_options_from_args(args),
+            metrics=metrics
+        )
+    
+    if args.watch:
+        from cli.watch import run_watch
+        return run_watch(
+            args.watch,
+            model_path=args.model,
+            config_path=args.config,
+            output=args.output,
+            fmt=args.format,
+            sidecar=args.sidecar,
+            batch_size=args.batch_size,
+            max_backlog=args.max_backlog,
+            poll_interval=args.poll_interval,
+            max_wait_ms=args.watch_max_wait_ms,
+            recursive=args.recursive,
+            index_path=args.watch_index,
+            manager_options=manager_options_from_args(args),
+            metrics=metrics
+        )
+    
+    if args.evaluate:
+        from cli.evaluate import run_evaluate
+        return run_evaluate(
+            args.evaluate,
+            model_path=args.model,
+            config_path=args.config,
+            labels_file=args.labels,
+            resize_strategies=args.resize,
+            jpeg_draft=args.jpeg_draft,
+            batch_size=args.batch_size,
+            recursive=args.recursive,
+            output=args.report,
+            manager_options=manager_options_from_args(args)
+        )
+    
+    from cli.batch import run_batch
+    return run_batch(
+        args.batch,
+        model_path=args.model,
+        config_path=args.config,
+        output=args.output,
+        fmt=args.format,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        threads=args.threads,
+        recursive=args.recursive,
+        manager_options=manager_options_from_args(args),
+        metrics=metrics
+    )
+
+
+def write_startup_probe(path: str, timings: dict):
+    """
+    Write GUI startup timings for build.py
+    
+    Args:
+        path: JSON file to write
+        timings: Millisecond timings relative to START_TIME
+    """
+    import json
+    
+    # Wall-clock time of START_TIME, so the caller can add the time spent
+    # before main.py ran (interpreter start, PyInstaller unpacking)
+    report = dict(timings, start_epoch=time.time() - (time.perf_counter() - START_TIME))
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+
+def run_gui(args: argparse.Namespace) -> int:
+    """Run the desktop application
+    
+    The window is shown before the model is loaded; ModelLoader builds and
+    warms up the session in the background and the Inference tab stays in
+    a loading state until it is ready.
+    """
+    from PySide6.QtWidgets import QApplication, QMessageBox
+    from PySide6.QtCore import QTimer
+    
+    from ui.main_window import MainWindow
+    from ui.model_loader import ModelLoader
+    from utils import logger
+    
     try:
         # Create application
-        app = QApplication(sys.argv)
+        app = QApplication(sys.argv[:1])
         
         # Set application style
         app.setStyle('Fusion')
@@ -29,42 +327,92 @@ def main():
         logger.info(f"Starting {config.APP_NAME} v{config.APP_VERSION}")
         
         # Check if model exists
-        if not config.MODEL_PATH.exists():
-            logger.error(f"Model not found: {config.MODEL_PATH}")
+        if not args.model.exists():
+            logger.error(f"Model not found: {args.model}")
+            if args.startup_probe:
+                write_startup_probe(args.startup_probe, {"error": f"Model not found: {args.model}"})
+                return 1
             QMessageBox.critical(
                 None,
                 "Error",
-                f"Model file not found:\n{config.MODEL_PATH}\n\n"
+                f"Model file not found:\n{args.model}\n\n"
                 "Please ensure the ONNX model is in the resources/models directory."
             )
             return 1
         
-        logger.info(f"Loading model from: {config.MODEL_PATH}")
+        # Create main window before the model is loaded
+        window = MainWindow()
+        window.show()
+        
+        startup_timings = {}
+        
+        def on_window_shown():
+            startup_timings["window_ms"] = (time.perf_counter() - START_TIME) * 1000
+            logger.info(f"Time to window: {startup_timings['window_ms']:.0f} ms")
+        
+        def finish_startup_probe():
+            write_startup_probe(args.startup_probe, startup_timings)
+            app.quit()
+        
+        # Fires once the event loop has painted the window
+        QTimer.singleShot(0, on_window_shown)
+        
+        logger.info(f"Loading model from: {args.model}")
         
-        # Initialize model manager
-        model_manager = ModelManager(config.MODEL_PATH, config.CONFIG_PATH)
+        def on_model_loaded(model_manager, load_ms: float):
+            window.set_model_manager(model_manager)
+            startup_timings.update(
+                ready_ms=(time.perf_counter() - START_TIME) * 1000,
+                session_ms=model_manager.load_ms,
+                warmup_ms=model_manager.warmup_ms
+            )
+            logger.info(
+                f"Time to ready: {startup_timings['ready_ms']:.0f} ms "
+                f"(session {model_manager.load_ms:.0f} ms, warm-up {model_manager.warmup_ms:.0f} ms, "
+                f"total load {load_ms:.0f} ms)"
+            )
+            
+            if args.startup_probe:
+                QTimer.singleShot(0, finish_startup_probe)
+                return
+            
+            if args.metrics_port is not None or args.metrics_file:
+                from utils.metrics import InferenceMetrics
+                metrics = InferenceMetrics()
+                metrics.attach(model_manager)
+                metrics.queue_depth.set_function(window.inference_queue_depth, queue="gui")
+                exporters = start_metrics_exporters(args, metrics)
+                app.aboutToQuit.connect(lambda: [exporter.stop() for exporter in exporters])
         
-        if not model_manager.is_ready():
-            logger.error("Model failed to load")
+        def on_load_failed(message: str):
+            logger.error(f"Model failed to load: {message}")
+            window.set_model_error(message)
+            if args.startup_probe:
+                startup_timings["error"] = message
+                QTimer.singleShot(0, finish_startup_probe)
+                return
             QMessageBox.critical(
-                None,
+                window,
                 "Error",
-                "Failed to load the ONNX model.\n\n"
+                f"Failed to load the ONNX model:\n{message}\n\n"
                 "Please check that the model file is valid and all dependencies are installed."
             )
-            return 1
         
-        logger.info("Model loaded successfully")
+        # Per-tab costs, including tabs opened later in the session
+        app.aboutToQuit.connect(lambda: logger.info(f"Startup timings:\n{window.startup_report()}"))
         
-        # Create main window
-        window = MainWindow(model_manager)
-        window.show()
+        loader = ModelLoader(args.model, args.config, manager_options_from_args(args))
+        loader.model_loaded.connect(on_model_loaded)
+        loader.load_failed.connect(on_load_failed)
+        loader.start()
         
         logger.info("Application started successfully")
         
         # Run application
-        sys.exit(app.exec())
-        
+        exit_code = app.exec()
+        loader.wait()
+        return exit_code
+    
     except Exception as e:
         logger.error(f"Fatal error: {e}", exc_info=True)
         QMessageBox.critical(
@@ -75,6 +423,15 @@ def main():
         return 1
 
 
+def main(argv=None):
+    """Main application entry point"""
+    args = parse_args(argv)
+    
+    if args.batch or args.evaluate or args.serve or args.watch:
+        return run_headless(args)
+    
+    return run_gui(args)
+
+
 if __name__ == "__main__":
     sys.exit(main())
-
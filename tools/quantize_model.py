@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Produce INT8 variants of the ONNX model and compare them with FP32
+
+Usage:
+    python tools/quantize_model.py --modes dynamic static --calibration path/to/images
+    python tools/quantize_model.py --modes --eval path/to/labelled_images --report report.json
+
+Dynamic quantization stores INT8 weights and quantizes activations at
+run time. Static quantization also fixes activation ranges ahead of time
+from calibration images, which are run through ImageProcessor exactly as
+in inference. The variants are written next to the base model as
+'<stem>.int8_dynamic.onnx' and '<stem>.int8_static.onnx' and can be
+selected with 'model_variant' in model_config.json or --variant.
+"""
+import argparse
+import contextlib
+import json
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import config
+
+
+def print_status(status, message):
+    """Print a status message"""
+    symbols = {
+        "info": "[*]",
+        "ok": "[OK]",
+        "error": "[ERROR]",
+        "warning": "[WARNING]"
+    }
+    print(f"{symbols.get(status, '[*]')} {message}")
+
+
+def quantize_dynamic_variant(model_path: Path, output_path: Path, per_channel: bool):
+    """Write a dynamically quantized INT8 copy of the model"""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    
+    quantize_dynamic(
+        str(model_path),
+        str(output_path),
+        weight_type=QuantType.QInt8,
+        per_channel=per_channel
+    )
+
+
+def quantize_static_variant(model_path: Path, output_path: Path, calibration_dir: Path,
+                            calibration_size: int, per_channel: bool):
+    """Write a statically quantized INT8 (QDQ) copy of the model"""
+    import onnxruntime as ort
+    from onnxruntime.quantization import (CalibrationDataReader, QuantFormat,
+                                          QuantType, quantize_static)
+    from core.image_processor import ImageProcessor
+    from utils.file_utils import iter_image_files
+    
+    input_name = ort.InferenceSession(
+        str(model_path), providers=['CPUExecutionProvider']
+    ).get_inputs()[0].name
+    
+    class ImageCalibrationReader(CalibrationDataReader):
+        """Feed calibration images through the inference preprocessing"""
+        
+        def __init__(self):
+            self.paths = islice(iter_image_files(calibration_dir, recursive=True), calibration_size)
+            self.count = 0
+        
+        def get_next(self) -> Optional[Dict[str, Any]]:
+            for image_path in self.paths:
+                try:
+                    image = ImageProcessor.load(image_path)
+                except ValueError:
+                    continue
+                self.count += 1
+                return {input_name: ImageProcessor.preprocess(image)}
+            return None
+    
+    reader = ImageCalibrationReader()
+    quantize_static(
+        str(model_path),
+        str(output_path),
+        reader,
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=per_channel
+    )
+    
+    if reader.count == 0:
+        raise ValueError(f"No usable calibration images in {calibration_dir}")
+    print_status("info", f"Calibrated on {reader.count} images")
+
+
+def measure_variant(model_path: str, config_path: str, variant: str, eval_dir: str,
+                    batch_size: int, latency_samples: int) -> Dict[str, Any]:
+    """
+    Evaluate one variant; runs in a fresh process so memory is comparable
+    
+    Returns:
+        Accuracy, latency and memory metrics
+    """
+    from core import ModelManager
+    from cli.evaluate import evaluate, iter_labelled_samples
+    from utils.memory import get_rss_mb
+    from utils.stats import LatencyStats
+    
+    rss_before = get_rss_mb()
+    load_start = time.perf_counter()
+    with contextlib.redirect_stdout(sys.stderr):
+        manager = ModelManager(Path(model_path), Path(config_path), variant=variant)
+    load_ms = (time.perf_counter() - load_start) * 1000
+    rss_loaded = get_rss_mb()
+    
+    metrics = evaluate(manager, Path(eval_dir), batch_size=batch_size, recursive=True)
+    
+    # Single-image latency, the interactive use case
+    latency = LatencyStats()
+    samples = islice(iter_labelled_samples(Path(eval_dir), recursive=True), latency_samples)
+    for image_path, _ in samples:
+        try:
+            _, inference_ms = manager.predict(image_path)
+        except RuntimeError:
+            continue
+        latency.add(inference_ms)
+    
+    metrics.update({
+        "model_file": str(manager.model_path),
+        "model_size_mb": manager.model_path.stat().st_size / (1024 * 1024),
+        "load_ms": load_ms,
+        "session_rss_mb": rss_loaded - rss_before,
+        "peak_rss_mb": get_rss_mb(),
+        "single_image_p50_ms": latency.percentile(50),
+        "single_image_p95_ms": latency.percentile(95)
+    })
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Produce INT8 model variants and compare them with FP32",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument("--model", type=Path, default=config.MODEL_PATH,
+                        help="Base FP32 model")
+    parser.add_argument("--config", type=Path, default=config.CONFIG_PATH)
+    parser.add_argument("--modes", nargs="*", choices=["dynamic", "static"], default=["dynamic"],
+                        help="Variants to produce (pass no value to skip quantization)")
+    parser.add_argument("--calibration", type=Path,
+                        help="Folder of sample images for static calibration")
+    parser.add_argument("--calibration-size", type=int, default=200,
+                        help="Maximum number of calibration images")
+    parser.add_argument("--per-channel", action="store_true",
+                        help="Quantize weights per channel")
+    parser.add_argument("--eval", type=Path, metavar="DIR",
+                        help="Labelled images for the accuracy/latency/memory comparison")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--latency-samples", type=int, default=100)
+    parser.add_argument("--report", type=Path, help="Write the comparison as JSON")
+    args = parser.parse_args()
+    
+    from core import ModelManager
+    
+    if not args.model.exists():
+        print_status("error", f"Model not found: {args.model}")
+        return 1
+    
+    for mode in args.modes:
+        variant = f"int8_{mode}"
+        output_path = ModelManager.variant_path(args.model, variant)
+        print_status("info", f"Creating {variant} variant: {output_path}")
+        
+        try:
+            if mode == "dynamic":
+                quantize_dynamic_variant(args.model, output_path, args.per_channel)
+            else:
+                if args.calibration is None:
+                    print_status("error", "Static quantization needs --calibration")
+                    return 1
+                quantize_static_variant(args.model, output_path, args.calibration,
+                                        args.calibration_size, args.per_channel)
+        except Exception as e:
+            print_status("error", f"Quantization failed: {e}")
+            return 1
+        
+        size_mb = output_path.stat().st_size / (1024 * 1024)
+        print_status("ok", f"{variant}: {size_mb:.2f} MB")
+    
+    if args.eval is None:
+        return 0
+    
+    variants = [v for v in ModelManager.MODEL_VARIANTS
+                if ModelManager.variant_path(args.model, v).exists()]
+    report = {}
+    context = multiprocessing.get_context("spawn")
+    for variant in variants:
+        print_status("info", f"Evaluating {variant}...")
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            report[variant] = executor.submit(
+                measure_variant, str(args.model), str(args.config), variant,
+                str(args.eval), args.batch_size, args.latency_samples
+            ).result()
+    
+    print()
+    print(f"{'variant':<14} {'size MB':>8} {'seq acc %':>10} {'char acc %':>11} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'images/s':>9} {'session MB':>11} {'peak MB':>8}")
+    for variant, m in report.items():
+        print(f"{variant:<14} {m['model_size_mb']:>8.1f} {m['sequence_accuracy']:>10.2f} "
+              f"{m['character_accuracy']:>11.2f} {m['single_image_p50_ms']:>8.2f} "
+              f"{m['single_image_p95_ms']:>8.2f} {m['images_per_second']:>9.1f} "
+              f"{m['session_rss_mb']:>11.1f} {m['peak_rss_mb']:>8.1f}")
+    
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print_status("ok", f"Report written to {args.report}")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""
+Background batch inference for dropped files and folders
+"""
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import TYPE_CHECKING, Deque, List, Optional
+
+from PySide6.QtCore import QThread, Signal
+
+if TYPE_CHECKING:
+    from core import ModelManager
+
+
+class BatchWorker(QThread):
+    """Long-lived worker thread that runs batches through predict_batch
+    
+    Every submit() queues a job of image and folder paths. Jobs run one
+    after the other; folders are expanded on this thread, so dropping a
+    folder with many thousands of images does not block the GUI. Results
+    are emitted one chunk at a time as rows with the same fields as the
+    headless batch mode.
+    """
+    
+    rows_ready = Signal(list)  # Result rows of one chunk
+    progress = Signal(int, int, int, float)  # processed, total found, errors, images per second
+    idle = Signal()  # Every queued job has finished or was cancelled
+    
+    DEFAULT_BATCH_SIZE = 32
+    
+    def __init__(self, model_manager: Optional["ModelManager"] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Initialize batch worker
+        
+        Args:
+            model_manager: Loaded model, or None until it is ready
+            batch_size: Images per predict_batch call and per emitted chunk
+        """
+        super().__init__()
+        self.model_manager = model_manager
+        self.batch_size = batch_size
+        self._jobs: Deque[List[str]] = deque()
+        self._condition = threading.Condition()
+        self._cancelled = False
+        self._stopping = False
+        self._reset_counters()
+    
+    @property
+    def pending_jobs(self) -> int:
+        """Jobs waiting to start"""
+        with self._condition:
+            return len(self._jobs)
+    
+    def submit(self, sources: List[str]):
+        """
+        Queue image files and folders for batch inference
+        
+        Args:
+            sources: Image paths and folder paths (folders are searched recursively)
+        """
+        with self._condition:
+            self._jobs.append(list(sources))
+            self._condition.notify()
+    
+    def cancel(self):
+        """Drop queued jobs and stop the running one after its current chunk"""
+        with self._condition:
+            self._jobs.clear()
+            self._cancelled = True
+    
+    def stop(self):
+        """Cancel everything and wait for the thread to finish"""
+        with self._condition:
+            self._jobs.clear()
+            self._cancelled = True
+            self._stopping = True
+            self._condition.notify()
+        self.wait()
+    
+    def run(self):
+        """Run queued jobs until stopped"""
+        while True:
+            with self._condition:
+                while not self._jobs and not self._stopping:
+                    self._condition.wait()
+                if self._stopping:
+                    return
+                sources = self._jobs.popleft()
+                self._cancelled = False
+                if self._started is None:
+                    self._started = time.perf_counter()
+            
+            self._run_job(sources)
+            
+            with self._condition:
+                drained = not self._jobs
+                if drained:
+                    self._reset_counters()
+            if drained:
+                self.idle.emit()
+    
+    def _run_job(self, sources: List[str]):
+        """Expand one job's sources and predict them chunk by chunk"""
+        from cli.batch import chunked, iter_inputs, result_rows
+        
+        paths = []
+        for source in sources:
+            paths.extend(iter_inputs(source, recursive=True) if Path(source).is_dir() else [source])
+            if self._cancelled:
+                return
+        self._total += len(paths)
+        self._emit_progress()
+        
+        for chunk in chunked(paths, self.batch_size):
+            if self._cancelled:
+                return
+            
+            try:
+                result = self.model_manager.predict_batch(chunk, batch_size=self.batch_size)
+                rows = result_rows(chunk, result)
+            except Exception as e:
+                rows = [{"path": image_path, "text": None, "error": str(e), "batch_ms": None}
+                        for image_path in chunk]
+            
+            self._processed += len(rows)
+            self._errors += sum(1 for row in rows if row["error"] is not None)
+            self.rows_ready.emit(rows)
+            self._emit_progress()
+    
+    def _emit_progress(self):
+        elapsed = time.perf_counter() - self._started if self._started is not None else 0.0
+        throughput = self._processed / elapsed if elapsed > 0 else 0.0
+        self.progress.emit(self._processed, self._total, self._errors, throughput)
+    
+    def _reset_counters(self):
+        # Counters cover one busy period: from the first job after idle
+        # until the queue drains
+        self._processed = 0
+        self._total = 0
+        self._errors = 0
+        self._started: Optional[float] = None
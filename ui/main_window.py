@@ -4,21 +4,32 @@ Main application window
 from PySide6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QTabWidget
 from PySide6.QtCore import Qt, QSettings
 from PySide6.QtGui import QFont
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
-from ui.tabs.home_tab import HomeTab
-from ui.tabs.about_tab import AboutTab
-from ui.tabs.architecture_tab import ArchitectureTab
-from ui.tabs.inference_tab import InferenceTab
-from core import ModelManager
+from ui.widgets import AsyncImageLabel, LazyTab
+from utils import logger
 import config
 
+# The model is loaded in the background; importing core here would put
+# NumPy and PIL on the path to the first window
+if TYPE_CHECKING:
+    from core import ModelManager
+
 
 class MainWindow(QMainWindow):
     """Main application window"""
     
-    def __init__(self, model_manager: ModelManager):
+    def __init__(self, model_manager: Optional["ModelManager"] = None):
+        """
+        Initialize main window
+        
+        Args:
+            model_manager: Loaded model, or None while it is still loading
+                (see set_model_manager)
+        """
         super().__init__()
         self.model_manager = model_manager
+        self.model_error: Optional[str] = None
         self.settings = QSettings("UltraCaptureV3", "UltraCaptureV3")
         
         self.setWindowTitle(f"{config.APP_NAME} v{config.APP_VERSION}")
@@ -66,16 +77,20 @@ class MainWindow(QMainWindow):
             }
         """)
         
-        # Create tabs
-        self.home_tab = HomeTab()
-        self.about_tab = AboutTab()
-        self.architecture_tab = ArchitectureTab()
-        self.inference_tab = InferenceTab(self.model_manager)
+        # Create tabs; each one is built the first time it is shown
+        self.tabs: Dict[str, LazyTab] = {}
+        self.tab_timings: Dict[str, Dict[str, Any]] = {}
+        for name, factory in (("Home", self.create_home_tab),
+                              ("About", self.create_about_tab),
+                              ("Architecture", self.create_architecture_tab),
+                              ("Inference", self.create_inference_tab)):
+            page = LazyTab(factory)
+            page.built.connect(lambda content, build_ms, name=name: self.on_tab_built(name, content, build_ms))
+            self.tabs[name] = page
+            self.tab_widget.addTab(page, name)
         
-        self.tab_widget.addTab(self.home_tab, "Home")
-        self.tab_widget.addTab(self.about_tab, "About")
-        self.tab_widget.addTab(self.architecture_tab, "Architecture")
-        self.tab_widget.addTab(self.inference_tab, "Inference")
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
+        self.on_tab_changed(self.tab_widget.currentIndex())
         
         main_layout.addWidget(self.tab_widget)
         
@@ -84,6 +99,123 @@ class MainWindow(QMainWindow):
         # Apply stylesheet
         self.apply_stylesheet()
     
+    def create_home_tab(self):
+        """Build the Home tab"""
+        from ui.tabs.home_tab import HomeTab
+        return HomeTab()
+    
+    def create_about_tab(self):
+        """Build the About tab"""
+        from ui.tabs.about_tab import AboutTab
+        return AboutTab()
+    
+    def create_architecture_tab(self):
+        """Build the Architecture tab"""
+        from ui.tabs.architecture_tab import ArchitectureTab
+        return ArchitectureTab()
+    
+    def create_inference_tab(self):
+        """Build the Inference tab with the current model state"""
+        from ui.tabs.inference_tab import InferenceTab
+        tab = InferenceTab(self.model_manager)
+        if self.model_manager is None and self.model_error:
+            tab.set_model_error(self.model_error)
+        return tab
+    
+    @property
+    def home_tab(self):
+        """Home tab, or None until it is first shown"""
+        return self.tabs["Home"].content
+    
+    @property
+    def about_tab(self):
+        """About tab, or None until it is first shown"""
+        return self.tabs["About"].content
+    
+    @property
+    def architecture_tab(self):
+        """Architecture tab, or None until it is first shown"""
+        return self.tabs["Architecture"].content
+    
+    @property
+    def inference_tab(self):
+        """Inference tab, or None until it is first shown"""
+        return self.tabs["Inference"].content
+    
+    def on_tab_changed(self, index: int):
+        """Build the newly selected tab on first activation"""
+        page = self.tab_widget.widget(index)
+        if isinstance(page, LazyTab):
+            page.ensure_built()
+    
+    def on_tab_built(self, name: str, content: QWidget, build_ms: float):
+        """Record how long a tab and its images took to load"""
+        images = content.findChildren(AsyncImageLabel)
+        self.tab_timings[name] = {
+            "build_ms": build_ms,
+            "images": len(images),
+            "images_loaded": 0,
+            "images_cached": 0,
+            "images_ms": 0.0
+        }
+        logger.info(f"Built {name} tab in {build_ms:.1f} ms ({len(images)} image(s) loading)")
+        
+        for image in images:
+            image.loaded.connect(
+                lambda elapsed_ms, cached, name=name: self.on_tab_image_loaded(name, elapsed_ms, cached)
+            )
+    
+    def on_tab_image_loaded(self, name: str, elapsed_ms: float, cached: bool):
+        """Add one background image load to a tab's timings"""
+        timings = self.tab_timings[name]
+        timings["images_loaded"] += 1
+        timings["images_cached"] += int(cached)
+        timings["images_ms"] += elapsed_ms
+        
+        if timings["images_loaded"] == timings["images"]:
+            logger.info(
+                f"Loaded {name} tab images in {timings['images_ms']:.1f} ms "
+                f"({timings['images_cached']}/{timings['images']} from thumbnail cache)"
+            )
+    
+    def startup_report(self) -> str:
+        """
+        Summarize per-tab startup costs
+        
+        Returns:
+            Table of GUI-thread build time and background image time per tab
+        """
+        lines = [f"{'tab':<14} {'build ms':>9} {'images':>7} {'image ms':>9} {'cached':>7}"]
+        for name in self.tabs:
+            timings = self.tab_timings.get(name)
+            if timings is None:
+                lines.append(f"{name:<14} {'not built':>9}")
+                continue
+            lines.append(
+                f"{name:<14} {timings['build_ms']:>9.1f} "
+                f"{timings['images_loaded']:>3}/{timings['images']:<3} "
+                f"{timings['images_ms']:>9.1f} {timings['images_cached']:>7}"
+            )
+        return "\n".join(lines)
+    
+    def inference_queue_depth(self) -> int:
+        """Predictions queued or running in the Inference tab"""
+        if self.inference_tab is None:
+            return 0
+        return self.inference_tab.inference_worker.queue_depth
+    
+    def set_model_manager(self, model_manager: "ModelManager"):
+        """Hand over the model once background loading has finished"""
+        self.model_manager = model_manager
+        if self.inference_tab is not None:
+            self.inference_tab.set_model_manager(model_manager)
+    
+    def set_model_error(self, message: str):
+        """Show that background model loading failed"""
+        self.model_error = message
+        if self.inference_tab is not None:
+            self.inference_tab.set_model_error(message)
+    
     def apply_stylesheet(self):
         """Apply QSS stylesheet"""
         try:
@@ -98,5 +230,9 @@ class MainWindow(QMainWindow):
         # Save window geometry
         self.settings.setValue("geometry", self.saveGeometry())
         self.settings.setValue("windowState", self.saveState())
+        
+        # Stop the inference worker thread before the window is destroyed
+        if self.inference_tab is not None:
+            self.inference_tab.shutdown()
         event.accept()
 
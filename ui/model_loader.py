@@ -0,0 +1,45 @@
+"""
+Background model loading
+"""
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from PySide6.QtCore import QThread, Signal
+
+
+class ModelLoader(QThread):
+    """Worker thread that builds and warms up the ModelManager
+    
+    Loading the ONNX session takes seconds for the full model, so it runs
+    here while the window is already on screen.
+    """
+    
+    model_loaded = Signal(object, float)  # ModelManager, load + warm-up time in ms
+    load_failed = Signal(str)  # error message
+    
+    def __init__(self, model_path: Path, config_path: Path,
+                 manager_options: Optional[Dict[str, Any]] = None):
+        super().__init__()
+        self.model_path = model_path
+        self.config_path = config_path
+        self.manager_options = manager_options or {}
+    
+    def run(self):
+        """Load the model in the background thread"""
+        try:
+            start_time = time.perf_counter()
+            
+            # Imported on this thread so NumPy, PIL and onnxruntime load
+            # while the window is already responsive
+            from core import ModelManager
+            model_manager = ModelManager(self.model_path, self.config_path, **self.manager_options)
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
+            
+            if not model_manager.is_ready():
+                self.load_failed.emit("Model failed to load")
+                return
+            
+            self.model_loaded.emit(model_manager, elapsed_ms)
+        except Exception as e:
+            self.load_failed.emit(str(e))
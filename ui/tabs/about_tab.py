@@ -4,10 +4,11 @@ About tab - Project information and metrics
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QScrollArea, 
                                QPushButton, QTableWidget, QTableWidgetItem, QFrame)
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QFont, QPixmap
+from PySide6.QtGui import QFont
 import webbrowser
 from pathlib import Path
 
+from ui.widgets import AsyncImageLabel
 import config
 
 
@@ -199,11 +200,8 @@ class AboutTab(QWidget):
             metrics_img_layout.setContentsMargins(10, 10, 10, 10)
             metrics_img_layout.setSpacing(10)
 
-            metrics_img_label = QLabel()
-            pixmap = QPixmap(str(config.TRAINING_METRICS))
-            pixmap = pixmap.scaledToWidth(1100, Qt.TransformationMode.SmoothTransformation)
-            metrics_img_label.setPixmap(pixmap)
-            metrics_img_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            # Decoded and scaled in the background
+            metrics_img_label = AsyncImageLabel(config.TRAINING_METRICS, 1100)
             metrics_img_layout.addWidget(metrics_img_label)
 
             # Add description below the image
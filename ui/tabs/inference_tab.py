@@ -2,44 +2,185 @@
 Inference tab - Live CAPTCHA prediction interface
 """
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
-                               QScrollArea, QProgressBar)
+                               QScrollArea, QProgressBar, QFileDialog)
 from PySide6.QtCore import Qt, QThread, Signal
 from PySide6.QtGui import QFont, QPixmap
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Optional
 
-from ui.widgets import ImageUploadWidget, PredictionDisplay
-from core import ModelManager
+from ui.widgets import ImageUploadWidget, PredictionDisplay, BatchResultsView
+from ui.batch_worker import BatchWorker
+from ui.watch_worker import WatchWorker
+from core import ModelManager, PredictionResult
 import config
 
 
+@dataclass
+class InferenceRequest:
+    """One prediction waiting for the worker"""
+    request_id: int
+    image_path: str
+    key: tuple
+
+
 class InferenceWorker(QThread):
-    """Worker thread for model inference"""
+    """Long-lived worker thread that runs queued predictions
+    
+    The tab only shows the newest prediction, so submitting a request
+    cancels every request still waiting in the queue. A request for the
+    same unchanged image as one already queued or running is merged into
+    it instead of running again. Results carry the id of the request they
+    answer, so the tab can drop results superseded by a newer request.
+    """
     
-    prediction_ready = Signal(str, float)  # prediction, time
-    error_occurred = Signal(str)  # error message
+    prediction_ready = Signal(int, object)  # request id, PredictionResult
+    error_occurred = Signal(int, str)  # request id, error message
+    queue_changed = Signal(int)  # requests queued or running
     
-    def __init__(self, model_manager: ModelManager, image_path: str):
+    def __init__(self, model_manager: Optional[ModelManager] = None):
         super().__init__()
         self.model_manager = model_manager
-        self.image_path = image_path
+        self.coalesced = 0
+        self.cancelled = 0
+        self._queue: Deque[InferenceRequest] = deque()
+        self._running: Optional[InferenceRequest] = None
+        self._next_id = 0
+        self._stopping = False
+        self._condition = threading.Condition()
+    
+    @property
+    def queue_depth(self) -> int:
+        """Requests queued or running"""
+        with self._condition:
+            return self._depth()
+    
+    def submit(self, image_path: str) -> int:
+        """
+        Queue a prediction
+        
+        Args:
+            image_path: Image to predict
+        
+        Returns:
+            Request id that the result will carry
+        """
+        key = self._request_key(image_path)
+        with self._condition:
+            self._next_id += 1
+            request_id = self._next_id
+            
+            match = next((request for request in (self._running, *self._queue)
+                          if request is not None and request.key == key), None)
+            
+            # Everything still waiting is superseded by this request
+            self.cancelled += sum(1 for request in self._queue if request is not match)
+            self._queue.clear()
+            
+            if match is not None:
+                # Retag the identical request so its result answers this one
+                match.request_id = request_id
+                self.coalesced += 1
+                if match is not self._running:
+                    self._queue.append(match)
+            else:
+                self._queue.append(InferenceRequest(request_id, image_path, key))
+            
+            depth = self._depth()
+            self._condition.notify()
+        
+        self.queue_changed.emit(depth)
+        return request_id
+    
+    def cancel_pending(self):
+        """Drop every queued request (a running one finishes, but its result is stale)"""
+        with self._condition:
+            self.cancelled += len(self._queue)
+            self._queue.clear()
+            depth = self._depth()
+        self.queue_changed.emit(depth)
+    
+    def stop(self):
+        """Drop queued requests and wait for the thread to finish"""
+        with self._condition:
+            self._stopping = True
+            self._queue.clear()
+            self._condition.notify()
+        self.wait()
     
     def run(self):
-        """Run inference in background thread"""
+        """Run queued predictions until stopped"""
+        while True:
+            with self._condition:
+                while not self._queue and not self._stopping:
+                    self._condition.wait()
+                if self._stopping:
+                    return
+                request = self._queue.popleft()
+                self._running = request
+            
+            result, error = None, None
+            try:
+                result = self.model_manager.predict(request.image_path)
+            except Exception as e:
+                error = str(e)
+            
+            with self._condition:
+                # Read the id only now: the request may have been retagged
+                request_id = request.request_id
+                self._running = None
+                depth = self._depth()
+            
+            if error is None:
+                self.prediction_ready.emit(request_id, result)
+            else:
+                self.error_occurred.emit(request_id, error)
+            self.queue_changed.emit(depth)
+    
+    def _depth(self) -> int:
+        return len(self._queue) + (self._running is not None)
+    
+    @staticmethod
+    def _request_key(image_path: str) -> tuple:
+        """Identify an image by path, size and modification time"""
+        path = os.path.abspath(image_path)
         try:
-            prediction, inference_time = self.model_manager.predict(self.image_path)
-            self.prediction_ready.emit(prediction, inference_time)
-        except Exception as e:
-            self.error_occurred.emit(str(e))
+            stat = os.stat(path)
+            return path, stat.st_size, stat.st_mtime_ns
+        except OSError:
+            return path, None, None
 
 
 class InferenceTab(QWidget):
     """Inference tab with live prediction"""
     
-    def __init__(self, model_manager: ModelManager):
+    def __init__(self, model_manager: Optional[ModelManager] = None):
         super().__init__()
         self.model_manager = model_manager
         self.current_image_path = None
-        self.inference_worker = None
+        self.latest_request_id: Optional[int] = None
+        self.stale_results = 0
+        self.watch_worker: Optional[WatchWorker] = None
         self.init_ui()
+        
+        # One worker for the lifetime of the tab
+        self.inference_worker = InferenceWorker(model_manager)
+        self.inference_worker.prediction_ready.connect(self.on_prediction_ready)
+        self.inference_worker.error_occurred.connect(self.on_inference_error)
+        self.inference_worker.queue_changed.connect(self.on_queue_changed)
+        self.inference_worker.start()
+        
+        # Batches of dropped images and folders run on their own worker
+        self.batch_worker = BatchWorker(model_manager)
+        self.batch_worker.rows_ready.connect(self.on_batch_rows)
+        self.batch_worker.progress.connect(self.batch_view.update_progress)
+        self.batch_worker.idle.connect(self.on_batch_idle)
+        self.batch_worker.start()
+        
+        if model_manager is None:
+            self.show_loading()
     
     def init_ui(self):
         """Initialize UI"""
@@ -68,8 +209,16 @@ class InferenceTab(QWidget):
         # Image upload widget
         self.upload_widget = ImageUploadWidget()
         self.upload_widget.image_loaded.connect(self.on_image_loaded)
+        self.upload_widget.images_loaded.connect(self.on_images_loaded)
         scroll_layout.addWidget(self.upload_widget)
         
+        # Watch a folder for new images
+        self.watch_btn = QPushButton("Watch Folder")
+        self.watch_btn.setMinimumHeight(40)
+        self.watch_btn.setFont(QFont("Courier New", 12, QFont.Bold))
+        self.watch_btn.clicked.connect(self.on_watch_clicked)
+        scroll_layout.addWidget(self.watch_btn)
+        
         # Image preview
         self.image_preview = QLabel()
         self.image_preview.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -77,12 +226,20 @@ class InferenceTab(QWidget):
         self.image_preview.setMinimumHeight(200)
         scroll_layout.addWidget(self.image_preview)
         
+        # Model loading status, shown until the model is ready
+        self.status_label = QLabel()
+        self.status_label.setFont(QFont("Courier New", 12))
+        self.status_label.setStyleSheet("color: #0096FF;")
+        self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.status_label.setVisible(False)
+        scroll_layout.addWidget(self.status_label)
+        
         # Predict button
-        predict_btn = QPushButton("Predict CAPTCHA")
-        predict_btn.setMinimumHeight(50)
-        predict_btn.setFont(QFont("Courier New", 14, QFont.Bold))
-        predict_btn.clicked.connect(self.on_predict_clicked)
-        scroll_layout.addWidget(predict_btn)
+        self.predict_btn = QPushButton("Predict CAPTCHA")
+        self.predict_btn.setMinimumHeight(50)
+        self.predict_btn.setFont(QFont("Courier New", 14, QFont.Bold))
+        self.predict_btn.clicked.connect(self.on_predict_clicked)
+        scroll_layout.addWidget(self.predict_btn)
         
         # Progress bar
         self.progress_bar = QProgressBar()
@@ -102,6 +259,14 @@ class InferenceTab(QWidget):
         self.progress_bar.setVisible(False)
         scroll_layout.addWidget(self.progress_bar)
         
+        # Inference queue depth, shown while requests are pending
+        self.queue_label = QLabel()
+        self.queue_label.setFont(QFont("Courier New", 11))
+        self.queue_label.setStyleSheet("color: #6b7280;")
+        self.queue_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.queue_label.setVisible(False)
+        scroll_layout.addWidget(self.queue_label)
+        
         # Prediction display
         self.prediction_display = PredictionDisplay()
         scroll_layout.addWidget(self.prediction_display)
@@ -138,6 +303,13 @@ class InferenceTab(QWidget):
         clear_btn.clicked.connect(self.on_clear_clicked)
         scroll_layout.addWidget(clear_btn)
         
+        # Batch results, shown once the first batch starts
+        self.batch_view = BatchResultsView()
+        self.batch_view.cancel_requested.connect(self.on_batch_cancel)
+        self.batch_view.clear_requested.connect(self.on_batch_clear)
+        self.batch_view.setVisible(False)
+        scroll_layout.addWidget(self.batch_view)
+        
         scroll_layout.addStretch()
         
         scroll_widget.setLayout(scroll_layout)
@@ -146,6 +318,33 @@ class InferenceTab(QWidget):
         main_layout.addWidget(scroll_area)
         self.setLayout(main_layout)
     
+    def show_loading(self):
+        """Show the loading state while the model loads in the background"""
+        self.status_label.setText("Loading model... Images can be selected in the meantime.")
+        self.status_label.setVisible(True)
+        self.predict_btn.setEnabled(False)
+        
+        # Indeterminate progress until the model is ready
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setVisible(True)
+    
+    def set_model_manager(self, model_manager: ModelManager):
+        """Leave the loading state once the model is ready"""
+        self.model_manager = model_manager
+        self.inference_worker.model_manager = model_manager
+        self.batch_worker.model_manager = model_manager
+        self.status_label.setVisible(False)
+        self.predict_btn.setEnabled(True)
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setVisible(False)
+    
+    def set_model_error(self, message: str):
+        """Show that the model could not be loaded"""
+        self.status_label.setVisible(False)
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setVisible(False)
+        self.show_error(f"Model failed to load: {message}")
+    
     def on_image_loaded(self, image_path: str):
         """Handle image loaded signal"""
         self.current_image_path = image_path
@@ -159,46 +358,144 @@ class InferenceTab(QWidget):
         self.error_label.setVisible(False)
         self.prediction_display.clear()
     
+    def on_images_loaded(self, paths: list):
+        """Queue dropped images and folders as a batch"""
+        if self.model_manager is None or not self.model_manager.is_ready():
+            self.show_error("Model is not ready")
+            return
+        
+        self.error_label.setVisible(False)
+        self.batch_view.setVisible(True)
+        self.batch_view.set_running(True)
+        self.batch_worker.submit(paths)
+    
+    def on_batch_rows(self, rows: list):
+        """Append a chunk of batch results"""
+        # A chunk that was running when the results were cleared
+        if not self.batch_view.isHidden():
+            self.batch_view.model.append_rows(rows)
+    
+    def on_batch_idle(self):
+        """Handle the end of all queued batches"""
+        self.batch_view.set_running(self.watch_worker is not None)
+    
+    def on_batch_cancel(self):
+        """Stop the running batch after its current chunk, and stop watching"""
+        self.batch_worker.cancel()
+        self.stop_watching()
+    
+    def on_batch_clear(self):
+        """Cancel running batches, stop watching and remove the results"""
+        self.batch_worker.cancel()
+        self.stop_watching()
+        self.batch_view.clear()
+        self.batch_view.setVisible(False)
+    
+    def on_watch_clicked(self):
+        """Start watching a folder, or stop watching"""
+        if self.watch_worker is not None:
+            self.stop_watching()
+            return
+        
+        if self.model_manager is None or not self.model_manager.is_ready():
+            self.show_error("Model is not ready")
+            return
+        
+        folder_path = QFileDialog.getExistingDirectory(self, "Select Folder to Watch")
+        if not folder_path:
+            return
+        
+        self.error_label.setVisible(False)
+        self.batch_view.setVisible(True)
+        self.batch_view.set_running(True)
+        
+        self.watch_worker = WatchWorker(self.model_manager, folder_path)
+        self.watch_worker.rows_ready.connect(self.on_batch_rows)
+        self.watch_worker.progress.connect(self.batch_view.update_progress)
+        self.watch_worker.watch_failed.connect(self.on_watch_failed)
+        self.watch_worker.start()
+        self.watch_btn.setText(f"Stop Watching {folder_path}")
+    
+    def on_watch_failed(self, message: str):
+        """Handle a folder that cannot be watched"""
+        self.stop_watching()
+        self.show_error(f"Watch error: {message}")
+    
+    def stop_watching(self):
+        """Stop the watch worker, if any"""
+        if self.watch_worker is None:
+            return
+        
+        self.watch_worker.stop()
+        self.watch_worker = None
+        self.watch_btn.setText("Watch Folder")
+        self.batch_view.set_running(self.batch_worker.pending_jobs > 0)
+    
     def on_predict_clicked(self):
         """Handle predict button click"""
         if not self.current_image_path:
             self.show_error("Please select an image first")
             return
         
-        if not self.model_manager.is_ready():
+        if self.model_manager is None or not self.model_manager.is_ready():
             self.show_error("Model is not ready")
             return
         
-        # Show progress
-        self.progress_bar.setVisible(True)
-        self.progress_bar.setValue(0)
         self.error_label.setVisible(False)
         
-        # Start inference in background thread
-        self.inference_worker = InferenceWorker(self.model_manager, self.current_image_path)
-        self.inference_worker.prediction_ready.connect(self.on_prediction_ready)
-        self.inference_worker.error_occurred.connect(self.on_inference_error)
-        self.inference_worker.start()
+        # Queue on the background worker; older pending requests are cancelled
+        self.latest_request_id = self.inference_worker.submit(self.current_image_path)
+    
+    def on_queue_changed(self, depth: int):
+        """Show progress and queue depth while requests are pending"""
+        self.queue_label.setText(f"Requests in queue: {depth}")
+        self.queue_label.setVisible(depth > 0)
+        
+        # The progress bar doubles as the loading indicator until the model is ready
+        if self.status_label.isHidden():
+            self.progress_bar.setRange(0, 0)
+            self.progress_bar.setVisible(depth > 0)
     
-    def on_prediction_ready(self, prediction: str, inference_time: float):
+    def on_prediction_ready(self, request_id: int, result: PredictionResult):
         """Handle prediction ready signal"""
-        self.progress_bar.setVisible(False)
-        self.prediction_display.update_prediction(prediction, inference_time)
+        if request_id != self.latest_request_id:
+            # Superseded by a newer request or cleared
+            self.stale_results += 1
+            return
+        
+        self.prediction_display.update_prediction(
+            result.text,
+            result.inference_ms,
+            breakdown=result.breakdown_ms(),
+            rolling=self.model_manager.stage_stats.summary()
+        )
         self.error_label.setVisible(False)
     
-    def on_inference_error(self, error_msg: str):
+    def on_inference_error(self, request_id: int, error_msg: str):
         """Handle inference error"""
-        self.progress_bar.setVisible(False)
+        if request_id != self.latest_request_id:
+            self.stale_results += 1
+            return
+        
         self.show_error(f"Inference error: {error_msg}")
     
     def on_clear_clicked(self):
         """Handle clear button click"""
         self.current_image_path = None
+        self.latest_request_id = None
+        self.inference_worker.cancel_pending()
         self.image_preview.clear()
         self.image_preview.setText("")
         self.prediction_display.clear()
         self.error_label.setVisible(False)
-        self.progress_bar.setVisible(False)
+        # Keep the loading indicator while the model is still loading
+        self.progress_bar.setVisible(not self.status_label.isHidden())
+    
+    def shutdown(self):
+        """Stop the inference, batch and watch workers"""
+        self.inference_worker.stop()
+        self.batch_worker.stop()
+        self.stop_watching()
     
     def show_error(self, message: str):
         """Show error message"""
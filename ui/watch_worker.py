@@ -0,0 +1,102 @@
+"""
+Background watch-folder inference for the GUI
+"""
+import hashlib
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from PySide6.QtCore import QThread, Signal
+
+from utils import logger
+import config
+
+if TYPE_CHECKING:
+    from core import ModelManager
+
+
+class WatchWorker(QThread):
+    """Worker thread that predicts new and changed images in a folder
+    
+    Uses the same FolderWatcher as the headless --watch mode. Results are
+    emitted one batch at a time and appended to a JSON Lines log in the
+    watched folder. The file index is kept in the cache directory, so
+    watching the same folder again skips images already processed.
+    """
+    
+    rows_ready = Signal(list)  # Result rows of one batch
+    progress = Signal(int, int, int, float)  # processed, processed + waiting, errors, images per second
+    watch_failed = Signal(str)  # Error message
+    
+    def __init__(self, model_manager: "ModelManager", directory: str,
+                 batch_size: int = 32, max_backlog: int = 1024):
+        """
+        Initialize watch worker
+        
+        Args:
+            model_manager: Loaded model
+            directory: Folder to watch (subfolders included)
+            batch_size: Maximum images per predict_batch call
+            max_backlog: Maximum images waiting for inference
+        """
+        super().__init__()
+        self.model_manager = model_manager
+        self.directory = Path(directory)
+        self.batch_size = batch_size
+        self.max_backlog = max_backlog
+        self.log_path = self.directory / config.WATCH_RESULTS_FILE
+        self._stopping = threading.Event()
+    
+    def stop(self):
+        """Stop watching and wait for the thread to finish"""
+        self._stopping.set()
+        self.wait()
+    
+    def run(self):
+        """Watch until stopped"""
+        from cli.watch import FolderWatcher, open_results_log
+        from cli.batch import result_rows
+        
+        digest = hashlib.blake2b(str(self.directory.resolve()).encode("utf-8"), digest_size=16).hexdigest()
+        watcher = FolderWatcher(self.directory, recursive=True, max_backlog=self.max_backlog,
+                                index_path=config.CACHE_DIR / "watch" / f"{digest}.json")
+        try:
+            watcher.start()
+        except ValueError as e:
+            self.watch_failed.emit(str(e))
+            return
+        
+        try:
+            stream, writer = open_results_log(str(self.log_path), "jsonl")
+        except OSError as e:
+            logger.warning(f"Not writing a results log for {self.directory}: {e}")
+            stream, writer = None, None
+        
+        processed = 0
+        errors = 0
+        start_time = time.perf_counter()
+        try:
+            while not self._stopping.is_set():
+                paths = watcher.next_batch(self.batch_size)
+                if paths:
+                    try:
+                        rows = result_rows(paths, self.model_manager.predict_batch(paths, self.batch_size))
+                    except Exception as e:
+                        rows = [{"path": path, "text": None, "error": str(e), "batch_ms": None}
+                                for path in paths]
+                    if writer is not None:
+                        writer.write(rows)
+                    watcher.mark_done(paths)
+                    
+                    processed += len(rows)
+                    errors += sum(1 for row in rows if row["error"] is not None)
+                    self.rows_ready.emit(rows)
+                
+                elapsed = time.perf_counter() - start_time
+                self.progress.emit(processed, processed + watcher.backlog, errors,
+                                   processed / elapsed if elapsed > 0 else 0.0)
+        finally:
+            watcher.stop(timeout=5)
+            if stream is not None:
+                stream.close()
@@ -3,6 +3,10 @@ from .metric_card import MetricCard
 from .profile_card import ProfileCard
 from .image_upload_widget import ImageUploadWidget
 from .prediction_display import PredictionDisplay
+from .async_image_label import AsyncImageLabel
+from .lazy_tab import LazyTab
+from .batch_results import BatchResultsModel, BatchResultsView
 
-__all__ = ['MetricCard', 'ProfileCard', 'ImageUploadWidget', 'PredictionDisplay']
+__all__ = ['MetricCard', 'ProfileCard', 'ImageUploadWidget', 'PredictionDisplay', 'AsyncImageLabel', 'LazyTab',
+           'BatchResultsModel', 'BatchResultsView']
 
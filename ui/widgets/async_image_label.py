@@ -0,0 +1,84 @@
+"""
+Image label that loads its image off the GUI thread
+"""
+import time
+from pathlib import Path
+
+from PySide6.QtWidgets import QLabel
+from PySide6.QtCore import Qt, QObject, QRunnable, QThreadPool, Signal
+from PySide6.QtGui import QImage, QPixmap
+
+from utils.image_utils import load_thumbnail
+import config
+
+
+class _ThumbnailSignals(QObject):
+    """Signals of a thumbnail task (QRunnable cannot emit signals itself)"""
+    
+    finished = Signal(object, float, bool)  # QImage or None, load time in ms, cache hit
+
+
+class _ThumbnailTask(QRunnable):
+    """Decode and scale one image on the thread pool"""
+    
+    def __init__(self, image_path: Path, width: int, signals: _ThumbnailSignals):
+        super().__init__()
+        self.image_path = image_path
+        self.width = width
+        self.signals = signals
+    
+    def run(self):
+        start_time = time.perf_counter()
+        try:
+            image, cached = load_thumbnail(self.image_path, self.width, config.THUMBNAIL_CACHE_DIR)
+        except Exception as e:
+            print(f"Error loading image: {e}")
+            image, cached = None, False
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        
+        try:
+            self.signals.finished.emit(image, elapsed_ms, cached)
+        except RuntimeError:
+            # The label was destroyed while the image was loading
+            pass
+
+
+class AsyncImageLabel(QLabel):
+    """Label showing an image scaled to a fixed width
+    
+    Decoding and scaling run on the global thread pool and pre-scaled
+    copies are kept in config.THUMBNAIL_CACHE_DIR, so building the label
+    costs almost nothing on the GUI thread. Only the final QImage to
+    QPixmap conversion happens there.
+    """
+    
+    loaded = Signal(float, bool)  # Emits load time in ms and whether the thumbnail cache was hit
+    
+    def __init__(self, image_path: Path, width: int):
+        """
+        Initialize image label and start loading
+        
+        Args:
+            image_path: Image to show
+            width: Display width in pixels
+        """
+        super().__init__()
+        self.image_path = Path(image_path)
+        self.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.setText("[Loading...]")
+        self.setStyleSheet("color: #00CCFF;")
+        
+        self._signals = _ThumbnailSignals(self)
+        self._signals.finished.connect(self.on_image_loaded)
+        QThreadPool.globalInstance().start(_ThumbnailTask(self.image_path, width, self._signals))
+    
+    def on_image_loaded(self, image: QImage, elapsed_ms: float, cached: bool):
+        """Show the loaded image (runs on the GUI thread)"""
+        if image is None:
+            self.setText("[Image Not Found]")
+            self.setStyleSheet("color: #FF3366;")
+        else:
+            self.setStyleSheet("")
+            self.setPixmap(QPixmap.fromImage(image))
+        
+        self.loaded.emit(elapsed_ms, cached)
@@ -0,0 +1,249 @@
+"""
+Batch results table backed by a QAbstractTableModel
+"""
+from PySide6.QtWidgets import (QFrame, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QProgressBar,
+                               QTableView, QHeaderView, QAbstractItemView, QFileDialog)
+from PySide6.QtCore import Qt, Signal, QAbstractTableModel, QModelIndex
+from PySide6.QtGui import QFont, QColor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class BatchResultsModel(QAbstractTableModel):
+    """Table model over batch result rows
+    
+    Rows are kept in flat per-column lists rather than one object or
+    widget per row, and the view asks only for the visible cells, so
+    hundreds of thousands of rows stay cheap to hold and to scroll.
+    """
+    
+    COLUMNS = ("File", "Prediction", "Error", "Batch ms")
+    
+    def __init__(self):
+        super().__init__()
+        self._paths: List[str] = []
+        self._texts: List[Optional[str]] = []
+        self._errors: List[Optional[str]] = []
+        self._batch_ms: List[Optional[float]] = []
+        self.error_count = 0
+    
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._paths)
+    
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.COLUMNS)
+    
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        
+        row, column = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return Path(self._paths[row]).name
+            if column == 1:
+                return self._texts[row] or ""
+            if column == 2:
+                return self._errors[row] or ""
+            batch_ms = self._batch_ms[row]
+            return f"{batch_ms:.2f}" if batch_ms is not None else ""
+        
+        if role == Qt.ItemDataRole.ToolTipRole:
+            if column == 0:
+                return self._paths[row]
+            if column == 2:
+                return self._errors[row]
+        
+        if role == Qt.ItemDataRole.ForegroundRole and self._errors[row] is not None:
+            return QColor("#FF3366")
+        
+        return None
+    
+    def headerData(self, section: int, orientation: Qt.Orientation,
+                   role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.COLUMNS[section]
+        return section + 1
+    
+    def append_rows(self, rows: List[Dict[str, Any]]):
+        """Append result rows (one insert notification per call)"""
+        if not rows:
+            return
+        
+        first = len(self._paths)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        for row in rows:
+            self._paths.append(row["path"])
+            self._texts.append(row["text"])
+            self._errors.append(row["error"])
+            self._batch_ms.append(row["batch_ms"])
+            self.error_count += row["error"] is not None
+        self.endInsertRows()
+    
+    def clear(self):
+        """Remove all rows"""
+        self.beginResetModel()
+        self._paths.clear()
+        self._texts.clear()
+        self._errors.clear()
+        self._batch_ms.clear()
+        self.error_count = 0
+        self.endResetModel()
+    
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        """Yield rows with the fields of the headless batch output"""
+        for path, text, error, batch_ms in zip(self._paths, self._texts, self._errors, self._batch_ms):
+            yield {"path": path, "text": text, "error": error, "batch_ms": batch_ms}
+    
+    def export(self, path: Path, fmt: str = "csv") -> int:
+        """
+        Write all rows to a file
+        
+        Args:
+            path: Output file
+            fmt: 'csv' or 'jsonl'
+        
+        Returns:
+            Number of rows written
+        """
+        from cli.batch import ResultWriter, chunked
+        
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = ResultWriter(f, fmt)
+            for rows in chunked(self.iter_rows(), 10000):
+                writer.write(rows)
+        return self.rowCount()
+
+
+class BatchResultsView(QFrame):
+    """Live progress, results table and export for batch inference"""
+    
+    cancel_requested = Signal()
+    clear_requested = Signal()
+    
+    def __init__(self):
+        super().__init__()
+        self.model = BatchResultsModel()
+        
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(10)
+        
+        # Title
+        title = QLabel("BATCH RESULTS")
+        title.setFont(QFont("Courier New", 18, QFont.Bold))
+        title.setStyleSheet("color: #00FF41;")
+        layout.addWidget(title)
+        
+        # Progress and throughput
+        self.status_label = QLabel()
+        self.status_label.setFont(QFont("Courier New", 12))
+        self.status_label.setStyleSheet("color: #00CCFF;")
+        layout.addWidget(self.status_label)
+        
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setStyleSheet("""
+            QProgressBar {
+                border: 2px solid #00FF41;
+                background-color: #1a1f2e;
+                text-align: center;
+                color: #00FF41;
+                font-family: 'Courier New', monospace;
+                border-radius: 0px;
+            }
+            QProgressBar::chunk {
+                background-color: #00FF41;
+            }
+        """)
+        layout.addWidget(self.progress_bar)
+        
+        # Results table; fixed row heights keep scrolling independent of the row count
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setMinimumHeight(300)
+        self.table.setFont(QFont("Courier New", 11))
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setStyleSheet("""
+            QTableView {
+                background-color: #1a1f2e;
+                color: #00FF41;
+                gridline-color: #2a3142;
+                border: 2px solid #00FF41;
+            }
+            QHeaderView::section {
+                background-color: #2a3142;
+                color: #00FF41;
+                border: 1px solid #00FF41;
+                font-weight: bold;
+            }
+        """)
+        vertical_header = self.table.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical_header.setDefaultSectionSize(24)
+        horizontal_header = self.table.horizontalHeader()
+        horizontal_header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        horizontal_header.setStretchLastSection(True)
+        self.table.setColumnWidth(0, 280)
+        self.table.setColumnWidth(1, 200)
+        self.table.setColumnWidth(2, 260)
+        layout.addWidget(self.table)
+        
+        # Buttons
+        buttons_layout = QHBoxLayout()
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.clicked.connect(self.cancel_requested.emit)
+        self.export_btn = QPushButton("Export Results")
+        self.export_btn.clicked.connect(self.on_export_clicked)
+        clear_btn = QPushButton("Clear Results")
+        clear_btn.clicked.connect(self.clear_requested.emit)
+        for button in (self.cancel_btn, self.export_btn, clear_btn):
+            button.setMinimumHeight(36)
+            button.setFont(QFont("Courier New", 11, QFont.Bold))
+            buttons_layout.addWidget(button)
+        layout.addLayout(buttons_layout)
+        
+        self.setLayout(layout)
+        self.set_running(False)
+    
+    def set_running(self, running: bool):
+        """Enable the controls that apply while a batch is running or finished"""
+        self.cancel_btn.setEnabled(running)
+        self.export_btn.setEnabled(not running and self.model.rowCount() > 0)
+    
+    def update_progress(self, processed: int, total: int, errors: int, images_per_second: float):
+        """Show live progress and throughput"""
+        self.progress_bar.setRange(0, max(total, 1))
+        self.progress_bar.setValue(processed)
+        self.status_label.setText(
+            f"Processed {processed:,} of {total:,} images ({errors:,} errors) "
+            f"at {images_per_second:,.1f} images/s"
+        )
+    
+    def on_export_clicked(self):
+        """Export all rows as CSV or JSONL"""
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self,
+            "Export Results",
+            "batch_results.csv",
+            "CSV Files (*.csv);;JSON Lines Files (*.jsonl)"
+        )
+        if not file_path:
+            return
+        
+        fmt = "jsonl" if file_path.lower().endswith(".jsonl") or "jsonl" in selected_filter else "csv"
+        try:
+            count = self.model.export(Path(file_path), fmt)
+            self.status_label.setText(f"Exported {count:,} rows to {file_path}")
+        except OSError as e:
+            self.status_label.setText(f"Export failed: {e}")
+    
+    def clear(self):
+        """Remove all rows and reset progress"""
+        self.model.clear()
+        self.progress_bar.setRange(0, 1)
+        self.progress_bar.setValue(0)
+        self.status_label.setText("")
+        self.set_running(False)
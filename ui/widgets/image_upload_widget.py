@@ -1,17 +1,40 @@
 """
 Image upload widget with drag-and-drop support
 """
-from PySide6.QtWidgets import QFrame, QVBoxLayout, QLabel, QPushButton
+from PySide6.QtWidgets import QFrame, QVBoxLayout, QHBoxLayout, QLabel, QPushButton
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QFont, QDragEnterEvent, QDropEvent
 from PySide6.QtWidgets import QFileDialog
 from pathlib import Path
+from typing import List
 
 
 class ImageUploadWidget(QFrame):
     """Custom widget for drag-drop image upload"""
     
     image_loaded = Signal(str)  # Emits image path
+    images_loaded = Signal(list)  # Emits image and folder paths for a batch
+    
+    BUTTON_STYLE = """
+        QPushButton {
+            background-color: #2a3142;
+            color: #00FF41;
+            border: 2px solid #00FF41;
+            padding: 10px 20px;
+            font-size: 14px;
+            font-weight: bold;
+            font-family: 'Courier New', monospace;
+            border-radius: 0px;
+        }
+        QPushButton:hover {
+            background-color: #00FF41;
+            color: #0a0e14;
+        }
+        QPushButton:pressed {
+            background-color: #00CC33;
+            border: 2px solid #00CC33;
+        }
+    """
     
     def __init__(self):
         super().__init__()
@@ -33,44 +56,36 @@ class ImageUploadWidget(QFrame):
         layout.setSpacing(15)
         
         # Instructions label
-        instructions = QLabel("Drag and drop a CAPTCHA image here to begin the prediction process.")
+        instructions = QLabel("Drag and drop a CAPTCHA image here to begin the prediction process. "
+                              "Drop several images or a folder to process them as a batch.")
         instructions_font = QFont("Courier New", 16, QFont.Bold)
         instructions.setFont(instructions_font)
         instructions.setStyleSheet("color: #00FF41;")
         instructions.setAlignment(Qt.AlignmentFlag.AlignCenter)
         instructions.setWordWrap(True)
-
+        
         # Or label
         or_label = QLabel("or")
         or_font = QFont("Courier New", 14)
         or_label.setFont(or_font)
         or_label.setStyleSheet("color: #9D4EDD;")
         or_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
-        # Browse button
-        browse_btn = QPushButton("Browse and Select Image")
-        browse_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #2a3142;
-                color: #00FF41;
-                border: 2px solid #00FF41;
-                padding: 10px 20px;
-                font-size: 14px;
-                font-weight: bold;
-                font-family: 'Courier New', monospace;
-                border-radius: 0px;
-            }
-            QPushButton:hover {
-                background-color: #00FF41;
-                color: #0a0e14;
-            }
-            QPushButton:pressed {
-                background-color: #00CC33;
-                border: 2px solid #00CC33;
-            }
-        """)
+        
+        # Browse buttons
+        browse_btn = QPushButton("Browse and Select Images")
+        browse_btn.setStyleSheet(self.BUTTON_STYLE)
         browse_btn.clicked.connect(self.browse_file)
-
+        
+        folder_btn = QPushButton("Select Folder")
+        folder_btn.setStyleSheet(self.BUTTON_STYLE)
+        folder_btn.clicked.connect(self.browse_folder)
+        
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addStretch()
+        buttons_layout.addWidget(browse_btn)
+        buttons_layout.addWidget(folder_btn)
+        buttons_layout.addStretch()
+        
         # Supported formats label
         formats_label = QLabel("Supported image formats: PNG, JPG, and JPEG files.")
         formats_font = QFont("Courier New", 10)
@@ -82,41 +97,50 @@ class ImageUploadWidget(QFrame):
         layout.addStretch()
         layout.addWidget(instructions)
         layout.addWidget(or_label)
-        layout.addWidget(browse_btn)
+        layout.addLayout(buttons_layout)
         layout.addWidget(formats_label)
         layout.addStretch()
         
         self.setLayout(layout)
     
     def dragEnterEvent(self, event: QDragEnterEvent):
-        """Accept drag enter event for image files"""
+        """Accept drag enter event for image files and folders"""
         if event.mimeData().hasUrls():
-            urls = event.mimeData().urls()
-            if urls:
-                file_path = urls[0].toLocalFile()
-                if self._is_valid_image(file_path):
-                    event.acceptProposedAction()
+            paths = [url.toLocalFile() for url in event.mimeData().urls()]
+            if any(Path(path).is_dir() or self._is_valid_image(path) for path in paths):
+                event.acceptProposedAction()
     
     def dropEvent(self, event: QDropEvent):
         """Handle drop event"""
         if event.mimeData().hasUrls():
-            urls = event.mimeData().urls()
-            if urls:
-                file_path = urls[0].toLocalFile()
-                if self._is_valid_image(file_path):
-                    self.image_loaded.emit(file_path)
+            self._emit_paths([url.toLocalFile() for url in event.mimeData().urls()])
     
     def browse_file(self):
-        """Open file dialog to select image"""
-        file_path, _ = QFileDialog.getOpenFileName(
+        """Open file dialog to select one or more images"""
+        file_paths, _ = QFileDialog.getOpenFileNames(
             self,
-            "Select Image",
+            "Select Images",
             "",
             "Image Files (*.png *.jpg *.jpeg);;All Files (*)"
         )
         
-        if file_path:
-            self.image_loaded.emit(file_path)
+        self._emit_paths(file_paths)
+    
+    def browse_folder(self):
+        """Open folder dialog to select a folder of images"""
+        folder_path = QFileDialog.getExistingDirectory(self, "Select Folder")
+        if folder_path:
+            self.images_loaded.emit([folder_path])
+    
+    def _emit_paths(self, paths: List[str]):
+        """Emit a single image for preview, or images and folders as a batch"""
+        # Folders are expanded later, off the GUI thread
+        paths = [path for path in paths if path and (Path(path).is_dir() or self._is_valid_image(path))]
+        
+        if len(paths) == 1 and not Path(paths[0]).is_dir():
+            self.image_loaded.emit(paths[0])
+        elif paths:
+            self.images_loaded.emit(paths)
     
     @staticmethod
     def _is_valid_image(file_path: str) -> bool:
@@ -124,4 +148,3 @@ class ImageUploadWidget(QFrame):
         valid_extensions = {'.png', '.jpg', '.jpeg'}
         path = Path(file_path)
         return path.suffix.lower() in valid_extensions
-
@@ -0,0 +1,51 @@
+"""
+Tab page that builds its content on first activation
+"""
+import time
+from typing import Callable, Optional
+
+from PySide6.QtWidgets import QWidget, QVBoxLayout
+from PySide6.QtCore import Signal
+
+
+class LazyTab(QWidget):
+    """Empty tab page that creates its content widget when first needed"""
+    
+    built = Signal(object, float)  # Emits the content widget and its build time in ms
+    
+    def __init__(self, factory: Callable[[], QWidget]):
+        """
+        Initialize lazy tab
+        
+        Args:
+            factory: Creates the content widget; called at most once
+        """
+        super().__init__()
+        self.factory = factory
+        self.content: Optional[QWidget] = None
+        self.build_ms: Optional[float] = None
+        
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+        self.setLayout(layout)
+    
+    def is_built(self) -> bool:
+        """Check if the content widget exists"""
+        return self.content is not None
+    
+    def ensure_built(self) -> QWidget:
+        """
+        Create the content widget if needed
+        
+        Returns:
+            The content widget
+        """
+        if self.content is None:
+            start_time = time.perf_counter()
+            self.content = self.factory()
+            self.layout().addWidget(self.content)
+            self.build_ms = (time.perf_counter() - start_time) * 1000
+            self.built.emit(self.content, self.build_ms)
+        
+        return self.content
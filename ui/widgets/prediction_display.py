@@ -4,6 +4,7 @@ Prediction display widget
 from PySide6.QtWidgets import QFrame, QVBoxLayout, QLabel
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont
+from typing import Any, Dict, Optional
 
 
 class PredictionDisplay(QFrame):
@@ -55,21 +56,71 @@ class PredictionDisplay(QFrame):
         self.time_label.setStyleSheet("color: #0096FF;")
         self.time_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
+        # Per-stage breakdown, hidden until a breakdown is available
+        self.breakdown_title = QLabel("Latency Breakdown (this image / rolling p50):")
+        self.breakdown_title.setFont(QFont("Courier New", 12))
+        self.breakdown_title.setStyleSheet("color: #9D4EDD;")
+        
+        self.breakdown_label = QLabel("")
+        self.breakdown_label.setFont(QFont("Courier New", 11))
+        self.breakdown_label.setStyleSheet("color: #0096FF;")
+        self.breakdown_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.breakdown_label.setTextFormat(Qt.TextFormat.PlainText)
+        
+        self.breakdown_title.setVisible(False)
+        self.breakdown_label.setVisible(False)
+        
         layout.addWidget(pred_title)
         layout.addWidget(self.prediction_label)
         layout.addWidget(time_title)
         layout.addWidget(self.time_label)
+        layout.addWidget(self.breakdown_title)
+        layout.addWidget(self.breakdown_label)
         
         self.setLayout(layout)
     
-    def update_prediction(self, text: str, time_ms: float):
-        """Update prediction display"""
+    def update_prediction(self, text: str, time_ms: float,
+                          breakdown: Optional[Dict[str, float]] = None,
+                          rolling: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        Update prediction display
+        
+        Args:
+            text: Predicted text
+            time_ms: Model inference (session.run) time in milliseconds
+            breakdown: Optional per-stage times of this prediction in ms
+            rolling: Optional per-stage rolling statistics (p50_ms) of
+                recent predictions
+        """
         display_text = text if text else "No prediction"
         self.prediction_label.setText(display_text)
-        self.time_label.setText(f"{time_ms:.2f} ms")
+        
+        if not breakdown:
+            self.time_label.setText(f"{time_ms:.2f} ms")
+            self.breakdown_title.setVisible(False)
+            self.breakdown_label.setVisible(False)
+            return
+        
+        total_ms = sum(breakdown.values())
+        self.time_label.setText(f"{time_ms:.2f} ms (end to end {total_ms:.2f} ms)")
+        
+        lines = []
+        for stage, stage_ms in breakdown.items():
+            share = stage_ms / total_ms * 100 if total_ms > 0 else 0.0
+            line = f"{stage:<10}{stage_ms:>9.2f} ms {share:>5.1f}%"
+            if rolling and stage in rolling:
+                line += f"   p50 {rolling[stage]['p50_ms']:>8.2f} ms"
+            lines.append(line)
+        
+        self.breakdown_label.setText("\n".join(lines))
+        self.breakdown_title.setVisible(True)
+        self.breakdown_label.setVisible(True)
     
     def clear(self):
         """Clear prediction display"""
         self.prediction_label.setText("")
         self.time_label.setText("")
+        self.breakdown_label.setText("")
+        self.breakdown_title.setVisible(False)
+        self.breakdown_label.setVisible(False)
 
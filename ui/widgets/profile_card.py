@@ -3,9 +3,11 @@ Profile card widget for displaying creator profiles
 """
 from PySide6.QtWidgets import QFrame, QVBoxLayout, QLabel
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QFont, QPixmap
+from PySide6.QtGui import QFont
 from pathlib import Path
 
+from .async_image_label import AsyncImageLabel
+
 
 class ProfileCard(QFrame):
     """Creator profile card with image"""
@@ -26,17 +28,14 @@ class ProfileCard(QFrame):
         layout.setContentsMargins(10, 10, 10, 10)
         layout.setSpacing(10)
         
-        # Image label
-        image_label = QLabel()
+        # Image label (decoded and scaled in the background)
         if image_path and Path(image_path).exists():
-            pixmap = QPixmap(str(image_path))
-            pixmap = pixmap.scaledToWidth(150, Qt.TransformationMode.SmoothTransformation)
-            image_label.setPixmap(pixmap)
+            image_label = AsyncImageLabel(image_path, 150)
         else:
+            image_label = QLabel()
             image_label.setText("[Image Not Found]")
             image_label.setStyleSheet("color: #FF3366;")
-        
-        image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         # Name label
         name_label = QLabel(name)
@@ -1,11 +1,52 @@
-"""Utility modules"""
+"""Utility modules
+
+Submodules other than the logger are imported on first use of one of
+their names, so asking for the logger does not load PIL.
+"""
+import importlib
+from typing import TYPE_CHECKING
+
+# Imported eagerly: it is cheap, and the utils.logger submodule would
+# otherwise shadow the logger object once any module imports it directly
 from .logger import logger, setup_logger
-from .file_utils import get_image_files, ensure_directory, get_file_size_mb, is_valid_image_file
-from .image_utils import load_image_as_pixmap, scale_pixmap, get_image_dimensions, is_image_valid
 
-__all__ = [
-    'logger', 'setup_logger',
-    'get_image_files', 'ensure_directory', 'get_file_size_mb', 'is_valid_image_file',
-    'load_image_as_pixmap', 'scale_pixmap', 'get_image_dimensions', 'is_image_valid'
-]
+# Public name -> submodule defining it
+_EXPORTS = {
+    'get_image_files': 'file_utils',
+    'iter_image_files': 'file_utils',
+    'ensure_directory': 'file_utils',
+    'get_file_size_mb': 'file_utils',
+    'is_valid_image_file': 'file_utils',
+    'load_image_as_pixmap': 'image_utils',
+    'scale_pixmap': 'image_utils',
+    'load_thumbnail': 'image_utils',
+    'get_image_dimensions': 'image_utils',
+    'is_image_valid': 'image_utils',
+    'LatencyStats': 'stats',
+    'get_rss_mb': 'memory'
+}
+
+# Static imports for type checkers and for PyInstaller's import analysis,
+# which cannot see the importlib calls below
+if TYPE_CHECKING:
+    from .file_utils import get_image_files, iter_image_files, ensure_directory, get_file_size_mb, is_valid_image_file
+    from .image_utils import (load_image_as_pixmap, scale_pixmap, load_thumbnail, get_image_dimensions,
+                              is_image_valid)
+    from .stats import LatencyStats
+    from .memory import get_rss_mb
+
+__all__ = ['logger', 'setup_logger'] + list(_EXPORTS)
+
+
+def __getattr__(name):
+    """Import the submodule defining name on first access"""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
 
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,14 +1,45 @@
 """
 File utility functions
 """
+import os
 from pathlib import Path
-from typing import List
+from typing import Iterator, List
 
 
 def get_image_files(directory: Path) -> List[Path]:
     """Get all image files in directory"""
+    return list(iter_image_files(directory))
+
+
+def iter_image_files(directory: Path, recursive: bool = False) -> Iterator[Path]:
+    """
+    Lazily yield image files in directory
+    
+    Uses os.scandir so directories with millions of entries are walked
+    without building the full listing in memory.
+    
+    Args:
+        directory: Directory to scan
+        recursive: Also descend into subdirectories
+        
+    Yields:
+        Paths of image files
+    """
     valid_extensions = {'.png', '.jpg', '.jpeg'}
-    return [f for f in directory.glob('*') if f.suffix.lower() in valid_extensions]
+    pending = [Path(directory)]
+    
+    while pending:
+        current = pending.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        if os.path.splitext(entry.name)[1].lower() in valid_extensions:
+                            yield Path(entry.path)
+                    elif recursive and entry.is_dir(follow_symlinks=False):
+                        pending.append(Path(entry.path))
+        except OSError:
+            continue
 
 
 def ensure_directory(path: Path) -> Path:
@@ -1,9 +1,11 @@
 """
 Image utility functions
 """
+import hashlib
+import os
 from PIL import Image
 from pathlib import Path
-from typing import Tuple
+from typing import Optional, Tuple
 
 
 def load_image_as_pixmap(image_path: Path):
@@ -31,6 +33,66 @@ def scale_pixmap(pixmap, max_width: int = 300, max_height: int = 300):
     return pixmap.scaledToFit(max_width, max_height, Qt.AspectRatioMode.KeepAspectRatio)
 
 
+def thumbnail_cache_path(image_path: Path, width: int, cache_dir: Path) -> Path:
+    """
+    Get the cache file of a scaled image
+    
+    The name includes the source size and modification time, so an edited
+    source image gets a new thumbnail.
+    """
+    stat = image_path.stat()
+    key = hashlib.blake2b(
+        f"{image_path.resolve()}|{stat.st_size}|{stat.st_mtime_ns}|{width}".encode('utf-8'),
+        digest_size=8
+    ).hexdigest()
+    return cache_dir / f"{image_path.stem}-{width}-{key}.png"
+
+
+def load_thumbnail(image_path: Path, width: int, cache_dir: Optional[Path] = None):
+    """
+    Decode an image and scale it to width, through an on-disk cache
+    
+    Only uses QImage, never QPixmap, so it is safe to call off the GUI thread.
+    
+    Args:
+        image_path: Source image
+        width: Target width in pixels (aspect ratio is kept)
+        cache_dir: Directory for pre-scaled copies, or None to always scale
+        
+    Returns:
+        Tuple of (QImage or None if the image cannot be read, whether it came from the cache)
+    """
+    from PySide6.QtCore import Qt
+    from PySide6.QtGui import QImage
+    
+    image_path = Path(image_path)
+    if not image_path.exists():
+        return None, False
+    
+    cache_path = thumbnail_cache_path(image_path, width, Path(cache_dir)) if cache_dir else None
+    if cache_path is not None and cache_path.exists():
+        image = QImage(str(cache_path))
+        if not image.isNull():
+            return image, True
+    
+    image = QImage(str(image_path))
+    if image.isNull():
+        return None, False
+    image = image.scaledToWidth(width, Qt.TransformationMode.SmoothTransformation)
+    
+    if cache_path is not None:
+        # Write to a temporary name first so a concurrent reader never sees a partial file
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            if image.save(str(temp_path), "PNG"):
+                os.replace(temp_path, cache_path)
+        except OSError as e:
+            print(f"Error caching thumbnail: {e}")
+    
+    return image, False
+
+
 def get_image_dimensions(image_path: Path) -> Tuple[int, int]:
     """Get image dimensions"""
     try:
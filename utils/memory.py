@@ -0,0 +1,35 @@
+"""
+Process memory helpers
+"""
+import os
+import sys
+
+
+def get_rss_mb() -> float:
+    """
+    Get the current resident set size of this process in MB
+    
+    Uses psutil when installed, /proc on Linux, and falls back to the
+    peak RSS from the resource module elsewhere. Returns 0.0 when no
+    source is available.
+    """
+    try:
+        import psutil
+        return psutil.Process(os.getpid()).memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+    
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        return 0.0
@@ -0,0 +1,364 @@
+"""
+Metrics registry with Prometheus text exposition
+"""
+import bisect
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .logger import logger
+from .memory import get_rss_mb
+
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Stage latency buckets in seconds, from 100 us to 10 s
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """Render a {name="value",...} label set"""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Labelled metric with values set directly or read from callbacks"""
+    
+    kind = "untyped"
+    
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._functions: Dict[Tuple[str, ...], Callable[[], float]] = {}
+        self._lock = threading.Lock()
+    
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name} expects labels {self.labels}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labels)
+    
+    def set_function(self, function: Callable[[], float], **labels):
+        """Read the value from function at every scrape"""
+        self._functions[self._key(labels)] = function
+    
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        for key, function in self._functions.items():
+            try:
+                values[key] = float(function())
+            except Exception as e:
+                logger.debug(f"Metric {self.name} callback failed: {e}")
+        
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+                for key, value in sorted(values.items())]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+    
+    kind = "counter"
+    
+    def inc(self, amount: float = 1.0, **labels):
+        """Add amount to the labelled count"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+    
+    kind = "gauge"
+    
+    def set(self, value: float, **labels):
+        """Set the labelled value"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """Cumulative bucketed distribution of observations"""
+    
+    kind = "histogram"
+    
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float], labels: Sequence[str] = ()):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [bucket counts..., +Inf count], sum
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+    
+    def observe(self, value: float, count: int = 1, **labels):
+        """
+        Record an observation
+        
+        Args:
+            value: Observed value
+            count: Number of identical observations, for per-item averages
+                of a batch
+            labels: Label values
+        """
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += count
+            series[1][0] += value * count
+    
+    def samples(self) -> List[str]:
+        with self._lock:
+            series = {key: (list(counts), total[0]) for key, (counts, total) in self._series.items()}
+        
+        lines = []
+        for key, (counts, total) in sorted(series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together"""
+    
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+    
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labels != metric.labels:
+                    raise ValueError(f"Metric {metric.name} already registered with a different type or labels")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+    
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labels))
+    
+    def gauge(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labels))
+    
+    def histogram(self, name: str, help_text: str, buckets: Sequence[float],
+                  labels: Sequence[str] = ()) -> Histogram:
+        return self._register(Histogram(name, help_text, buckets, labels))
+    
+    def render(self) -> str:
+        """Render every metric in Prometheus text format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+class InferenceMetrics:
+    """Inference metrics fed by ModelManager and the serving paths
+    
+    Attach to a ModelManager with attach(); the manager then reports stage
+    timings, batch sizes and errors through the record_* methods. Cache,
+    near-duplicate and process memory figures are read at scrape time, so
+    they cost nothing between scrapes.
+    """
+    
+    def __init__(self, registry: Optional[MetricsRegistry] = None, prefix: str = "ultracapture"):
+        """
+        Initialize inference metrics
+        
+        Args:
+            registry: Registry to add the metrics to (a new one if None)
+            prefix: Metric name prefix
+        """
+        self.registry = registry or MetricsRegistry()
+        self.prefix = prefix
+        
+        self.predictions = self.registry.counter(
+            f"{prefix}_predictions_total", "Images predicted, by where the result came from", ["source"])
+        self.errors = self.registry.counter(
+            f"{prefix}_errors_total", "Failed predictions and requests, by error type", ["type"])
+        self.stage_latency = self.registry.histogram(
+            f"{prefix}_stage_duration_seconds", "Per-image time spent in each pipeline stage",
+            LATENCY_BUCKETS, ["stage"])
+        self.batch_size = self.registry.histogram(
+            f"{prefix}_batch_size", "Images per model run", BATCH_SIZE_BUCKETS)
+        self.queue_depth = self.registry.gauge(
+            f"{prefix}_queue_depth", "Images waiting for inference", ["queue"])
+        
+        rss = self.registry.gauge("process_resident_memory_bytes", "Resident memory size in bytes")
+        rss.set_function(lambda: get_rss_mb() * 1024 * 1024)
+    
+    def attach(self, model_manager):
+        """
+        Report a ModelManager's activity and reuse statistics
+        
+        Args:
+            model_manager: ModelManager to instrument
+        """
+        model_manager.metrics = self
+        
+        if model_manager.cache is None and model_manager.near_duplicates is None:
+            return
+        
+        hits = self.registry.counter(
+            f"{self.prefix}_reuse_hits_total", "Lookups answered from a prior prediction", ["store"])
+        misses = self.registry.counter(
+            f"{self.prefix}_reuse_misses_total", "Lookups without a prior prediction", ["store"])
+        evictions = self.registry.counter(
+            f"{self.prefix}_reuse_evictions_total", "Entries evicted to stay within bounds", ["store"])
+        entries = self.registry.gauge(
+            f"{self.prefix}_reuse_entries", "Entries currently held", ["store"])
+        hit_ratio = self.registry.gauge(
+            f"{self.prefix}_reuse_hit_ratio", "Hits over lookups since start", ["store"])
+        
+        for store, source in (("cache", model_manager.cache),
+                              ("near_duplicates", model_manager.near_duplicates)):
+            if source is None:
+                continue
+            hits.set_function(lambda source=source: source.hits, store=store)
+            misses.set_function(lambda source=source: source.misses, store=store)
+            evictions.set_function(lambda source=source: source.evictions, store=store)
+            entries.set_function(lambda source=source: source.stats()["entries"], store=store)
+            hit_ratio.set_function(lambda source=source: source.stats()["hit_ratio"], store=store)
+    
+    def record_stages(self, timings_ns: Dict[str, int], images: int = 1):
+        """Record stage durations covering images images"""
+        for stage, duration in timings_ns.items():
+            self.stage_latency.observe(duration / images / 1e9, count=images, stage=stage)
+    
+    def record_batch(self, size: int):
+        """Record one model run over size images"""
+        self.batch_size.observe(size)
+        self.predictions.inc(size, source="model")
+    
+    def record_reuse(self, count: int = 1):
+        """Record predictions answered from the cache or near-duplicate index"""
+        self.predictions.inc(count, source="reused")
+    
+    def record_error(self, error_type: str):
+        """Record one failure"""
+        self.errors.inc(type=error_type)
+
+
+class MetricsFileWriter:
+    """Periodically write a registry to a file for node-exporter style collection
+    
+    The file is replaced atomically so readers never see a partial write.
+    """
+    
+    def __init__(self, registry: MetricsRegistry, path: Path, interval: float = 15.0):
+        """
+        Initialize metrics file writer
+        
+        Args:
+            registry: Registry to render
+            path: Output file
+            interval: Seconds between writes
+        """
+        self.registry = registry
+        self.path = Path(path)
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="metrics-file-writer", daemon=True)
+    
+    def start(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Stop writing, after a final write"""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+    
+    def write(self):
+        """Write the current metrics"""
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.registry.render())
+        os.replace(temp_path, self.path)
+    
+    def _loop(self):
+        while True:
+            stopping = self._stop.wait(self.interval)
+            try:
+                self.write()
+            except OSError as e:
+                logger.warning(f"Could not write metrics to {self.path}: {e}")
+            if stopping:
+                return
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    """Serve GET /metrics"""
+    
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        
+        data = self.server.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+class MetricsServer:
+    """Standalone /metrics endpoint on a background thread"""
+    
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9100):
+        self.server = ThreadingHTTPServer((host, port), _MetricsRequestHandler)
+        self.server.daemon_threads = True
+        self.server.registry = registry
+        self._thread = threading.Thread(target=self.server.serve_forever,
+                                        name="metrics-server", daemon=True)
+    
+    @property
+    def port(self) -> int:
+        return self.server.server_address[1]
+    
+    def start(self):
+        self._thread.start()
+    
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
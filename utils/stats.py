@@ -0,0 +1,65 @@
+"""
+Streaming statistics helpers
+"""
+import random
+from typing import Dict, List
+
+
+class LatencyStats:
+    """Track latency samples with bounded memory
+    
+    Count, mean, min and max are exact. Percentiles are computed from a
+    fixed-size reservoir sample, so memory stays flat no matter how many
+    values are added.
+    """
+    
+    def __init__(self, capacity: int = 10000, seed: int = 0):
+        self.capacity = capacity
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+        self._samples: List[float] = []
+        self._rng = random.Random(seed)
+    
+    def add(self, value: float):
+        """Record one sample"""
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        
+        # Reservoir sampling keeps a uniform sample of everything seen
+        if len(self._samples) < self.capacity:
+            self._samples.append(value)
+        else:
+            slot = self._rng.randrange(self.count)
+            if slot < self.capacity:
+                self._samples[slot] = value
+    
+    def percentile(self, q: float) -> float:
+        """Get the q-th percentile (0-100) of the sampled values"""
+        if not self._samples:
+            return 0.0
+        
+        ordered = sorted(self._samples)
+        rank = (len(ordered) - 1) * q / 100.0
+        lower = int(rank)
+        upper = min(lower + 1, len(ordered) - 1)
+        return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+    
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+    
+    def summary(self) -> Dict[str, float]:
+        """Get count, mean, min, max and p50/p95/p99"""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99)
+        }